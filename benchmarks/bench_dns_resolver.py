@@ -50,6 +50,14 @@ def resolve_par(res, count=10, begin=0):
         gs.append(gevent.spawn(quiet, res.gethostbyname, 'x%s.com' % index))
     gevent.joinall(gs)
 
+def resolve_herd(res, count=10, begin=0):
+    # A thundering herd: many greenlets looking up the same cold name
+    # at once, as after a deploy or when a cache entry expires.
+    # Identical concurrent lookups share one backend lookup.
+    gs = [gevent.spawn(quiet, res.gethostbyname, 'x%s.com' % begin)
+          for _ in range(count)]
+    gevent.joinall(gs)
+
 N = 300
 
 def run_all(resolver_name, resolve):
@@ -103,6 +111,10 @@ def main():
                           run_all,
                           name, resolve_par,
                           inner_loops=N)
+        runner.bench_func(name + ' herd',
+                          run_all,
+                          name, resolve_herd,
+                          inner_loops=N)
 
 if __name__ == '__main__':
     main()
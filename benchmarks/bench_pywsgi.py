@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+"""
+Benchmarks for gevent.pywsgi: keep-alive requests per second over
+loopback, with a trivial application.
+"""
+from __future__ import print_function, division, absolute_import
+
+import perf
+
+from gevent import socket
+from gevent import pywsgi
+
+N = 100
+
+BODY = b'hello world'
+
+SMALL_REQUEST = (
+    b'GET /hello HTTP/1.1\r\n'
+    b'Host: localhost\r\n'
+    b'\r\n'
+)
+
+# Roughly what a browser sends.
+BROWSER_REQUEST = (
+    b'GET /hello?a=1&b=2 HTTP/1.1\r\n'
+    b'Host: localhost:8080\r\n'
+    b'Connection: keep-alive\r\n'
+    b'Cache-Control: max-age=0\r\n'
+    b'Upgrade-Insecure-Requests: 1\r\n'
+    b'User-Agent: Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+    b'(KHTML, like Gecko) Chrome/70.0.3538.77 Safari/537.36\r\n'
+    b'Accept: text/html,application/xhtml+xml,application/xml;q=0.9,'
+    b'image/webp,image/apng,*/*;q=0.8\r\n'
+    b'Accept-Encoding: gzip, deflate, br\r\n'
+    b'Accept-Language: en-US,en;q=0.9\r\n'
+    b'Cookie: session=0123456789abcdef; csrftoken=fedcba9876543210\r\n'
+    b'\r\n'
+)
+
+
+JSON_BODY = b'{"id": 1, "name": "hello world"}'
+
+def application(_env, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [BODY]
+
+def json_application(_env, start_response):
+    start_response('200 OK', [('Content-Type', 'application/json'),
+                              ('Cache-Control', 'no-cache'),
+                              ('X-Content-Type-Options', 'nosniff')])
+    return [JSON_BODY]
+
+
+def _requests(loops, request, fast_header_parser, app=application, body=BODY):
+    server = pywsgi.WSGIServer(('127.0.0.1', 0), app, log=None)
+    server.fast_header_parser = fast_header_parser
+    server.start()
+    sock = socket.create_connection(('127.0.0.1', server.server_port))
+    try:
+        start = perf.perf_counter()
+        for _ in range(loops):
+            for _ in range(N):
+                sock.sendall(request)
+                # The response fits in one segment, but be safe.
+                response = sock.recv(4096)
+                while not response.endswith(body):
+                    response += sock.recv(4096)
+        return perf.perf_counter() - start
+    finally:
+        sock.close()
+        server.stop()
+
+
+def bench_small(loops):
+    return _requests(loops, SMALL_REQUEST, False)
+
+def bench_small_fast(loops):
+    return _requests(loops, SMALL_REQUEST, True)
+
+def bench_browser(loops):
+    return _requests(loops, BROWSER_REQUEST, False)
+
+def bench_browser_fast(loops):
+    return _requests(loops, BROWSER_REQUEST, True)
+
+def bench_json_fast(loops):
+    return _requests(loops, SMALL_REQUEST, True, json_application, JSON_BODY)
+
+
+def main():
+    runner = perf.Runner()
+
+    runner.bench_time_func('pywsgi small request',
+                           bench_small, inner_loops=N)
+    runner.bench_time_func('pywsgi small request fast_header_parser',
+                           bench_small_fast, inner_loops=N)
+    runner.bench_time_func('pywsgi browser request',
+                           bench_browser, inner_loops=N)
+    runner.bench_time_func('pywsgi browser request fast_header_parser',
+                           bench_browser_fast, inner_loops=N)
+    runner.bench_time_func('pywsgi json response fast_header_parser',
+                           bench_json_fast, inner_loops=N)
+
+if __name__ == '__main__':
+    main()
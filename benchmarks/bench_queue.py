@@ -55,6 +55,33 @@ def bench_bounded_queue_block(kind=queue.Queue, hub=False):
     g.join()
     assert g.value == 'Finished'
 
+BATCH = 100
+
+def bench_batches(kind=queue.Queue, many=True):
+    # A producer and a consumer moving batches of items through a
+    # queue with room for one batch.
+    q = kind(BATCH) if kind is not queue.Channel else kind()
+
+    def get():
+        got = 0
+        while got < N:
+            if many:
+                got += len(q.get_many(BATCH))
+            else:
+                q.get()
+                got += 1
+        return "Finished"
+
+    g = gevent.spawn(get)
+    for i in range(0, N, BATCH):
+        if many:
+            q.put_many(range(i, i + BATCH))
+        else:
+            for j in range(i, i + BATCH):
+                q.put(j)
+    g.join()
+    assert g.value == 'Finished'
+
 def main():
     runner = perf.Runner()
 
@@ -85,6 +112,30 @@ def main():
                       queue.Channel, True,
                       inner_loops=N)
 
+    runner.bench_func('bench_bounded_queue_batches_one_at_a_time',
+                      bench_batches,
+                      queue.Queue, False,
+                      inner_loops=N)
+
+    runner.bench_func('bench_bounded_queue_batches',
+                      bench_batches,
+                      inner_loops=N)
+
+    runner.bench_func('bench_joinable_queue_batches',
+                      bench_batches,
+                      queue.JoinableQueue,
+                      inner_loops=N)
+
+    runner.bench_func('bench_channel_batches_one_at_a_time',
+                      bench_batches,
+                      queue.Channel, False,
+                      inner_loops=N)
+
+    runner.bench_func('bench_channel_batches',
+                      bench_batches,
+                      queue.Channel,
+                      inner_loops=N)
+
     runner.bench_func('bench_unbounded_priority_queue_noblock',
                       bench_unbounded_queue_noblock,
                       queue.PriorityQueue,
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""
+Compare ``socket.sendfile()`` using :func:`os.sendfile` with
+the fallback that reads the file and calls ``send()``.
+"""
+from __future__ import print_function, division, absolute_import
+
+import tempfile
+
+import perf
+
+from gevent import socket
+from gevent.server import StreamServer
+
+
+def recvall(sock, _):
+    while sock.recv(65536):
+        pass
+
+N = 10
+MB = 1024 * 1024
+length = 50 * MB
+
+
+def _make_file():
+    f = tempfile.TemporaryFile()
+    chunk = b'x' * MB
+    for _ in range(length // MB):
+        f.write(chunk)
+    f.flush()
+    return f
+
+
+def _bench(loops, conn, f, method_name):
+    method = getattr(conn, method_name)
+    start = perf.perf_counter()
+    for __ in range(loops):
+        for _ in range(N):
+            method(f, 0)
+    return perf.perf_counter() - start
+
+
+def main():
+    runner = perf.Runner()
+    server = StreamServer(("127.0.0.1", 0), recvall)
+    server.start()
+
+    f = _make_file()
+    conn = socket.create_connection((server.server_host, server.server_port))
+
+    runner.bench_time_func('sendfile os.sendfile',
+                           _bench, conn, f, '_sendfile_use_sendfile',
+                           inner_loops=N)
+    runner.bench_time_func('sendfile send',
+                           _bench, conn, f, '_sendfile_use_send',
+                           inner_loops=N)
+
+    conn.close()
+    f.close()
+    server.stop()
+
+if __name__ == "__main__":
+    main()
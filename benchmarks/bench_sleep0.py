@@ -28,6 +28,26 @@ def bench_gevent(loops, arg):
     setswitchinterval(1000)
     return test(loops, sleep, arg)
 
+def bench_gevent_callback(loops, keep):
+    # sleep(0) is built on loop.run_callback. Keeping the callback
+    # objects returned by run_callback alive stops the loop from
+    # recycling them, so we can compare with and without reuse.
+    from gevent import get_hub
+    from gevent import wait
+    run_callback = get_hub().loop.run_callback
+    f = lambda: 5
+    t0 = perf.perf_counter()
+    kept = None
+    for __ in range(loops):
+        if keep:
+            kept = [run_callback(f) for _ in xrange(N)]
+        else:
+            for _ in xrange(N):
+                run_callback(f)
+        wait()
+    del kept
+    return perf.perf_counter() - t0
+
 def bench_eventlet(loops, arg):
     from eventlet import sleep
     return test(loops, sleep, arg)
@@ -43,6 +63,13 @@ def main():
                                bench_eventlet, arg,
                                inner_loops=N)
 
+    runner.bench_time_func('gevent run_callback',
+                           bench_gevent_callback, False,
+                           inner_loops=N)
+    runner.bench_time_func('gevent run_callback (not reused)',
+                           bench_gevent_callback, True,
+                           inner_loops=N)
+
 
 if __name__ == '__main__':
     main()
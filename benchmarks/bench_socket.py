@@ -102,6 +102,41 @@ def bench_native_forked_socketpair(loops):
     send, recv = socket.socketpair()
     return _do_sendall(loops, send, recv)
 
+PING = b'p' * 64
+
+def _echo(sock):
+    try:
+        while True:
+            data = sock.recv(len(PING))
+            if not data:
+                break
+            sock.sendall(data)
+    finally:
+        sock.close()
+
+def _ping_pong(loops, timeout):
+    # Small request/response round trips; each recv blocks briefly
+    # for the echo, which is where a socket timeout has to be armed.
+    client, server = gsocket.socketpair()
+    client.settimeout(timeout)
+    server.settimeout(timeout)
+    echo = gevent.spawn(_echo, server)
+    start = perf.perf_counter()
+    for __ in range(loops):
+        for _ in range(N):
+            client.sendall(PING)
+            client.recv(len(PING))
+    taken = perf.perf_counter() - start
+    client.close()
+    echo.join()
+    return taken
+
+def bench_gevent_ping_pong(loops):
+    return _ping_pong(loops, None)
+
+def bench_gevent_ping_pong_timeout(loops):
+    return _ping_pong(loops, 10.0)
+
 
 def main():
     if '--profile' in sys.argv:
@@ -141,6 +176,16 @@ def main():
         bench_native_forked_socketpair,
         inner_loops=N)
 
+    runner.bench_time_func(
+        'gevent socketpair ping-pong',
+        bench_gevent_ping_pong,
+        inner_loops=N)
+
+    runner.bench_time_func(
+        'gevent socketpair ping-pong timeout',
+        bench_gevent_ping_pong_timeout,
+        inner_loops=N)
+
     runner.bench_time_func(
         'native udp sendto',
         bench_native_udp,
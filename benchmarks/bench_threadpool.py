@@ -7,9 +7,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from time import sleep
+
 import perf
 
 from gevent.threadpool import ThreadPool
+from gevent._threading import Queue
+from gevent._threading import HandoffQueue
+from gevent._threading import start_new_thread
 
 try:
     xrange = xrange
@@ -23,6 +28,7 @@ def identity(i):
     return i
 
 PAR_COUNT = 5
+CONTENDED_COUNT = 32
 N = 20
 
 def bench_apply(loops):
@@ -51,6 +57,22 @@ def bench_spawn_wait(loops):
     pool.kill()
     return perf.perf_counter() - t0
 
+def bench_spawn_many(loops):
+    # Many short tasks in flight at once, their results
+    # collected afterwards.
+    pool = _ppool()
+
+    t0 = perf.perf_counter()
+
+    for _ in xrange(loops):
+        results = [pool.spawn(noop) for _ in xrange(N)]
+        for r in results:
+            r.get()
+
+    pool.join()
+    pool.kill()
+    return perf.perf_counter() - t0
+
 def _map(pool, pool_func, loops):
     data = [1] * N
     t0 = perf.perf_counter()
@@ -76,6 +98,43 @@ def bench_map_par(loops):
     pool = _ppool()
     return _map(pool, pool.map, loops)
 
+def bench_map_batch_par(loops):
+    pool = _ppool()
+    return _map(pool, pool.map_batch, loops)
+
+def _contended(loops, queue_class):
+    # Many threads taking many tiny tasks from the queue the pool
+    # uses, and marking them done, without the rest of the pool.
+    queue = queue_class()
+
+    def consume():
+        while 1:
+            item = queue.get()
+            queue.task_done()
+            if item is None:
+                break
+
+    for _ in xrange(CONTENDED_COUNT):
+        start_new_thread(consume, ())
+
+    t0 = perf.perf_counter()
+
+    for _ in xrange(loops):
+        for _ in xrange(N * CONTENDED_COUNT):
+            queue.put(1)
+    while queue.unfinished_tasks:
+        sleep(0.0001)
+
+    elapsed = perf.perf_counter() - t0
+    queue.put_many([None] * CONTENDED_COUNT)
+    return elapsed
+
+def bench_contended_queue(loops):
+    return _contended(loops, Queue)
+
+def bench_contended_handoff(loops):
+    return _contended(loops, HandoffQueue)
+
 def bench_imap_seq(loops):
     pool = ThreadPool(1)
     return _map(pool, pool.imap, loops)
@@ -113,12 +172,26 @@ def main():
     runner.bench_time_func('map_par',
                            bench_map_par)
 
+    runner.bench_time_func('map_batch_par',
+                           bench_map_batch_par)
+
+    runner.bench_time_func('contended_queue',
+                           bench_contended_queue,
+                           inner_loops=N * CONTENDED_COUNT)
+
+    runner.bench_time_func('contended_handoff',
+                           bench_contended_handoff,
+                           inner_loops=N * CONTENDED_COUNT)
+
     runner.bench_time_func('apply',
                            bench_apply)
 
     runner.bench_time_func('spawn',
                            bench_spawn_wait)
 
+    runner.bench_time_func('spawn_many',
+                           bench_spawn_many)
+
 
 if __name__ == '__main__':
     main()
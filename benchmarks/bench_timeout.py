@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+"""
+Compare starting and cancelling :class:`gevent.Timeout` objects that
+use a native loop timer with those that use the hub's timing wheel.
+"""
+from __future__ import print_function, division, absolute_import
+
+import perf
+
+from gevent import Timeout
+from gevent.hub import get_hub
+from gevent._timerwheel import TimerWheel
+
+try:
+    xrange
+except NameError:
+    xrange = range
+
+N = 1000
+
+
+def _bench(loops, wheel):
+    hub = get_hub()
+    hub.timer_wheel = wheel
+    try:
+        start = perf.perf_counter()
+        for __ in xrange(loops):
+            for _ in xrange(N):
+                with Timeout(5):
+                    pass
+        return perf.perf_counter() - start
+    finally:
+        del hub.timer_wheel
+        if wheel is not None:
+            wheel.close()
+
+
+def bench_loop_timer(loops):
+    return _bench(loops, None)
+
+
+def bench_timer_wheel(loops):
+    return _bench(loops, TimerWheel(get_hub().loop))
+
+
+def main():
+    runner = perf.Runner()
+    runner.bench_time_func('Timeout loop timer', bench_loop_timer,
+                           inner_loops=N)
+    runner.bench_time_func('Timeout timer wheel', bench_timer_wheel,
+                           inner_loops=N)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Compare running many small tasks in a :class:`gevent.pool.Pool`,
+which creates a greenlet for each task, with a
+:class:`gevent.pool.WorkerPool`, which reuses a fixed set of greenlets.
+
+Times are per task.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import perf
+
+from gevent.pool import Pool
+from gevent.pool import WorkerPool
+
+try:
+    xrange = xrange
+except NameError:
+    xrange = range
+
+N = 1000
+SIZE = 10
+
+
+def identity(i):
+    return i
+
+
+def _map(loops, pool_class, method_name):
+    pool = pool_class(SIZE)
+    method = getattr(pool, method_name)
+    data = [1] * N
+    t0 = perf.perf_counter()
+    for _ in xrange(loops):
+        # Must collect for imap to finish
+        list(method(identity, data))
+    pool.join()
+    result = perf.perf_counter() - t0
+    pool.kill()
+    return result
+
+
+def _spawn(loops, pool_class):
+    pool = pool_class(SIZE)
+    spawn = pool.spawn
+    t0 = perf.perf_counter()
+    for _ in xrange(loops):
+        for i in xrange(N):
+            spawn(identity, i)
+        pool.join()
+    result = perf.perf_counter() - t0
+    pool.kill()
+    return result
+
+
+def main():
+    runner = perf.Runner()
+    for pool_class in Pool, WorkerPool:
+        name = pool_class.__name__
+        runner.bench_time_func(name + ' spawn', _spawn, pool_class,
+                               inner_loops=N)
+        for method_name in 'map', 'imap', 'imap_unordered':
+            runner.bench_time_func(name + ' ' + method_name,
+                                   _map, pool_class, method_name,
+                                   inner_loops=N)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,3 +7,5 @@ $PYTHON -mperf timeit  -s'from gevent import get_hub; from gevent.hub import xra
 $PYTHON -mperf timeit  -s'from gevent import wait,get_hub; from gevent.hub import xrange; run_cb = get_hub().loop.run_callback; f = lambda : 5' 'for _ in xrange(100): run_cb(f)' 'wait()'
 $PYTHON -mperf timeit  -s'from gevent import get_hub; from gevent.hub import xrange; run_cb = get_hub().loop.run_callback; f = lambda : 5' 'for _ in xrange(10000): run_cb(f)'
 $PYTHON -mperf timeit  -s'from gevent import wait,get_hub; from gevent.hub import xrange; run_cb = get_hub().loop.run_callback; f = lambda : 5' 'for _ in xrange(10000): run_cb(f)' 'wait()'
+# Holding on to the returned callbacks keeps them from being reused.
+$PYTHON -mperf timeit  -s'from gevent import wait,get_hub; from gevent.hub import xrange; run_cb = get_hub().loop.run_callback; f = lambda : 5' 'cbs = [run_cb(f) for _ in xrange(100)]' 'wait()'
@@ -66,6 +66,7 @@ cpdef iwait_on_objects(objects, timeout=*, count=*)
 cpdef wait_on_objects(objects=*, timeout=*, count=*)
 
 cdef _primitive_wait(watcher, timeout, timeout_exc, WaitOperationsGreenlet hub)
+cdef _socket_wait_timer(socket, timeout, hub)
 cpdef wait_on_watcher(watcher, timeout=*, timeout_exc=*, WaitOperationsGreenlet hub=*)
 cpdef wait_read(fileno, timeout=*, timeout_exc=*)
 cpdef wait_write(fileno, timeout=*, timeout_exc=*, event=*)
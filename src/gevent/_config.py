@@ -294,6 +294,30 @@ class FloatSettingMixin(_PositiveValueMixin):
             return float(value)
 
 
+class _NonNegativeValueMixin(object):
+
+    def validate(self, value):
+        if value is not None and value < 0:
+            raise ValueError("Must not be negative")
+        return value
+
+
+class NonNegativeFloatSettingMixin(_NonNegativeValueMixin):
+    # Like FloatSettingMixin, but 0 is a number, not None.
+    def _convert(self, value):
+        if value is None or value == '':
+            return None
+        return float(value)
+
+
+class _RequiredNonNegativeFloatSettingMixin(NonNegativeFloatSettingMixin):
+
+    def validate(self, value):
+        if value is None:
+            raise ValueError("Must be a number")
+        return NonNegativeFloatSettingMixin.validate(self, value)
+
+
 class ByteCountSettingMixin(_PositiveValueMixin):
 
     _MULTIPLES = {
@@ -349,6 +373,31 @@ class Threadpool(ImportableSetting, Setting):
     default = 'gevent.threadpool.ThreadPool'
 
 
+class ThreadpoolQueue(ImportableSetting, Setting):
+    name = 'threadpool_queue'
+    environment_key = 'GEVENT_THREADPOOL_QUEUE'
+
+    desc = """\
+    The kind of queue that :class:`gevent.threadpool.ThreadPool`
+    uses to hand tasks to its worker threads.
+
+    ``queue``, the default, is guarded by a single lock that each
+    worker takes to get every task. ``handoff`` lets busy workers
+    take tasks without locking, only taking the lock to go to sleep
+    when there are none; this helps pools with many threads running
+    many short tasks.
+
+    .. versionadded:: 1.4
+    """
+
+    default = 'queue'
+
+    shortname_map = {
+        'queue': 'gevent._threading.Queue',
+        'handoff': 'gevent._threading.HandoffQueue',
+    }
+
+
 class Loop(ImportableSetting, Setting):
 
     desc = """\
@@ -469,6 +518,42 @@ class TrackGreenletTree(BoolSettingMixin, Setting):
     """
 
 
+class TimerWheel(BoolSettingMixin, Setting):
+    name = 'timer_wheel'
+    environment_key = 'GEVENT_TIMER_WHEEL'
+    default = False
+
+    desc = """\
+    Should :class:`gevent.Timeout` objects (and the timeouts used by
+    sockets and other blocking operations) be scheduled on a shared,
+    coarse-grained timing wheel instead of each using its own event
+    loop timer?
+
+    The wheel uses a single loop timer per hub that ticks every
+    `timer_wheel_resolution` seconds while any timeout is pending, so
+    starting and cancelling a timeout is much cheaper. This is
+    helpful for applications with very many timeouts that are
+    usually cancelled before they expire, such as servers with many
+    idle keep-alive connections. In exchange, a timeout may expire up
+    to one tick late (but never early). Timeouts shorter than one tick
+    continue to use a loop timer.
+
+    .. versionadded:: 1.4
+    """
+
+class TimerWheelResolution(FloatSettingMixin, Setting):
+    name = 'timer_wheel_resolution'
+    environment_key = 'GEVENT_TIMER_WHEEL_RESOLUTION'
+    default = 0.01
+
+    desc = """\
+    If `timer_wheel` is enabled, this is the length (in seconds) of
+    one tick of the wheel, and hence the precision of timeouts.
+
+    .. versionadded:: 1.4
+    """
+
+
 ## Monitoring settings
 # All env keys should begin with GEVENT_MONITOR
 
@@ -555,6 +640,40 @@ class MonitorMemoryMaxUsage(ByteCountSettingMixin, Setting):
     cap memory usage, you must choose a value.
     """
 
+class MonitorLoopLagPeriod(NonNegativeFloatSettingMixin, Setting):
+    name = 'loop_lag_period'
+
+    environment_key = 'GEVENT_MONITOR_LOOP_LAG_PERIOD'
+    default = 0.1
+
+    desc = """\
+    If `monitor_thread` is enabled, this is approximately how often
+    (in seconds) the monitor thread asks the hub to run a callback
+    and measures how late it runs. The results are available from
+    :attr:`gevent.events.IPeriodicMonitorThread.loop_lag` and are
+    periodically reported with
+    :class:`gevent.events.EventLoopLagReport` events.
+
+    Set this to 0 to disable the measurement.
+
+    .. versionadded:: 1.4
+    """
+
+class MonitorLoopLagReportPeriod(FloatSettingMixin, Setting):
+    name = 'loop_lag_report_period'
+
+    environment_key = 'GEVENT_MONITOR_LOOP_LAG_REPORT_PERIOD'
+    default = 10
+
+    desc = """\
+    If `monitor_thread` and `loop_lag_period` are enabled, this is
+    approximately how often (in seconds) a
+    :class:`gevent.events.EventLoopLagReport` is emitted summarizing
+    the lag measured since the previous report.
+
+    .. versionadded:: 1.4
+    """
+
 # The ares settings are all interpreted by
 # gevent/resolver/ares.pyx, so we don't do
 # any validation here.
@@ -692,6 +811,94 @@ class ResolverTimeout(FloatSettingMixin, AresSettingMixin, Setting):
     def kwarg_name(self):
         return 'timeout'
 
+class ResolverCache(BoolSettingMixin, Setting):
+    name = 'resolver_cache'
+    environment_key = 'GEVENT_RESOLVER_CACHE'
+    default = False
+
+    desc = """\
+    Should the `resolver` be wrapped in a
+    :class:`gevent.resolver.cache.Resolver` that caches the results
+    of forward lookups?
+
+    This works with any resolver. Results are kept for the TTL of
+    the DNS records if the resolver reports it (only dnspython
+    does), limited by `resolver_cache_min_ttl` and
+    `resolver_cache_max_ttl`, and otherwise for
+    `resolver_cache_max_ttl`.
+
+    .. versionadded:: 1.4
+    """
+
+class ResolverCacheSize(IntSettingMixin, Setting):
+    name = 'resolver_cache_size'
+    environment_key = 'GEVENT_RESOLVER_CACHE_SIZE'
+    default = 1024
+
+    desc = """\
+    If `resolver_cache` is enabled, this is the maximum number of
+    results to keep. The least recently used results are discarded
+    first.
+
+    .. versionadded:: 1.4
+    """
+
+class ResolverCacheMinTTL(_RequiredNonNegativeFloatSettingMixin, Setting):
+    name = 'resolver_cache_min_ttl'
+    environment_key = 'GEVENT_RESOLVER_CACHE_MIN_TTL'
+    default = 1.0
+
+    desc = """\
+    If `resolver_cache` is enabled, results are kept for at least
+    this many seconds, even if the records have a shorter TTL.
+
+    .. versionadded:: 1.4
+    """
+
+class ResolverCacheMaxTTL(_RequiredNonNegativeFloatSettingMixin, Setting):
+    name = 'resolver_cache_max_ttl'
+    environment_key = 'GEVENT_RESOLVER_CACHE_MAX_TTL'
+    default = 60.0
+
+    desc = """\
+    If `resolver_cache` is enabled, results are kept for at most
+    this many seconds. This is also how long results are kept
+    if the resolver doesn't report their TTL.
+
+    .. versionadded:: 1.4
+    """
+
+class ResolverCacheNegativeTTL(FloatSettingMixin, Setting):
+    name = 'resolver_cache_negative_ttl'
+    environment_key = 'GEVENT_RESOLVER_CACHE_NEGATIVE_TTL'
+    default = 5.0
+
+    desc = """\
+    If `resolver_cache` is enabled, this is how many seconds a
+    failed lookup (:exc:`socket.gaierror` or :exc:`socket.herror`)
+    is remembered and raised again without asking the resolver.
+
+    Set this to None (or the empty string in the environment) to
+    not cache failures.
+
+    .. versionadded:: 1.4
+    """
+
+class ResolverCacheStaleTTL(FloatSettingMixin, Setting):
+    name = 'resolver_cache_stale_ttl'
+    environment_key = 'GEVENT_RESOLVER_CACHE_STALE_TTL'
+    default = None
+
+    desc = """\
+    If `resolver_cache` is enabled, this is how many seconds after
+    a result expires that it may still be returned while it is
+    looked up again in the background (stale-while-revalidate).
+
+    By default, expired results are not used.
+
+    .. versionadded:: 1.4
+    """
+
 config = Config()
 
 # Go ahead and attempt to import the loop when this class is
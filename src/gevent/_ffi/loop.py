@@ -14,6 +14,7 @@ from gevent._ffi import GEVENT_DEBUG_LEVEL
 from gevent._ffi import TRACE
 from gevent._ffi.callback import callback
 from gevent._compat import PYPY
+from gevent._compat import perf_counter
 
 from gevent import getswitchinterval
 
@@ -115,6 +116,9 @@ class AbstractCallbacks(object):
                 return 1
             the_watcher = self.from_handle(handle)
             orig_ffi_watcher = the_watcher._watcher
+            loop = the_watcher.loop
+            if loop is not None:
+                loop._watcher_stats[the_watcher._stats_key] += 1
             args = the_watcher.args
             if args is None:
                 # Legacy behaviour from corecext: convert None into ()
@@ -322,11 +326,24 @@ _NOARGS = ()
 
 CALLBACK_CHECK_COUNT = 50
 
+# The most callback objects we keep around for reuse by run_callback.
+CALLBACK_FREELIST_SIZE = 256
+
+# Callbacks are handed back to the caller of run_callback, so we can
+# only recycle one that nobody else can still see. Without a way to
+# know that (e.g., on PyPy), we don't recycle at all.
+# (While we run it, a callback is referenced by our local variable
+# and by the argument to getrefcount.)
+_getrefcount = getattr(sys, 'getrefcount', None)
+_UNREFERENCED = 2
+
 class AbstractLoop(object):
     # pylint:disable=too-many-public-methods,too-many-instance-attributes
 
     error_handler = None
 
+    _stats_timing = False
+
     _CHECK_POINTER = None
 
     _TIMER_POINTER = None
@@ -348,6 +365,22 @@ class AbstractLoop(object):
         self._watchers = watchers
         self._in_callback = False
         self._callbacks = deque()
+        # Callback objects that have run and can be reused.
+        self._free_callbacks = []
+        # Counters for stats()
+        self._callbacks_run = 0
+        self._callbacks_deferred = 0
+        self._watcher_stats = {
+            'io_events': 0,
+            'timers_fired': 0,
+            'other_events': 0,
+        }
+        # Timings for stats(), if stats_timing is enabled.
+        self._blocked_time = 0.0
+        self._running_time = 0.0
+        self._longest_callback = 0.0
+        self._timing_mark = 0.0
+        self._timing_check = None
         # Stores python watcher objects while they are started
         self._keepaliveset = set()
         self._init_loop_and_aux_watchers(flags, default)
@@ -426,11 +459,14 @@ class AbstractLoop(object):
         # timer expiration and its safe to update the loop time at any
         # moment there.
         self.starting_timer_may_update_loop_time = True
+        ran = 0
+        timing = self._stats_timing
         try:
             count = CALLBACK_CHECK_COUNT
             now = self.now()
             expiration = now + getswitchinterval()
             self._stop_callback_timer()
+            free_callbacks = self._free_callbacks if _getrefcount is not None else None
             while self._callbacks:
                 cb = self._callbacks.popleft() # pylint:disable=assignment-from-no-return
                 count -= 1
@@ -442,6 +478,9 @@ class AbstractLoop(object):
                     # it's been stopped
                     continue
 
+                ran += 1
+                if timing:
+                    began = perf_counter()
                 try:
                     callback(*args)
                 except: # pylint:disable=bare-except
@@ -473,6 +512,15 @@ class AbstractLoop(object):
                     # the callback class so that bool(cb) of a callback that has been run
                     # becomes False
                     cb.args = None
+                    if timing:
+                        took = perf_counter() - began
+                        if took > self._longest_callback:
+                            self._longest_callback = took
+
+                if (free_callbacks is not None
+                        and len(free_callbacks) < CALLBACK_FREELIST_SIZE
+                        and _getrefcount(cb) == _UNREFERENCED):
+                    free_callbacks.append(cb)
 
                 # We've finished running one group of callbacks
                 # but we may have more, so before looping check our
@@ -482,6 +530,7 @@ class AbstractLoop(object):
                     self.update_now()
                     if self.now() >= expiration:
                         now = 0
+                        self._callbacks_deferred += len(self._callbacks)
                         break
 
             # Update the time before we start going again, if we didn't
@@ -493,6 +542,65 @@ class AbstractLoop(object):
                 self._start_callback_timer()
         finally:
             self.starting_timer_may_update_loop_time = False
+            self._callbacks_run += ran
+            if timing:
+                # We're about to block polling for events.
+                self._stats_mark_running()
+
+    def _stats_mark_running(self):
+        # Charge the time since the last mark to running Python code.
+        now = perf_counter()
+        self._running_time += now - self._timing_mark
+        self._timing_mark = now
+
+    def _stats_mark_blocked(self):
+        # We've just finished polling for events; charge the time
+        # since the last mark to being blocked.
+        now = perf_counter()
+        self._blocked_time += now - self._timing_mark
+        self._timing_mark = now
+
+    def _get_stats_timing(self):
+        return self._stats_timing
+
+    def _set_stats_timing(self, value):
+        value = bool(value)
+        if value == self._stats_timing:
+            return
+        self._stats_timing = value
+        self._timing_mark = perf_counter()
+        if value:
+            self._timing_check = self.check(ref=False)
+            self._timing_check.start(self._stats_mark_blocked)
+        else:
+            self._timing_check.close()
+            self._timing_check = None
+
+    stats_timing = property(_get_stats_timing, _set_stats_timing, doc="""
+        If true, `stats` also reports the time spent blocked
+        waiting for events, the time spent running, and the longest
+        callback. This costs a few clock reads per callback and
+        loop iteration. Off by default.
+        """)
+
+    def _stats_iterations(self):
+        return self.iteration
+
+    def stats(self):
+        """
+        Return a new dictionary of counters describing the work
+        this loop has done since it was created.
+
+        See :meth:`gevent._interfaces.ILoop.stats`.
+        """
+        result = dict(self._watcher_stats)
+        result['iterations'] = self._stats_iterations()
+        result['callbacks_run'] = self._callbacks_run
+        result['callbacks_deferred'] = self._callbacks_deferred
+        result['blocked_time'] = self._blocked_time
+        result['running_time'] = self._running_time
+        result['longest_callback'] = self._longest_callback
+        return result
 
     def _stop_aux_watchers(self):
         raise NotImplementedError()
@@ -502,6 +610,9 @@ class AbstractLoop(object):
             try:
                 if not self._can_destroy_loop(self._ptr):
                     return False
+                if self._timing_check is not None:
+                    self._timing_check.close()
+                    self._timing_check = None
                 self._stop_aux_watchers()
                 self._destroy_loop(self._ptr)
             finally:
@@ -511,6 +622,7 @@ class AbstractLoop(object):
                 self._ptr = None
                 del self._handle_to_self
                 del self._callbacks
+                del self._free_callbacks
                 del self._keepaliveset
 
             return True
@@ -672,7 +784,13 @@ class AbstractLoop(object):
         # If we happen to already be running callbacks (inside
         # _run_callbacks), this could happen almost immediately,
         # without the loop cycling.
-        cb = callback(func, args)
+        free_callbacks = self._free_callbacks
+        if free_callbacks:
+            cb = free_callbacks.pop()
+            cb.callback = func
+            cb.args = args or _NOARGS
+        else:
+            cb = callback(func, args)
         self._callbacks.append(cb)
         self._setup_for_run_callback()
 
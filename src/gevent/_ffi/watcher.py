@@ -325,6 +325,8 @@ class watcher(object):
     # attribute set based on the _watcher_type in _init_subclasses.
     _watcher_callback = None
     _watcher_is_active = None
+    # The key in the loop's ``stats()`` that counts our callbacks.
+    _stats_key = 'other_events'
 
     def close(self):
         if self._watcher is None:
@@ -471,6 +473,7 @@ watcher = AbstractWatcherType('watcher', (object,), dict(watcher.__dict__))
 class IoMixin(object):
 
     EVENT_MASK = 0
+    _stats_key = 'io_events'
 
     def __init__(self, loop, fd, events, ref=True, priority=None, _args=None):
         # Win32 only works with sockets, and only when we use libuv, because
@@ -494,6 +497,7 @@ class IoMixin(object):
 
 class TimerMixin(object):
     _watcher_type = 'timer'
+    _stats_key = 'timers_fired'
 
     def __init__(self, loop, after=0.0, repeat=0.0, ref=True, priority=None):
         if repeat < 0.0:
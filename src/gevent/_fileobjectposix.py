@@ -3,7 +3,6 @@ import os
 import io
 from io import BufferedReader
 from io import BufferedWriter
-from io import BytesIO
 from io import DEFAULT_BUFFER_SIZE
 from io import RawIOBase
 from io import UnsupportedOperation
@@ -16,6 +15,10 @@ from gevent.os import _write
 from gevent.os import ignored_errors
 from gevent.os import make_nonblocking
 
+# Python 3.3+ on POSIX. This reads directly into the caller's buffer.
+# (gevent.os doesn't patch it, so this is always the original.)
+_readv = getattr(os, 'readv', None)
+
 
 class GreenFileDescriptorIO(RawIOBase):
 
@@ -96,37 +99,69 @@ class GreenFileDescriptorIO(RawIOBase):
     # calls read() in a loop when its readall() method is invoked;
     # this was fixed in Python 3.3, but we still need our workaround for 2.7. See
     # https://github.com/gevent/gevent/issues/675)
-    def __read(self, n):
+    def __wait_for_read(self, func, arg):
         if self._read_event is None:
             raise UnsupportedOperation('read')
         while True:
             try:
-                return _read(self._fileno, n)
+                return func(self._fileno, arg)
             except (IOError, OSError) as ex:
                 if ex.args[0] not in ignored_errors:
                     raise
             self.hub.wait(self._read_event)
 
     def readall(self):
-        ret = BytesIO()
+        if self._read_event is None:
+            raise UnsupportedOperation('read')
+        # Like FileIO.readall, read a regular file in one go if we can
+        # tell how much is left; otherwise (pipes, sockets), grow the
+        # buffer, and the size of each read, as the data keeps coming.
+        bufsize = DEFAULT_BUFFER_SIZE
+        try:
+            if self.seekable():
+                remaining = os.fstat(self._fileno).st_size - os.lseek(self._fileno, 0, os.SEEK_CUR)
+                if remaining > 0:
+                    # One more so the end of the file is found without
+                    # growing the buffer.
+                    bufsize = remaining + 1
+        except OSError:
+            pass
+
+        result = bytearray(bufsize)
+        count = 0
         while True:
-            data = self.__read(DEFAULT_BUFFER_SIZE)
-            if not data:
+            if count == len(result):
+                result.extend(bytearray(len(result)))
+            view = memoryview(result)[count:]
+            try:
+                n = self.readinto(view)
+            finally:
+                # The bytearray can't be resized while it's exported.
+                release = getattr(view, 'release', None) # Not on Python 2
+                if release is not None:
+                    release()
+                del view
+            if not n:
                 break
-            ret.write(data)
-        return ret.getvalue()
-
-    def readinto(self, b):
-        data = self.__read(len(b))
-        n = len(data)
-        try:
-            b[:n] = data
-        except TypeError as err:
-            import array
-            if not isinstance(b, array.array):
-                raise err
-            b[:n] = array.array(b'b', data)
-        return n
+            count += n
+        del result[count:]
+        return bytes(result)
+
+    if _readv is not None:
+        def readinto(self, b):
+            return self.__wait_for_read(_readv, [b])
+    else:
+        def readinto(self, b):
+            data = self.__wait_for_read(_read, len(b))
+            n = len(data)
+            try:
+                b[:n] = data
+            except TypeError as err:
+                import array
+                if not isinstance(b, array.array):
+                    raise err
+                b[:n] = array.array(b'b', data)
+            return n
 
     def write(self, b):
         if self._write_event is None:
@@ -280,11 +280,54 @@ def _primitive_wait(watcher, timeout, timeout_exc, hub):
     with timeout:
         hub.wait(watcher)
 
+def _throw_timeout(glet, timeout_exc):
+    glet.throw(timeout_exc
+               if timeout_exc is not _NONE
+               else _timeout_error('timed out'))
+
+def _socket_wait_timer(socket, timeout, hub):
+    # Each socket lazily creates one timer and re-arms it with
+    # ``again`` for every wait, instead of allocating a new Timeout
+    # (and native timer) each time it would block. It's replaced if
+    # the timeout changes. Native timers repeat so that ``again``
+    # (unlike ``start``) measures from now even after one expired.
+    timer = socket._wait_timer
+    if timer is not None:
+        if timer.active:
+            # Another greenlet is waiting in the other direction.
+            return None
+        if socket._wait_timer_seconds == timeout:
+            return timer
+        timer.close()
+    wheel = hub.timer_wheel
+    if wheel is not None and timeout >= wheel.resolution:
+        timer = wheel.timer(timeout)
+    else:
+        timer = hub.loop.timer(timeout or 0.0, timeout or 0.0)
+    socket._wait_timer = timer
+    socket._wait_timer_seconds = timeout
+    return timer
+
 # Suitable to be bound as an instance method
 def wait_on_socket(socket, watcher, timeout_exc=None):
-    _primitive_wait(watcher, socket.timeout,
-                    timeout_exc if timeout_exc is not None else _NONE,
-                    socket.hub)
+    timeout = socket.timeout
+    hub = socket.hub
+    if timeout_exc is None:
+        timeout_exc = _NONE
+    if timeout is None or watcher.callback is not None:
+        _primitive_wait(watcher, timeout, timeout_exc, hub)
+        return
+
+    timer = _socket_wait_timer(socket, timeout, hub)
+    if timer is None:
+        _primitive_wait(watcher, timeout, timeout_exc, hub)
+        return
+
+    timer.again(_throw_timeout, getcurrent(), timeout_exc, update=True) # pylint:disable=undefined-variable
+    try:
+        hub.wait(watcher)
+    finally:
+        timer.stop()
 
 def wait_on_watcher(watcher, timeout=None, timeout_exc=_NONE, hub=None):
     """
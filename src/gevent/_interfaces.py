@@ -176,6 +176,54 @@ class ILoop(Interface):
         an action.
         """
 
+    stats_timing = Attribute(
+        "Boolean, initially false. If set to true, `stats` also measures "
+        "where the loop spends its time. This costs a few clock reads "
+        "per callback and per iteration.")
+
+    def stats():
+        """
+        Return a new dictionary of counters describing the work this
+        loop has done since it was created.
+
+        The counters are plain integers maintained as the loop runs,
+        so this is cheap to call periodically (for example, from a
+        function registered with
+        :meth:`gevent.events.IPeriodicMonitorThread.add_monitoring_function`)
+        and export. The keys are:
+
+        ``iterations``
+            The number of times the loop has polled for events.
+        ``callbacks_run``
+            The number of callbacks scheduled with `run_callback` that
+            have been run.
+        ``callbacks_deferred``
+            The number of callbacks that were left for the next
+            iteration because running callbacks took longer than the
+            switch interval (:func:`gevent.getswitchinterval`).
+        ``io_events``
+            The number of times an IO watcher's callback has been run.
+        ``timers_fired``
+            The number of times a timer watcher's callback has been run.
+        ``other_events``
+            The number of times any other watcher's callback has been run.
+
+        The following are only measured while `stats_timing` is true,
+        and are otherwise 0.
+
+        ``blocked_time``
+            Seconds spent blocked in the operating system waiting for
+            events.
+        ``running_time``
+            Seconds spent running (watcher callbacks, callbacks, and
+            anything else that happened while not blocked).
+        ``longest_callback``
+            The duration, in seconds, of the longest callback scheduled
+            with `run_callback`.
+
+        .. versionadded:: 1.4
+        """
+
 class IWatcher(Interface):
     """
     An event loop watcher.
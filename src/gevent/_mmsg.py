@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 gevent. See LICENSE for details.
+"""
+Batched datagram system calls.
+
+Linux has ``recvmmsg`` and ``sendmmsg``, which receive or send many
+datagrams with one system call, but the :mod:`socket` module doesn't
+expose them. This calls them from the C library with :mod:`ctypes`.
+Only IPv4 and IPv6 addresses are handled.
+
+If the functions aren't available, :data:`available` is false and
+callers must use ``recvfrom_into`` and ``sendto`` instead.
+
+The sockets passed to these functions must be non-blocking; they
+never wait.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from errno import EAGAIN
+from errno import EINTR
+import os
+import struct
+import sys
+
+from _socket import AF_INET
+from _socket import error as SocketError
+from _socket import getnameinfo
+from _socket import inet_ntop
+from _socket import inet_pton
+from _socket import NI_NUMERICHOST
+from _socket import NI_NUMERICSERV
+try:
+    from _socket import AF_INET6
+except ImportError: # pragma: no cover
+    AF_INET6 = None
+
+__all__ = [
+    'available',
+    'Receiver',
+    'sendmmsg',
+]
+
+try:
+    from _socket import MSG_DONTWAIT as _MSG_DONTWAIT
+except ImportError: # pragma: no cover
+    _MSG_DONTWAIT = 0
+
+# The most messages one call can handle (UIO_MAXIOV).
+_MAX_BATCH = 1024
+# sizeof(struct sockaddr_storage)
+_SOCKADDR_SIZE = 128
+
+_recvmmsg = None
+_sendmmsg = None
+_ctypes = None
+
+if sys.platform.startswith('linux'):
+    try:
+        import ctypes as _ctypes
+        _libc = _ctypes.CDLL(None, use_errno=True)
+        _recvmmsg = _libc.recvmmsg
+        _sendmmsg = _libc.sendmmsg
+    except (ImportError, OSError, AttributeError): # pragma: no cover
+        _recvmmsg = _sendmmsg = None
+
+#: Whether :class:`Receiver` and :func:`sendmmsg` can be used.
+available = _recvmmsg is not None and _sendmmsg is not None
+
+
+if available:
+    _c_void_p = _ctypes.c_void_p
+    _c_size_t = _ctypes.c_size_t
+
+    class _iovec(_ctypes.Structure):
+        _fields_ = [
+            ('iov_base', _c_void_p),
+            ('iov_len', _c_size_t),
+        ]
+
+    class _msghdr(_ctypes.Structure):
+        _fields_ = [
+            ('msg_name', _c_void_p),
+            ('msg_namelen', _ctypes.c_uint32),
+            ('msg_iov', _ctypes.POINTER(_iovec)),
+            ('msg_iovlen', _c_size_t),
+            ('msg_control', _c_void_p),
+            ('msg_controllen', _c_size_t),
+            ('msg_flags', _ctypes.c_int),
+        ]
+
+    class _mmsghdr(_ctypes.Structure):
+        _fields_ = [
+            ('msg_hdr', _msghdr),
+            ('msg_len', _ctypes.c_uint),
+        ]
+
+    _recvmmsg.argtypes = [_ctypes.c_int, _ctypes.POINTER(_mmsghdr),
+                          _ctypes.c_uint, _ctypes.c_int, _c_void_p]
+    _recvmmsg.restype = _ctypes.c_int
+    _sendmmsg.argtypes = [_ctypes.c_int, _ctypes.POINTER(_mmsghdr),
+                          _ctypes.c_uint, _ctypes.c_int]
+    _sendmmsg.restype = _ctypes.c_int
+
+
+def _raise_errno():
+    err = _ctypes.get_errno()
+    raise SocketError(err, os.strerror(err))
+
+
+def _decode_address(name):
+    # *name* is the bytes of a sockaddr. Return the address in the
+    # same form as recvfrom().
+    family, port = struct.unpack_from('=H', name)[0], struct.unpack_from('!H', name, 2)[0]
+    if family == AF_INET:
+        return inet_ntop(AF_INET, name[4:8]), port
+    flowinfo, = struct.unpack_from('!I', name, 4)
+    scope_id, = struct.unpack_from('=I', name, 24)
+    host = inet_ntop(AF_INET6, name[8:24])
+    if scope_id:
+        # Let the C library name the interface, like recvfrom() does.
+        host = getnameinfo((host, port, flowinfo, scope_id),
+                           NI_NUMERICHOST | NI_NUMERICSERV)[0]
+    return host, port, flowinfo, scope_id
+
+
+def _encode_address(family, address):
+    # Return the sockaddr for *address*, or None if it's not a numeric
+    # address of *family* and so has to be left to sendto().
+    try:
+        if family == AF_INET:
+            host, port = address
+            return (struct.pack('=H', AF_INET) + struct.pack('!H', port)
+                    + inet_pton(AF_INET, host) + b'\0' * 8)
+        if family == AF_INET6:
+            host, port = address[:2]
+            flowinfo = address[2] if len(address) > 2 else 0
+            scope_id = address[3] if len(address) > 3 else 0
+            return (struct.pack('=H', AF_INET6) + struct.pack('!HI', port, flowinfo)
+                    + inet_pton(AF_INET6, host) + struct.pack('=I', scope_id))
+    except (TypeError, ValueError, SocketError, struct.error):
+        pass
+    return None
+
+
+class Receiver(object):
+    """
+    Receives up to *count* datagrams at a time, each into its own
+    *size* byte slot of one buffer allocated up front. Longer
+    datagrams are truncated.
+    """
+
+    def __init__(self, count, size):
+        self.count = count
+        self.size = size
+        self._buffer = bytearray(count * size)
+        self._view = memoryview(self._buffer)
+        self._names = _ctypes.create_string_buffer(count * _SOCKADDR_SIZE)
+        self._iovecs = (_iovec * count)()
+        self._headers = (_mmsghdr * count)()
+        self._c_buffer = (_ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)
+        base = _ctypes.addressof(self._c_buffer)
+        self._names_address = names = _ctypes.addressof(self._names)
+        for i in range(count):
+            iov = self._iovecs[i]
+            iov.iov_base = base + i * size
+            iov.iov_len = size
+            hdr = self._headers[i].msg_hdr
+            hdr.msg_name = names + i * _SOCKADDR_SIZE
+            hdr.msg_iov = _ctypes.pointer(iov)
+            hdr.msg_iovlen = 1
+
+    def recv(self, fileno):
+        """
+        Return a list of the ``(data, address)`` pairs waiting on
+        the socket *fileno*, which is empty if there are none.
+        """
+        headers = self._headers
+        for header in headers:
+            header.msg_hdr.msg_namelen = _SOCKADDR_SIZE
+        # The kernel limits each call to _MAX_BATCH messages.
+        n = _recvmmsg(fileno, headers, min(self.count, _MAX_BATCH), _MSG_DONTWAIT, None)
+        if n < 0:
+            if _ctypes.get_errno() in (EAGAIN, EINTR):
+                return []
+            _raise_errno()
+        view = self._view
+        names = self._names_address
+        size = self.size
+        string_at = _ctypes.string_at
+        result = []
+        for i in range(n):
+            header = headers[i]
+            start = i * size
+            name = string_at(names + i * _SOCKADDR_SIZE, header.msg_hdr.msg_namelen)
+            result.append((view[start:start + header.msg_len].tobytes(),
+                           _decode_address(name)))
+        return result
+
+
+def sendmmsg(fileno, family, datagrams, start=0):
+    """
+    Send as many of the ``(data, address)`` pairs in the sequence
+    *datagrams*, beginning at index *start*, as the socket *fileno*
+    of address family *family* accepts without blocking. Return how
+    many were sent.
+
+    Zero is returned if the first one can't be sent right now, or
+    can't be sent this way at all (e.g., its address is a host name);
+    callers should send that one with ``sendto``.
+    """
+    messages = []
+    for data, address in datagrams[start:start + _MAX_BATCH]:
+        name = _encode_address(family, address)
+        if name is None:
+            break
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        messages.append((data, name))
+    count = len(messages)
+    if not count:
+        return 0
+
+    # Keep the data and names referenced until the call returns.
+    buffers = []
+    iovecs = (_iovec * count)()
+    headers = (_mmsghdr * count)()
+    for i, (data, name) in enumerate(messages):
+        data_buf = _ctypes.c_char_p(data)
+        name_buf = _ctypes.c_char_p(name)
+        buffers.append((data_buf, name_buf))
+        iov = iovecs[i]
+        iov.iov_base = _ctypes.cast(data_buf, _c_void_p)
+        iov.iov_len = len(data)
+        hdr = headers[i].msg_hdr
+        hdr.msg_name = _ctypes.cast(name_buf, _c_void_p)
+        hdr.msg_namelen = len(name)
+        hdr.msg_iov = _ctypes.pointer(iov)
+        hdr.msg_iovlen = 1
+    n = _sendmmsg(fileno, headers, count, _MSG_DONTWAIT)
+    if n < 0:
+        if _ctypes.get_errno() in (EAGAIN, EINTR):
+            return 0
+        _raise_errno()
+    return n
@@ -3,6 +3,7 @@ from __future__ import print_function, absolute_import, division
 
 import os
 import sys
+from math import ceil
 
 from weakref import ref as wref
 
@@ -12,6 +13,7 @@ from gevent import config as GEVENT_CONFIG
 from gevent.monkey import get_original
 from gevent.events import notify
 from gevent.events import EventLoopBlocked
+from gevent.events import EventLoopLagReport
 from gevent.events import MemoryUsageThresholdExceeded
 from gevent.events import MemoryUsageUnderThreshold
 from gevent.events import IPeriodicMonitorThread
@@ -21,10 +23,15 @@ from gevent._tracer import GreenletTracer
 from gevent._compat import thread_mod_name
 from gevent._compat import perf_counter
 
+# Spawn sites inside gevent itself (Pool.spawn, and the like) aren't
+# interesting; we want the caller.
+_GEVENT_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
 
 
 __all__ = [
     'PeriodicMonitoringThread',
+    'LatencyHistogram',
+    'SamplingProfiler',
 ]
 
 get_thread_ident = get_original(thread_mod_name, 'get_ident')
@@ -37,6 +44,224 @@ class MonitorWarning(RuntimeWarning):
     """The type of warnings we emit."""
 
 
+class LatencyHistogram(object):
+    """
+    A histogram of durations in seconds.
+
+    In the style of HdrHistogram, values are counted in buckets whose
+    width grows with the magnitude of the value, so percentiles are
+    accurate to within about 6% from microseconds to hours using a
+    few hundred integers.
+
+    .. versionadded:: 1.4
+    """
+
+    #: The smallest duration we distinguish, in seconds.
+    resolution = 1e-6
+
+    # Each power of two is divided into 2**_SUB_BITS buckets.
+    _SUB_BITS = 4
+    _SUB_COUNT = 1 << _SUB_BITS
+
+    def __init__(self):
+        self._counts = []
+        #: The number of recorded values.
+        self.count = 0
+        #: The largest recorded value.
+        self.max = 0.0
+        #: The sum of the recorded values.
+        self.total = 0.0
+
+    def _index(self, value):
+        units = int(value / self.resolution)
+        shift = max(0, units.bit_length() - self._SUB_BITS - 1)
+        return shift * self._SUB_COUNT + (units >> shift)
+
+    def _highest_equivalent(self, index):
+        if index < 2 * self._SUB_COUNT:
+            shift, sub = 0, index
+        else:
+            shift = index // self._SUB_COUNT - 1
+            sub = index - shift * self._SUB_COUNT
+        return (((sub + 1) << shift) - 1) * self.resolution
+
+    def record(self, value):
+        """
+        Count the duration *value*, in seconds.
+        """
+        if value < 0:
+            value = 0.0
+        index = self._index(value)
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Return the value (in seconds) that *percent* percent of the
+        recorded values are less than or equal to, or 0 if there are
+        no values.
+        """
+        if not self.count:
+            return 0.0
+        # The rank of the value we want, counting from 1.
+        rank = max(1, int(ceil(self.count * percent / 100.0)))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max # pragma: no cover
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return '<%s count=%d p50=%.6f p99=%.6f max=%.6f>' % (
+            self.__class__.__name__,
+            self.count, self.percentile(50), self.percentile(99), self.max)
+
+
+class SamplingProfiler(object):
+    """
+    A statistical profiler for the greenlets running in a hub's thread.
+
+    Each call to :meth:`sample` (which is made from the monitor thread)
+    records the Python stack that the hub's thread is executing at that
+    instant, rooted at a label for the greenlet that is running it.
+    Samples that find the hub waiting for events are only counted in
+    :attr:`loop_samples`.
+
+    Because the hub's thread is only inspected, never interrupted,
+    the cost is a few tens of microseconds per sample, regardless of
+    how many greenlets exist.
+
+    The results are available in the "collapsed stack" format
+    understood by flamegraph tools such as
+    `flamegraph.pl <https://github.com/brendangregg/FlameGraph>`_ and
+    `speedscope <https://www.speedscope.app>`_.
+
+    .. versionadded:: 1.4
+    """
+
+    #: Stacks deeper than this are truncated, keeping the outermost
+    #: frames.
+    max_depth = 100
+
+    def __init__(self, hub, tracer):
+        self._hub_wref = wref(hub)
+        self._thread_ident = hub.thread_ident
+        self._tracer = tracer
+        # When the hub's thread is in one of these functions, it's
+        # waiting for events to happen.
+        self._idle_codes = frozenset(
+            code for code in (
+                getattr(getattr(type(hub), 'run', None), '__code__', None),
+                getattr(getattr(type(hub.loop), 'run', None), '__code__', None),
+            ) if code is not None
+        )
+        # {code: label}. Code objects live as long as their functions,
+        # and there aren't many of those.
+        self._code_labels = {}
+        #: A dict mapping tuples of frame labels, outermost first, to
+        #: the number of times that stack was sampled.
+        self.stacks = {}
+        #: The number of samples that found the hub waiting for events.
+        self.loop_samples = 0
+
+    @property
+    def samples(self):
+        "The total number of samples taken, including idle samples."
+        return sum(self.stacks.values()) + self.loop_samples
+
+    def reset(self):
+        "Discard the samples taken so far."
+        self.stacks = {}
+        self.loop_samples = 0
+
+    def _code_label(self, code):
+        label = '%s (%s:%d)' % (code.co_name, code.co_filename, code.co_firstlineno)
+        label = label.replace(';', ':')
+        self._code_labels[code] = label
+        return label
+
+    def _greenlet_label(self, glet, hub):
+        if glet is None:
+            # We don't know; monitoring was disabled for it.
+            return 'unknown'
+        if glet is hub:
+            return 'Hub'
+        # Don't use the ``name`` property directly: computing the
+        # default name assigns the greenlet an identity, and that's not
+        # safe to do from this thread.
+        name = getattr(glet, '__dict__', {}).get('name')
+        if name:
+            return str(name).replace(';', ':')
+        for code, lineno in getattr(glet, '_spawning_stack_frames', None) or ():
+            if not code.co_filename.startswith(_GEVENT_DIR):
+                return ('spawned at %s (%s:%d)' % (
+                    code.co_name, code.co_filename, lineno)).replace(';', ':')
+        return type(glet).__name__
+
+    def sample(self, hub=None):
+        """
+        Record the current stack of the hub's thread.
+
+        This is a monitoring function; it is meant to be called from
+        the monitor thread.
+        """
+        hub = hub or self._hub_wref()
+        if hub is None:
+            return
+        frame = sys._current_frames().get(self._thread_ident)
+        if frame is None:
+            return
+        active = self._tracer.active_greenlet
+        if active is hub and frame.f_code in self._idle_codes:
+            self.loop_samples += 1
+            return
+
+        code_labels = self._code_labels
+        labels = []
+        depth = self.max_depth
+        while frame is not None and depth:
+            code = frame.f_code
+            labels.append(code_labels.get(code) or self._code_label(code))
+            frame = frame.f_back
+            depth -= 1
+        labels.append(self._greenlet_label(active, hub))
+        labels.reverse()
+        key = tuple(labels)
+        stacks = self.stacks
+        stacks[key] = stacks.get(key, 0) + 1
+
+    def collapsed(self):
+        """
+        Return a list of lines, one for each distinct stack, in the
+        collapsed stack format: the frames, outermost first,
+        separated by semicolons, followed by a space and the number
+        of samples.
+        """
+        # Copying the dict is atomic, iterating it in Python isn't.
+        stacks = dict(self.stacks)
+        return ['%s %d' % (';'.join(stack), count)
+                for stack, count in sorted(stacks.items())]
+
+    def write_collapsed(self, stream):
+        """
+        Write the :meth:`collapsed` lines to the text file *stream*.
+        """
+        for line in self.collapsed():
+            stream.write(line)
+            stream.write('\n')
+
+
 class _MonitorEntry(object):
 
     __slots__ = ('function', 'period', 'last_run_time')
@@ -85,6 +310,18 @@ class PeriodicMonitoringThread(object):
     # The instance of GreenletTracer we're using
     _greenlet_tracer = None
 
+    # A LatencyHistogram of all loop lag measurements, and one for the
+    # measurements since the last report. None if we're not measuring.
+    loop_lag = None
+    _loop_lag_interval = None
+    # The async watcher we use to run a callback in the hub, and
+    # the time we asked it to run if it hasn't run yet.
+    _loop_lag_watcher = None
+    _loop_lag_sent = None
+
+    # The SamplingProfiler, if we've been asked to profile.
+    profiler = None
+
     def __init__(self, hub):
         self._hub_wref = wref(hub, self._on_hub_gc)
         self.should_run = True
@@ -167,6 +404,12 @@ class PeriodicMonitoringThread(object):
         self.should_run = False
         # Uninstall our tracing hook
         self._greenlet_tracer.kill()
+        # We're in the hub's thread, so this is safe to do.
+        watcher = self._loop_lag_watcher
+        self._loop_lag_watcher = None
+        if watcher is not None:
+            watcher.stop()
+            watcher.close()
 
     def _on_hub_gc(self, _):
         self.kill()
@@ -286,6 +529,71 @@ class PeriodicMonitoringThread(object):
                                      max(GEVENT_CONFIG.memory_monitor_period,
                                          self.min_memory_monitor_period))
 
+    def install_monitor_loop_lag(self):
+        # Start measuring event loop lag, if configured.
+        # Must be called in the hub's thread.
+        period = GEVENT_CONFIG.loop_lag_period
+        if not period or period <= 0:
+            return
+
+        self.loop_lag = LatencyHistogram()
+        self._loop_lag_interval = LatencyHistogram()
+        # async watchers are the one thing that can safely be
+        # triggered from another thread.
+        self._loop_lag_watcher = self.hub.loop.async_(ref=False)
+        self._loop_lag_watcher.start(self._loop_lag_callback)
+        self.add_monitoring_function(self.monitor_loop_lag, period)
+        self.add_monitoring_function(self.report_loop_lag,
+                                     GEVENT_CONFIG.loop_lag_report_period)
+
+    def monitor_loop_lag(self, _hub):
+        # Called in the monitor thread. If the previous probe still
+        # hasn't run, we'll find out how late it was when it does.
+        watcher = self._loop_lag_watcher
+        if not self.should_run or watcher is None:
+            # We've been killed and the watcher closed.
+            return
+        if self._loop_lag_sent is None:
+            self._loop_lag_sent = perf_counter()
+            watcher.send()
+
+    def _loop_lag_callback(self):
+        # Called in the hub.
+        sent = self._loop_lag_sent
+        if sent is None:
+            return
+        lag = perf_counter() - sent
+        self._loop_lag_sent = None
+        self.loop_lag.record(lag)
+        self._loop_lag_interval.record(lag)
+
+    def report_loop_lag(self, _hub):
+        # Called in the monitor thread.
+        histogram = self._loop_lag_interval
+        if not histogram.count:
+            return
+        self._loop_lag_interval = LatencyHistogram()
+        event = EventLoopLagReport(histogram)
+        notify(event)
+        return event
+
+    def start_profiling(self, hz=100):
+        # Must be called in the hub's thread.
+        if hz <= 0:
+            raise ValueError("hz must be positive")
+        profiler = self.profiler
+        if profiler is None:
+            profiler = self.profiler = SamplingProfiler(self.hub, self._greenlet_tracer)
+        self.add_monitoring_function(profiler.sample, 1.0 / hz)
+        return profiler
+
+    def stop_profiling(self):
+        profiler = self.profiler
+        if profiler is not None:
+            self.add_monitoring_function(profiler.sample, None)
+            self.profiler = None
+        return profiler
+
     def monitor_memory_usage(self, _hub):
         max_allowed = GEVENT_CONFIG.max_memory_usage
         if not max_allowed:
@@ -118,6 +118,10 @@ class socket(object):
 
     # pylint:disable=too-many-public-methods
 
+    # The timer used by _wait, and the timeout it was created for.
+    _wait_timer = None
+    _wait_timer_seconds = None
+
     def __init__(self, family=AF_INET, type=SOCK_STREAM, proto=0, _sock=None):
         if _sock is None:
             self._sock = _realsocket(family, type, proto)
@@ -207,6 +211,9 @@ class socket(object):
         if self._write_event is not None:
             self.hub.cancel_wait(self._write_event, cancel_wait_ex, True)
             self._write_event = None
+        if self._wait_timer is not None:
+            self._wait_timer.close()
+            self._wait_timer = None
 
 
     def close(self, _closedsocket=_closedsocket):
@@ -353,6 +360,23 @@ class socket(object):
         data_memory = _get_memory(data)
         return _socketcommon._sendall(self, data_memory, flags)
 
+    def sendall_vectored(self, buffers, flags=0):
+        """
+        sendall_vectored(buffers[, flags])
+
+        Send the contents of each buffer in the sequence *buffers*, in
+        order, as if by ``sendall(''.join(buffers))``.
+
+        Python 2 has no ``sendmsg``, so this does join the buffers
+        before sending. See the Python 3 implementation.
+
+        .. versionadded:: 1.4
+        """
+        data = bytearray()
+        for buf in buffers:
+            data += buf
+        return self.sendall(data, flags)
+
     def sendto(self, *args):
         sock = self._sock
         try:
@@ -40,6 +40,13 @@ __dns__ = _socketcommon.__dns__
 
 SocketIO = __socket__.SocketIO # pylint:disable=no-member
 
+try:
+    _GiveupOnSendfile = __socket__._GiveupOnSendfile # pylint:disable=no-member
+except AttributeError:
+    # Python 3.4
+    class _GiveupOnSendfile(Exception):
+        pass
+
 
 def _get_memory(data):
     mv = memoryview(data)
@@ -51,6 +58,8 @@ def _get_memory(data):
 
 timeout_default = object()
 
+_HAS_SENDMSG = hasattr(_socket.socket, 'sendmsg')
+
 
 class _wrefsocket(_socket.socket):
     # Plain stdlib socket.socket objects subclass _socket.socket
@@ -89,6 +98,9 @@ class socket(object):
     _closed = False
     _read_event = None
     _write_event = None
+    # The timer used by _wait, and the timeout it was created for.
+    _wait_timer = None
+    _wait_timer_seconds = None
 
 
     # Take the same approach as socket2: wrap a real socket object,
@@ -277,6 +289,9 @@ class socket(object):
         if self._write_event is not None:
             self.hub.cancel_wait(self._write_event, cancel_wait_ex, True)
             self._write_event = None
+        if self._wait_timer is not None:
+            self._wait_timer.close()
+            self._wait_timer = None
 
     def _real_close(self, _ss=_socket.socket, cancel_wait_ex=cancel_wait_ex):
         # This function should not reference any globals. See Python issue #808164.
@@ -457,6 +472,25 @@ class socket(object):
         data_memory = _get_memory(data)
         return _socketcommon._sendall(self, data_memory, flags)
 
+    def sendall_vectored(self, buffers, flags=0):
+        """
+        sendall_vectored(buffers[, flags])
+
+        Send the contents of each bytes-like object in the sequence
+        *buffers*, in order, as if by ``sendall(b''.join(buffers))``.
+
+        Where the platform supports ``sendmsg``, the buffers are
+        handed to the kernel together (a vectored write), so
+        they are never copied into a single new byte string; partial
+        writes are resumed cooperatively just as with :meth:`sendall`.
+        The socket timeout applies to the entire operation.
+
+        .. versionadded:: 1.4
+        """
+        if _HAS_SENDMSG:
+            return _socketcommon._sendall_vectored(self, buffers, flags)
+        return self.sendall(b''.join(buffers), flags)
+
     def sendto(self, *args):
         try:
             return _socket.socket.sendto(self._sock, *args)
@@ -528,11 +562,68 @@ class socket(object):
         self._sock.shutdown(how)
 
     # sendfile: new in 3.5. But there's no real reason to not
-    # support it everywhere. Note that we can't use os.sendfile()
-    # because it's not cooperative.
-    def _sendfile_use_sendfile(self, file, offset=0, count=None):
-        # This is called directly by tests
-        raise __socket__._GiveupOnSendfile() # pylint:disable=no-member
+    # support it everywhere. os.sendfile() isn't cooperative by
+    # itself, but our underlying socket is always non-blocking, so we
+    # can call it until it reports EAGAIN and then wait on our write
+    # watcher, just like send() does.
+    if hasattr(os, 'sendfile'):
+        def _sendfile_use_sendfile(self, file, offset=0, count=None):
+            # This is called directly by tests
+            self._check_sendfile_params(file, offset, count)
+            sockno = self.fileno()
+            try:
+                fileno = file.fileno()
+            except (AttributeError, io.UnsupportedOperation) as err:
+                raise _GiveupOnSendfile(err)  # not a regular file
+            try:
+                fsize = os.fstat(fileno).st_size
+            except OSError as err:
+                raise _GiveupOnSendfile(err)  # not a regular file
+            if not fsize:
+                return 0  # empty file
+            # Truncate to 1GiB to avoid OverflowError, see bpo-38319.
+            blocksize = min(count or fsize, 2 ** 30)
+            if self.gettimeout() == 0:
+                raise ValueError("non-blocking sockets are not supported")
+
+            total_sent = 0
+            # localize variable access to minimize overhead
+            os_sendfile = os.sendfile
+            try:
+                while True:
+                    if count:
+                        blocksize = count - total_sent
+                        if blocksize <= 0:
+                            break
+                    try:
+                        sent = os_sendfile(sockno, fileno, offset, blocksize)
+                    except BlockingIOError:
+                        # Each wait is bounded by the socket timeout,
+                        # as for the standard library.
+                        self._wait(self._write_event)
+                        continue
+                    except OSError as err:
+                        if total_sent == 0:
+                            # We can get here for different reasons, the main
+                            # one being 'file' is not a regular mmap(2)-like
+                            # file, in which case we'll fall back on using
+                            # plain send().
+                            raise _GiveupOnSendfile(err)
+                        raise
+                    else:
+                        if sent == 0:
+                            break  # EOF
+                        offset += sent
+                        total_sent += sent
+                return total_sent
+            finally:
+                if total_sent > 0 and hasattr(file, 'seek'):
+                    file.seek(offset)
+    else:
+        def _sendfile_use_sendfile(self, file, offset=0, count=None):
+            # This is called directly by tests
+            raise _GiveupOnSendfile(
+                "os.sendfile() not available on this platform")
 
     def _sendfile_use_send(self, file, offset=0, count=None):
         self._check_sendfile_params(file, offset, count)
@@ -604,8 +695,15 @@ class socket(object):
         .. versionadded:: 1.1rc4
            Added in Python 3.5, but available under all Python 3 versions in
            gevent.
+        .. versionchanged:: 1.4
+           Use :func:`os.sendfile` cooperatively when it is available and
+           *file* is a regular file, instead of always reading the file
+           into memory and calling :meth:`send`.
         """
-        return self._sendfile_use_send(file, offset, count)
+        try:
+            return self._sendfile_use_sendfile(file, offset, count)
+        except _GiveupOnSendfile:
+            return self._sendfile_use_send(file, offset, count)
 
     # get/set_inheritable new in 3.4
     if hasattr(os, 'get_inheritable') or hasattr(os, 'get_handle_inheritable'):
@@ -68,6 +68,7 @@ __py3_imports__ = [
 
 __imports__.extend(__py3_imports__)
 
+import os
 import time
 import sys
 from gevent._hub_local import get_hub_noargs as get_hub
@@ -355,6 +356,71 @@ def _sendall(socket, data_memory, flags,
         timeleft = __send_chunk(socket, chunk, flags, timeleft, end)
         data_sent += len(chunk) # Guaranteed it sent the whole thing
 
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError): # pragma: no cover
+    _IOV_MAX = -1
+if _IOV_MAX <= 0: # pragma: no cover
+    # The minimum POSIX allows
+    _IOV_MAX = 16
+
+
+def _sendall_vectored(socket, buffers, flags):
+    """
+    Send the complete contents of the sequence of *buffers*, in order,
+    using ``sendmsg`` on the native socket wrapped by the gevent *socket*.
+
+    This avoids concatenating the buffers. A partial write leaves
+    us with a (memoryview) slice of the first unsent buffer. As with
+    :func:`_sendall`, the socket's timeout applies to the operation as
+    a whole.
+    """
+    pending = []
+    for buf in buffers:
+        buf = memoryview(buf)
+        if buf.itemsize != 1:
+            buf = buf.cast('B')
+        if len(buf):
+            pending.append(buf)
+    if not pending:
+        # Don't try to send empty data at all, as in _sendall.
+        return 0
+
+    end = None
+    timeleft = socket.timeout
+    if timeleft is not None:
+        end = time.time() + timeleft
+
+    sock = socket._sock
+    sendmsg = _realsocket.sendmsg # pylint:disable=no-member
+    first = 0
+    count = len(pending)
+    while first < count:
+        try:
+            sent = sendmsg(sock, pending[first:first + _IOV_MAX], (), flags)
+        except error as ex: # pylint:disable=undefined-variable
+            if ex.args[0] not in GSENDAGAIN or timeleft == 0.0:
+                raise
+            if end is not None:
+                timeleft = end - time.time()
+                if timeleft <= 0:
+                    raise _timeout_error('timed out')
+            _hub_primitives.wait_on_watcher(socket._write_event, timeleft,
+                                            _timeout_error('timed out'),
+                                            socket.hub)
+            continue
+
+        while sent:
+            buf = pending[first]
+            if sent >= len(buf):
+                sent -= len(buf)
+                pending[first] = None
+                first += 1
+            else:
+                pending[first] = buf[sent:]
+                sent = 0
+
 # pylint:disable=no-member
 _RESOLVABLE_FAMILIES = (__socket__.AF_INET,)
 if __socket__.has_ipv6:
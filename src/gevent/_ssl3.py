@@ -408,8 +408,6 @@ class SSLSocket(socket):
                 return None
             return self._sslobj.version()
 
-        # We inherit sendfile from super(); it always uses `send`
-
     def cipher(self):
         self._checkClosed()
         if not self._sslobj:
@@ -477,6 +475,22 @@ class SSLSocket(socket):
                 raise SSLWantWriteError("The operation did not complete (write)")
             raise
 
+    def sendfile(self, file, offset=0, count=None):
+        """Send a file, possibly by using os.sendfile() if this is a
+        clear-text socket.  Return the total number of bytes sent.
+        """
+        if self._sslobj is not None:
+            # os.sendfile() would bypass the encryption layer.
+            return self._sendfile_use_send(file, offset, count)
+        return socket.sendfile(self, file, offset, count)
+
+    def sendall_vectored(self, buffers, flags=0):
+        # sendmsg() would bypass the encryption layer; everything
+        # goes through the SSL object anyway, so copying is unavoidable.
+        if self._sslobj:
+            return self.sendall(b''.join(buffers), flags)
+        return socket.sendall_vectored(self, buffers, flags)
+
     def recv(self, buflen=1024, flags=0):
         self._checkClosed()
         if self._sslobj:
@@ -16,6 +16,7 @@ from gevent._compat import thread_mod_name
 __all__ = [
     'Lock',
     'Queue',
+    'HandoffQueue',
 ]
 
 
@@ -95,6 +96,12 @@ class _Condition(object):
         else:
             waiter.release()
 
+    def notify(self, n):
+        # The condition MUST be owned, but we don't check that.
+        waiters = self.__waiters
+        for _ in range(min(n, len(waiters))):
+            waiters.pop().release()
+
 
 class Queue(object):
     """Create a queue object.
@@ -158,6 +165,16 @@ class Queue(object):
             self.unfinished_tasks += 1
             self._not_empty.notify_one()
 
+    def put_many(self, items):
+        """Put all the *items* into the queue at once.
+
+        This takes the lock once, instead of once for each item.
+        """
+        with self._not_empty:
+            self._queue.extend(items)
+            self.unfinished_tasks += len(items)
+            self._not_empty.notify(len(items))
+
     def get(self):
         """Remove and return an item from the queue.
         """
@@ -166,3 +183,69 @@ class Queue(object):
                 self._not_empty.wait()
             item = self._queue.popleft()
             return item
+
+
+class HandoffQueue(Queue):
+    """
+    A queue like :class:`Queue`, for many consumer threads, that
+    consumers can take items from without taking the lock.
+
+    The items are kept in a deque, which is safe to use from several
+    threads at once. A consumer only takes the lock when it finds the
+    deque empty and parks itself, waiting on a lock of its own; a
+    producer only wakes a consumer if one is parked. Busy consumers
+    thus don't contend with each other.
+
+    .. versionadded:: 1.4
+    """
+
+    __slots__ = ('_parked',)
+
+    def __init__(self):
+        Queue.__init__(self)
+        # The locks that parked consumers are waiting on, most
+        # recently parked last. Protected by _mutex.
+        self._parked = []
+
+    def put(self, item):
+        """Put an item into the queue.
+        """
+        with self._mutex:
+            # Count it first, so that it can't be marked done before
+            # it's counted.
+            self.unfinished_tasks += 1
+            self._queue.append(item)
+            if self._parked:
+                self._parked.pop().release()
+
+    def put_many(self, items):
+        """Put all the *items* into the queue at once.
+        """
+        with self._mutex:
+            self.unfinished_tasks += len(items)
+            self._queue.extend(items)
+            parked = self._parked
+            for _ in range(min(len(items), len(parked))):
+                parked.pop().release()
+
+    def get(self):
+        """Remove and return an item from the queue.
+        """
+        queue = self._queue
+        while 1:
+            try:
+                return queue.popleft()
+            except IndexError:
+                pass
+            waiter = Lock()
+            waiter.acquire()
+            with self._mutex:
+                # Producers add items and look for a parked consumer
+                # while holding the lock, so if it's still empty now,
+                # whatever is added next will wake us.
+                if queue:
+                    continue
+                self._parked.append(waiter)
+            # Block on the native lock. We may find that another
+            # consumer got to the item first.
+            waiter.acquire()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 gevent. See LICENSE for details.
+"""
+A coarse-grained, hierarchical timing wheel.
+
+Starting and stopping a native loop timer watcher for every
+:class:`gevent.Timeout` is relatively expensive, and in the very
+common case of a timeout that guards an operation that completes
+quickly, the watcher is stopped again almost immediately. A
+:class:`TimerWheel` uses a single native timer that ticks at a fixed
+*resolution* while any of its timers are pending; starting and
+stopping one of its timers only adds it to or removes it from a set.
+
+The trade-off is precision: a timer started on the wheel never
+expires early, but it may expire up to one *resolution* late.
+
+This is used automatically by :class:`gevent.Timeout` (and hence by
+socket timeouts) when the :attr:`gevent.config.timer_wheel
+<gevent._config.Config.timer_wheel>` setting is enabled.
+
+.. versionadded:: 1.4
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+from math import ceil
+
+__all__ = [
+    'TimerWheel',
+]
+
+
+class _WheelTimer(object):
+    """
+    A timer scheduled on a :class:`TimerWheel`.
+
+    Provides the subset of the loop timer watcher API that
+    :class:`gevent.Timeout` uses.
+    """
+
+    __slots__ = (
+        'wheel',
+        'seconds',
+        'ref',
+        'callback',
+        'args',
+        'deadline',
+        '_bucket',
+    )
+
+    def __init__(self, wheel, seconds, ref=True):
+        self.wheel = wheel
+        self.seconds = seconds
+        self.ref = ref
+        self.callback = None
+        self.args = None
+        self.deadline = 0
+        self._bucket = None
+
+    def start(self, callback, *args, **kwargs):
+        if self._bucket is not None:
+            raise AssertionError("%r is already started" % (self,))
+        self.callback = callback
+        self.args = args
+        self.wheel._schedule(self, kwargs.get('update', False))
+
+    def stop(self):
+        if self._bucket is not None:
+            self.wheel._unschedule(self)
+        self.callback = None
+        self.args = None
+
+    def again(self, callback, *args, **kwargs):
+        # Unlike a native timer, stopping and starting again is enough
+        # to re-arm this from the current time.
+        self.stop()
+        self.start(callback, *args, **kwargs)
+
+    def close(self):
+        self.stop()
+
+    @property
+    def active(self):
+        return self._bucket is not None
+
+    @property
+    def pending(self):
+        # There is never a native callback queued but not yet run.
+        return False
+
+    def __repr__(self):
+        return '<%s at 0x%x seconds=%s%s>' % (
+            type(self).__name__, id(self), self.seconds,
+            ' active' if self.active else '')
+
+
+class TimerWheel(object):
+    """
+    TimerWheel(loop, resolution=0.01, slots=64, levels=4)
+
+    A hierarchical timing wheel of *levels* wheels of *slots*
+    buckets each. The first level has a granularity of one tick
+    (*resolution* seconds); each higher level has a granularity of
+    one complete revolution of the level below it. Timers further in
+    the future than the wheel can represent are parked in the last
+    bucket of the top level and re-examined when it comes around.
+
+    Timers are created with :meth:`timer` and have the ``start``,
+    ``again``, ``stop``, ``close``, ``active`` and ``pending`` members
+    of a loop timer watcher.
+    """
+
+    def __init__(self, loop, resolution=0.01, slots=64, levels=4):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        if levels < 1:
+            raise ValueError("levels must be positive")
+        self.loop = loop
+        self.resolution = resolution
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        # The largest number of ticks in the future we can represent.
+        self._max_delta = (1 << (self._bits * levels)) - 1
+        # The next tick to process, counted from the loop time *_origin*.
+        self._tick = 0
+        self._origin = None
+        self._count = 0
+        self._ref_count = 0
+        self._timer = loop.timer(resolution, resolution, ref=False)
+
+    def timer(self, seconds, ref=True):
+        """
+        Return a new timer that will expire no sooner than *seconds*
+        after it is started.
+        """
+        return _WheelTimer(self, seconds, ref)
+
+    def __len__(self):
+        return self._count
+
+    def _schedule(self, entry, update):
+        loop = self.loop
+        if update:
+            loop.update_now()
+        now = loop.now()
+        if self._origin is None:
+            self._origin = now
+            self._tick = 0
+            self._timer.start(self._on_tick)
+        entry.deadline = int(ceil((now + entry.seconds - self._origin) / self.resolution))
+        self._insert(entry)
+        self._count += 1
+        if entry.ref:
+            self._ref_count += 1
+            if self._ref_count == 1:
+                self._timer.ref = True
+
+    def _unschedule(self, entry):
+        entry._bucket.discard(entry)
+        entry._bucket = None
+        self._count -= 1
+        if entry.ref:
+            self._ref_count -= 1
+            if not self._ref_count:
+                self._timer.ref = False
+        # Leave the native timer running, unreferenced, if we're now
+        # empty: the common pattern is to start a timeout, cancel it,
+        # and immediately start another. The next tick will notice
+        # if we're still empty and stop it.
+
+    def _idle(self):
+        if self._timer is not None: # A callback may have closed us.
+            self._timer.stop()
+        self._origin = None
+
+    def _insert(self, entry):
+        tick = self._tick
+        deadline = entry.deadline
+        delta = deadline - tick
+        if delta < 0:
+            # Already due; process it on the next tick.
+            deadline = tick
+        elif delta > self._max_delta:
+            deadline = tick + self._max_delta
+
+        bits = self._bits
+        level = 0
+        limit = 1 << bits
+        last = len(self._wheels) - 1
+        while level < last and delta >= limit:
+            level += 1
+            limit <<= bits
+        bucket = self._wheels[level][(deadline >> (bits * level)) & self._mask]
+        bucket.add(entry)
+        entry._bucket = bucket
+
+    def _cascade(self, level):
+        # Move all the timers in the current bucket of *level* down
+        # to the finer levels, and return the index of that bucket.
+        index = (self._tick >> (self._bits * level)) & self._mask
+        buckets = self._wheels[level]
+        entries = buckets[index]
+        buckets[index] = set()
+        for entry in entries:
+            self._insert(entry)
+        return index
+
+    def _on_tick(self):
+        now = self.loop.now()
+        # The last tick that has completely elapsed.
+        target = int((now - self._origin) / self.resolution)
+        mask = self._mask
+        first_wheel = self._wheels[0]
+        levels = len(self._wheels)
+        while self._tick <= target and self._count:
+            index = self._tick & mask
+            if not index:
+                level = 1
+                while level < levels and not self._cascade(level):
+                    level += 1
+            self._tick += 1
+            expired = first_wheel[index]
+            if not expired:
+                continue
+            first_wheel[index] = set()
+            self._fire(expired)
+
+        if not self._count:
+            self._idle()
+
+    def _fire(self, expired):
+        # Pop, rather than iterate, because a callback may stop a
+        # timer that's still in this set.
+        while expired:
+            entry = expired.pop()
+            entry._bucket = None
+            self._count -= 1
+            if entry.ref:
+                self._ref_count -= 1
+                if not self._ref_count:
+                    self._timer.ref = False
+            callback = entry.callback
+            args = entry.args
+            entry.callback = entry.args = None
+            try:
+                callback(*args)
+            except: # pylint:disable=bare-except
+                self.loop.handle_error(entry, *sys.exc_info())
+
+    def close(self):
+        """
+        Stop the native timer and forget all pending timers
+        without running them.
+        """
+        for wheel in self._wheels:
+            for bucket in wheel:
+                for entry in bucket:
+                    entry._bucket = None
+                    entry.callback = entry.args = None
+                bucket.clear()
+        self._count = self._ref_count = 0
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer.close()
+            self._timer = None
+        self._origin = None
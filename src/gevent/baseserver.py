@@ -1,8 +1,11 @@
 """Base class for implementing servers"""
 # Copyright (c) 2009-2012 Denis Bilenko. See LICENSE for details.
+import os
 import sys
 import _socket
 import errno
+import signal
+from time import time
 from gevent.greenlet import Greenlet
 from gevent.event import Event
 from gevent.hub import get_hub
@@ -84,11 +87,60 @@ class BaseServer(object):
     #: to 1 when environ["wsgi.multiprocess"] is true)
     max_accept = 100
 
+    #: If true, instead of always attempting up to :attr:`max_accept`
+    #: accepts on each wake up, size each batch to the number of
+    #: connections that were pending on the previous wake up, growing
+    #: it (up to :attr:`max_accept`) while connections remain pending
+    #: after a batch. This avoids the extra, failing, accept call on
+    #: each wake up when connections arrive at a steady rate. In this
+    #: mode, servers may also defer work from the accept loop to the
+    #: greenlet that handles the connection; for example,
+    #: :class:`~gevent.server.StreamServer` on Python 3 creates the
+    #: client socket object there. Subclasses that override
+    #: ``do_read`` or ``do_handle`` should not enable this.
+    #:
+    #: .. versionadded:: 1.4
+    adaptive_accept = False
+
+    #: The number of connections accepted.
+    #:
+    #: .. versionadded:: 1.4
+    accept_count = 0
+
+    #: The number of times the listening socket was found readable.
+    #: ``accept_count / accept_wakeups`` is the average batch size.
+    #:
+    #: .. versionadded:: 1.4
+    accept_wakeups = 0
+
+    #: The number of wake ups that stopped accepting with connections
+    #: possibly still pending because the batch limit was reached.
+    #:
+    #: .. versionadded:: 1.4
+    accept_saturated = 0
+
+    #: The number of errors raised by accept calls.
+    #:
+    #: .. versionadded:: 1.4
+    accept_errors = 0
+
+    # The current batch size for adaptive_accept
+    _accept_batch = None
+
     _spawn = Greenlet.spawn
 
     #: the default timeout that we wait for the client connections to close in stop()
     stop_timeout = 1
 
+    #: When :meth:`serve_forever` runs multiple *workers*, whether each
+    #: worker process should listen on its own socket using
+    #: ``SO_REUSEPORT``, letting the kernel balance new connections
+    #: between them. This is only possible if the server was created
+    #: with an address (not a socket) and the platform and server type
+    #: support it; otherwise, all the workers accept connections from
+    #: a single socket created before forking.
+    reuse_port = True
+
     fatal_errors = (errno.EBADF, errno.EINVAL, errno.ENOTSOCK)
 
     def __init__(self, listener, handle=None, spawn='default'):
@@ -97,6 +149,7 @@ class BaseServer(object):
         self._watcher = None
         self._timer = None
         self._handle = None
+        self._workers = None
         # XXX: FIXME: Subclasses rely on the presence or absence of the
         # `socket` attribute to determine whether we are open/should be opened.
         # Instead, have it be None.
@@ -190,17 +243,37 @@ class BaseServer(object):
     def do_read(self):
         raise NotImplementedError()
 
+    def _do_read_raw(self):
+        # In adaptive_accept mode, the result is passed to _do_handle_raw.
+        return self.do_read()
+
+    def _do_handle_raw(self, *args):
+        self.do_handle(*args)
+
     def _do_read(self):
-        for _ in xrange(self.max_accept):
+        adaptive = self.adaptive_accept
+        if adaptive:
+            batch = min(self._accept_batch or self.max_accept, self.max_accept)
+            read = self._do_read_raw
+            handle = self._do_handle_raw
+        else:
+            batch = self.max_accept
+            read = self.do_read
+            handle = self.do_handle
+        self.accept_wakeups += 1
+        for accepted in xrange(batch):
             if self.full():
                 self.stop_accepting()
                 return
             try:
-                args = self.do_read()
+                args = read()
                 self.delay = self.min_delay
                 if not args:
+                    if adaptive:
+                        self._accept_batch = accepted or 1
                     return
             except:
+                self.accept_errors += 1
                 self.loop.handle_error(self, *sys.exc_info())
                 ex = sys.exc_info()[1]
                 if self.is_fatal_error(ex):
@@ -214,8 +287,9 @@ class BaseServer(object):
                     self.delay = min(self.max_delay, self.delay * 2)
                 break
             else:
+                self.accept_count += 1
                 try:
-                    self.do_handle(*args)
+                    handle(*args)
                 except:
                     self.loop.handle_error((args[1:], self), *sys.exc_info())
                     if self.delay >= 0:
@@ -224,6 +298,10 @@ class BaseServer(object):
                         self._timer.start(self._start_accepting_if_started)
                         self.delay = min(self.max_delay, self.delay * 2)
                     break
+        else:
+            self.accept_saturated += 1
+            if adaptive:
+                self._accept_batch = min(self.max_accept, batch * 2)
 
     def full(self):
         # copied from self.pool
@@ -352,6 +430,14 @@ class BaseServer(object):
         If the server does not use a pool, then this merely stops accepting connections;
         any spawned greenlets that are handling requests continue running until
         they naturally complete.
+
+        If the server is running worker processes (see
+        :meth:`serve_forever`), then they are each asked to stop
+        gracefully. Any that haven't exited one second after *timeout*
+        has expired are killed.
+
+        .. versionchanged:: 1.4
+           Stop worker processes.
         """
         self.close()
         if timeout is None:
@@ -359,22 +445,182 @@ class BaseServer(object):
         if self.pool:
             self.pool.join(timeout=timeout)
             self.pool.kill(block=True, timeout=1)
+        if self._workers is not None:
+            self._workers.stop(timeout)
 
 
-    def serve_forever(self, stop_timeout=None):
-        """Start the server if it hasn't been already started and wait until it's stopped."""
+    def serve_forever(self, stop_timeout=None, workers=None):
+        """
+        Start the server if it hasn't been already started and wait until it's stopped.
+
+        :keyword int workers: If given and greater than 1, then
+            instead of serving in this process, fork that many worker
+            processes (using :func:`gevent.os.fork_and_watch`, so each
+            child has a fresh hub) that serve in parallel, and
+            supervise them until the server is stopped. Each worker
+            has its own listening socket if :attr:`reuse_port` allows
+            it; otherwise the workers share the listening socket
+            created before forking, in which case consider lowering
+            :attr:`max_accept`. A worker that exits is restarted after
+            a delay that starts at :attr:`min_delay` and doubles, up to
+            :attr:`max_delay`, each time a worker exits more quickly
+            than that. Workers stop gracefully, with *stop_timeout*,
+            when they receive SIGTERM or SIGINT. Availability: POSIX.
+            The server must not already be started. As with
+            :func:`gevent.os.fork`, any other greenlets continue to
+            run in the workers, so this is best called from the main
+            greenlet before spawning any others.
+
+        .. versionchanged:: 1.4
+           Add the *workers* argument.
+        """
         # add test that serve_forever exists on stop()
-        if not self.started:
+        if workers is not None and workers > 1:
+            self._start_workers(workers, stop_timeout)
+        elif not self.started:
             self.start()
         try:
             self._stop_event.wait()
         finally:
             Greenlet.spawn(self.stop, timeout=stop_timeout).join()
 
+    def _start_workers(self, count, stop_timeout):
+        if not hasattr(os, 'fork'):
+            raise NotImplementedError("Worker processes require os.fork")
+        if self.started:
+            raise ValueError("Cannot start workers for a started server")
+        reuse_port = (self.reuse_port
+                      and not hasattr(self, 'socket')
+                      and self._reserve_reuse_port())
+        if not reuse_port:
+            self.init_socket()
+        self._workers = _WorkerProcesses(self, count, reuse_port, stop_timeout)
+        self._stop_event.clear()
+        try:
+            self._workers.start()
+        except:
+            self.stop()
+            raise
+
+    def _reserve_reuse_port(self):
+        """
+        Bind, but do not listen on, a socket for :attr:`address`
+        using ``SO_REUSEPORT`` so that the address can't be taken by
+        another process while we have worker processes. Return whether
+        this was possible; if not, the workers will share a socket
+        created by :meth:`init_socket`.
+        """
+        return False
+
+    def _get_reuse_port_listener(self):
+        """
+        In a worker process, return a new socket listening on
+        :attr:`address` using ``SO_REUSEPORT``. Called only if
+        :meth:`_reserve_reuse_port` returned true.
+        """
+        raise NotImplementedError()
+
     def is_fatal_error(self, ex):
         return isinstance(ex, _socket.error) and ex.args[0] in self.fatal_errors
 
 
+class _WorkerProcesses(object):
+    # Forks and supervises the worker processes for
+    # BaseServer.serve_forever(workers=N).
+
+    def __init__(self, server, count, reuse_port, stop_timeout):
+        self.server = server
+        self.count = count
+        self.reuse_port = reuse_port
+        self.stop_timeout = stop_timeout
+        # {pid: start time}
+        self.pids = {}
+        self.stopping = False
+        self.delay = server.min_delay
+        self._exited = Event()
+
+    def start(self):
+        for _ in xrange(self.count):
+            self.spawn_worker()
+
+    def spawn_worker(self):
+        if self.stopping:
+            return
+        from gevent.os import fork_and_watch
+        # Keep the loop alive while we have children even though
+        # the server isn't listening in this process.
+        pid = fork_and_watch(self._on_exit, ref=True)
+        if not pid:
+            self._run_worker()
+        self.pids[pid] = time()
+        self._exited.clear()
+
+    def _on_exit(self, watcher):
+        started = self.pids.pop(watcher.pid, None)
+        if started is None:
+            return
+        if not self.pids:
+            self._exited.set()
+        if self.stopping:
+            return
+        if time() - started < self.server.max_delay:
+            delay = self.delay
+            self.delay = min(self.server.max_delay, self.delay * 2)
+        else:
+            delay = self.delay = self.server.min_delay
+        Greenlet.spawn_later(delay, self.spawn_worker)
+
+    def _run_worker(self):
+        # In the child. Never returns.
+        from gevent.hub import signal as signal_handler
+        server = self.server
+        status = 1
+        # Don't let anything inherited from the parent fork more workers.
+        self.stopping = True
+        try:
+            server._workers = None
+            # The parent's greenlet, still waiting on the old
+            # event in serve_forever(), must not be woken in this
+            # process.
+            server._stop_event = Event()
+            server._stop_event.set()
+            if self.reuse_port:
+                reserved = server.socket
+                server.socket = server._get_reuse_port_listener()
+                reserved.close()
+            signal_handler(signal.SIGTERM, server.close)
+            signal_handler(signal.SIGINT, server.close)
+            server.serve_forever(stop_timeout=self.stop_timeout)
+            status = 0
+        except:
+            server.loop.handle_error(server, *sys.exc_info())
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(status)
+
+    def stop(self, timeout):
+        self.stopping = True
+        if not self.pids:
+            return
+        self._signal(signal.SIGTERM)
+        # The workers give their handlers *timeout* seconds,
+        # and then a second more to be killed.
+        if not self._exited.wait(timeout + 1):
+            self._signal(signal.SIGKILL)
+            self._exited.wait(1)
+
+    def _signal(self, signum):
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signum)
+            except OSError as ex:
+                if ex.errno != errno.ESRCH:
+                    raise
+
+
 def _extract_family(host):
     if host.startswith('[') and host.endswith(']'):
         host = host[1:-1]
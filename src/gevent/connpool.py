@@ -0,0 +1,302 @@
+# Copyright (c) 2018 gevent contributors. See LICENSE for details.
+"""
+A pool of reusable outbound connections.
+
+Opening a TCP connection, and especially negotiating TLS, often takes
+longer than the request that it is used for. A
+:class:`ConnectionPool` keeps connections that a caller is done with
+so that the next request to the same destination can reuse them::
+
+    pool = ConnectionPool(max_per_host=10)
+    with pool.connection('example.com', 443, ssl_context) as sock:
+        sock.sendall(request)
+        response = sock.recv(65536)
+
+The caller is responsible for only returning connections that are at
+a point where they can be reused (e.g., a complete HTTP/1.1 response
+with keep-alive has been read); a connection that is in an unknown
+state must be discarded.
+
+.. versionadded:: 1.4
+"""
+from __future__ import absolute_import, print_function, division
+
+from contextlib import contextmanager
+from errno import EAGAIN
+from errno import EWOULDBLOCK
+from collections import deque
+
+from gevent.hub import get_hub
+from gevent.lock import Semaphore
+from gevent.socket import create_connection
+from gevent.socket import error
+from gevent.socket import timeout as _socket_timeout
+from gevent.socket import MSG_PEEK
+from gevent.socket import _GLOBAL_DEFAULT_TIMEOUT
+
+__all__ = [
+    'ConnectionPool',
+]
+
+_BLOCKING_ERRNOS = (EAGAIN, EWOULDBLOCK)
+
+
+def _is_alive(sock, tls):
+    """
+    Return whether the idle *sock* can be reused, without blocking.
+    """
+    try:
+        # The underlying socket object is non-blocking.
+        data = sock._sock.recv(1, MSG_PEEK)
+    except error as ex:
+        return ex.args[0] in _BLOCKING_ERRNOS
+    if not data:
+        # The peer closed it.
+        return False
+    # Data that arrives on an idle plaintext connection means the
+    # protocol is out of step, or that the server sent an error
+    # before closing; either way, don't use it. TLS servers may send
+    # records of their own at any time (e.g., TLS 1.3 session tickets).
+    return tls
+
+
+def _is_closed(sock):
+    try:
+        return sock.fileno() == -1
+    except error:
+        # Python 2
+        return True
+
+
+class _HostPool(object):
+    __slots__ = (
+        'key',
+        'idle',
+        'semaphore',
+    )
+
+    def __init__(self, key, max_size):
+        self.key = key
+        # (sock, time it was returned), most recently returned last.
+        self.idle = deque()
+        # One for each connection being used.
+        self.semaphore = Semaphore(max_size)
+
+
+class ConnectionPool(object):
+    """
+    ConnectionPool(max_per_host=10, idle_timeout=60, connect_timeout=None, happy_eyeballs_delay=None)
+
+    A pool of idle :class:`gevent.socket.socket` connections, kept
+    separately for each ``(host, port, ssl_context)``.
+
+    At most *max_per_host* connections to each destination are in
+    use at a time; callers that want more wait their turn. Connections
+    that have been idle for more than *idle_timeout* seconds are
+    closed by a single periodic timer. Before an idle connection is
+    reused, it is checked with a non-blocking peek, and discarded if
+    the peer has closed it.
+
+    *connect_timeout* and *happy_eyeballs_delay* are passed to
+    :func:`gevent.socket.create_connection` when a new connection is
+    needed. If *connect_timeout* is None, the default socket timeout
+    applies.
+
+    A pool belongs to the hub of the thread that created it, and
+    must only be used from that thread.
+    """
+
+    def __init__(self, max_per_host=10, idle_timeout=60, connect_timeout=None,
+                 happy_eyeballs_delay=None, hub=None):
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be positive", max_per_host)
+        if hub is None:
+            hub = get_hub()
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.loop = hub.loop
+        # {(host, port, ssl_context): _HostPool}
+        self._pools = {}
+        # {sock: _HostPool} for the connections in use.
+        self._in_use = {}
+        self._reaper = None
+        self.closed = False
+
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connections_discarded = 0
+
+    def __repr__(self):
+        return '<%s at 0x%x hosts=%d in_use=%d idle=%d>' % (
+            type(self).__name__, id(self), len(self._pools),
+            len(self._in_use), self.idle_count())
+
+    def idle_count(self):
+        """
+        Return the number of idle connections in the pool.
+        """
+        return sum(len(pool.idle) for pool in self._pools.values())
+
+    def stats(self):
+        """
+        Return a new dictionary of counters: the number of connections
+        ``created``, ``reused`` and ``discarded`` (because they were
+        dead, idle for too long, or the caller discarded them), and
+        the current number ``in_use`` and ``idle``.
+        """
+        return {
+            'created': self.connections_created,
+            'reused': self.connections_reused,
+            'discarded': self.connections_discarded,
+            'in_use': len(self._in_use),
+            'idle': self.idle_count(),
+        }
+
+    def get(self, host, port, ssl_context=None, timeout=None):
+        """
+        Return a connection to *host* and *port*, reusing an idle one if
+        possible, and otherwise opening a new one. If *ssl_context* is
+        given, the connection is wrapped with it, using *host* as the
+        server hostname.
+
+        If the maximum number of connections to the destination are in
+        use, wait up to *timeout* seconds (forever, if None) for one to
+        be returned, raising :exc:`socket.timeout` if none is.
+
+        The connection must be given back to :meth:`put` or
+        :meth:`discard`.
+        """
+        if self.closed:
+            raise ValueError("Connection pool is closed")
+        key = (host, port, ssl_context)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(key, self.max_per_host)
+
+        if not pool.semaphore.acquire(timeout=timeout):
+            raise _socket_timeout('timed out waiting for a connection')
+        try:
+            sock = self._get_idle(pool, ssl_context is not None)
+            if sock is None:
+                sock = self._connect(host, port, ssl_context)
+        except: # pylint:disable=bare-except
+            pool.semaphore.release()
+            raise
+        self._in_use[sock] = pool
+        return sock
+
+    def _get_idle(self, pool, tls):
+        idle = pool.idle
+        while idle:
+            sock, _ = idle.pop()
+            if _is_alive(sock, tls):
+                self.connections_reused += 1
+                return sock
+            self._close(sock)
+        return None
+
+    def _connect(self, host, port, ssl_context):
+        timeout = self.connect_timeout
+        if timeout is None:
+            timeout = _GLOBAL_DEFAULT_TIMEOUT
+        sock = create_connection((host, port), timeout,
+                                 happy_eyeballs_delay=self.happy_eyeballs_delay)
+        if ssl_context is not None:
+            try:
+                sock = ssl_context.wrap_socket(sock, server_hostname=host)
+            except: # pylint:disable=bare-except
+                sock.close()
+                raise
+        self.connections_created += 1
+        return sock
+
+    def _close(self, sock):
+        self.connections_discarded += 1
+        try:
+            sock.close()
+        except error:
+            pass
+
+    def put(self, sock):
+        """
+        Give *sock*, which was returned by :meth:`get`, back to the pool
+        so that it can be reused.
+        """
+        pool = self._in_use.pop(sock)
+        try:
+            if self.closed or _is_closed(sock):
+                self._close(sock)
+            else:
+                pool.idle.append((sock, self.loop.now()))
+                self._start_reaper()
+        finally:
+            pool.semaphore.release()
+
+    def discard(self, sock):
+        """
+        Close *sock*, which was returned by :meth:`get`, instead of giving
+        it back to the pool.
+        """
+        pool = self._in_use.pop(sock)
+        try:
+            self._close(sock)
+        finally:
+            pool.semaphore.release()
+
+    @contextmanager
+    def connection(self, host, port, ssl_context=None, timeout=None):
+        """
+        A context manager for a connection from :meth:`get`. The
+        connection is given back with :meth:`put` when the block
+        finishes, or closed with :meth:`discard` if it raises an
+        exception.
+        """
+        sock = self.get(host, port, ssl_context, timeout)
+        try:
+            yield sock
+        except: # pylint:disable=bare-except
+            self.discard(sock)
+            raise
+        else:
+            self.put(sock)
+
+    def _start_reaper(self):
+        if self._reaper is None and self.idle_timeout is not None:
+            interval = max(self.idle_timeout / 2.0, 0.001)
+            self._reaper = self.loop.timer(interval, interval)
+            # Idle connections shouldn't keep the loop running.
+            self._reaper.ref = False
+            self._reaper.start(self._reap)
+
+    def _stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.stop()
+            self._reaper.close()
+            self._reaper = None
+
+    def _reap(self):
+        deadline = self.loop.now() - self.idle_timeout
+        for key, pool in list(self._pools.items()):
+            idle = pool.idle
+            # The oldest connections are first.
+            while idle and idle[0][1] <= deadline:
+                self._close(idle.popleft()[0])
+            if not idle and pool.semaphore.counter == self.max_per_host:
+                # Nothing idle or in use.
+                del self._pools[key]
+        if not self._pools:
+            self._stop_reaper()
+
+    def close(self):
+        """
+        Close the idle connections. Connections in use are closed when
+        they are given back.
+        """
+        self.closed = True
+        self._stop_reaper()
+        for pool in self._pools.values():
+            while pool.idle:
+                self._close(pool.idle.pop()[0])
+        self._pools.clear()
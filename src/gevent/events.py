@@ -32,6 +32,8 @@ __all__ = [
     # monitor thread
     'IEventLoopBlocked',
     'EventLoopBlocked',
+    'IEventLoopLagReport',
+    'EventLoopLagReport',
     'IMemoryUsageThresholdExceeded',
     'MemoryUsageThresholdExceeded',
     'IMemoryUsageUnderThreshold',
@@ -139,6 +141,38 @@ class IPeriodicMonitorThread(Interface):
         A *period* less than or equal to zero is not allowed.
         """
 
+    loop_lag = Attribute(
+        "A histogram of how late the callbacks scheduled by the "
+        "monitor thread ran in the hub, since the monitor started, "
+        "or None if this isn't being measured. "
+        "See :attr:`gevent._config.Config.loop_lag_period`.")
+
+    def start_profiling(hz=100):
+        """
+        Begin sampling the stack of the hub's thread *hz* times a
+        second, and return the :class:`gevent._monitor.SamplingProfiler`
+        collecting the samples.
+
+        If profiling is already running, its rate is changed and
+        the existing profiler is returned.
+
+        This must be called in the hub's thread.
+
+        .. versionadded:: 1.4
+        """
+
+    def stop_profiling():
+        """
+        Stop sampling and return the profiler that was collecting the
+        samples, or None if profiling wasn't running.
+
+        .. versionadded:: 1.4
+        """
+
+    profiler = Attribute(
+        "The :class:`gevent._monitor.SamplingProfiler` collecting "
+        "samples, or None if we're not profiling.")
+
 class IPeriodicMonitorThreadStartedEvent(Interface):
     """
     The event emitted when a hub starts a periodic monitoring thread.
@@ -184,6 +218,48 @@ class EventLoopBlocked(object):
         self.blocking_time = blocking_time
         self.info = info
 
+class IEventLoopLagReport(Interface):
+    """
+    The event emitted periodically to summarize how late callbacks
+    scheduled by the monitor thread ran in the hub.
+
+    A callback that runs late means that the event loop was busy
+    (running other greenlets or callbacks) and could not react to new
+    IO promptly. A rising lag is an early warning that the loop is
+    becoming saturated.
+
+    All times are in seconds. This event is emitted in the monitor thread.
+
+    .. versionadded:: 1.4
+    """
+
+    histogram = Attribute("The histogram of lag measurements in this interval.")
+    count = Attribute("The number of lag measurements in this interval.")
+    p50 = Attribute("The median lag.")
+    p99 = Attribute("The 99th percentile lag.")
+    p999 = Attribute("The 99.9th percentile lag.")
+    max = Attribute("The largest lag.")
+
+@implementer(IEventLoopLagReport)
+class EventLoopLagReport(object):
+    """
+    Implementation of `IEventLoopLagReport`.
+    """
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.count = histogram.count
+        self.p50 = histogram.percentile(50)
+        self.p99 = histogram.percentile(99)
+        self.p999 = histogram.percentile(99.9)
+        self.max = histogram.max
+
+    def __repr__(self):
+        return "<%s count=%d p50=%.6f p99=%.6f p999=%.6f max=%.6f>" % (
+            self.__class__.__name__,
+            self.count, self.p50, self.p99, self.p999, self.max
+        )
+
 class IMemoryUsageThresholdExceeded(Interface):
     """
     The event emitted when the memory usage threshold is exceeded.
@@ -414,6 +414,21 @@ class Hub(WaitOperationsGreenlet):
     def ident_registry(self):
         return IdentRegistry()
 
+    @Lazy
+    def timer_wheel(self):
+        """
+        The :class:`gevent._timerwheel.TimerWheel` used for the timers of
+        :class:`gevent.Timeout` objects, or ``None`` if the
+        :attr:`gevent.config.timer_wheel <gevent._config.Config.timer_wheel>`
+        setting is not enabled.
+
+        .. versionadded:: 1.4
+        """
+        if not GEVENT_CONFIG.timer_wheel:
+            return None
+        from gevent._timerwheel import TimerWheel
+        return TimerWheel(self.loop, GEVENT_CONFIG.timer_wheel_resolution)
+
     @property
     def loop_class(self):
         return GEVENT_CONFIG.loop
@@ -593,6 +608,7 @@ class Hub(WaitOperationsGreenlet):
             from gevent.events import PeriodicMonitorThreadStartedEvent
             from gevent.events import notify_and_call_entry_points
             self.periodic_monitoring_thread = PeriodicMonitoringThread(self)
+            self.periodic_monitoring_thread.install_monitor_loop_lag()
 
             if self.main_hub:
                 self.periodic_monitoring_thread.install_monitor_memory_usage()
@@ -648,6 +664,9 @@ class Hub(WaitOperationsGreenlet):
         if self._threadpool is not None:
             self._threadpool.kill()
             del self._threadpool
+        timer_wheel = self.__dict__.pop('timer_wheel', None)
+        if timer_wheel is not None:
+            timer_wheel.close()
         if destroy_loop is None:
             destroy_loop = not self.loop.default
         if destroy_loop:
@@ -674,7 +693,11 @@ class Hub(WaitOperationsGreenlet):
 
     def _get_resolver(self):
         if self._resolver is None:
-            self._resolver = self.resolver_class(hub=self) # pylint:disable=not-callable
+            resolver = self.resolver_class(hub=self) # pylint:disable=not-callable
+            if GEVENT_CONFIG.resolver_cache:
+                from gevent.resolver.cache import Resolver as CachingResolver
+                resolver = CachingResolver(resolver, hub=self)
+            self._resolver = resolver
         return self._resolver
 
     def _set_resolver(self, value):
@@ -75,6 +75,16 @@ static void gevent_callback(struct PyGeventLoopObject* loop, PyObject* callback,
     long length;
     py_events = 0;
     GIL_ENSURE;
+    /* Counters for loop.stats() */
+    if (revents & (EV_READ|EV_WRITE)) {
+        loop->_io_events++;
+    }
+    else if (revents & EV_TIMER) {
+        loop->_timers_fired++;
+    }
+    else {
+        loop->_other_events++;
+    }
     Py_INCREF(loop);
     Py_INCREF(callback);
     Py_INCREF(args);
@@ -32,6 +32,7 @@ from libc.errno cimport errno
 cdef extern from "Python.h":
     int    Py_ReprEnter(object)
     void   Py_ReprLeave(object)
+    Py_ssize_t Py_REFCNT(object)
 
 # Work around lack of absolute_import in Cython
 # Note for PY3: not doing so will leave reference to locals() on import
@@ -41,6 +42,7 @@ os = __import__('os', level=0)
 traceback = __import__('traceback', level=0)
 signalmodule = __import__('signal', level=0)
 getswitchinterval = __import__('gevent', level=0).getswitchinterval
+perf_counter = __import__('gevent._compat', level=0, fromlist=['perf_counter']).perf_counter
 
 
 __all__ = ['get_version',
@@ -310,6 +312,8 @@ cdef public class callback [object PyGeventCallbackObject, type PyGeventCallback
         return ''
 
 DEF CALLBACK_CHECK_COUNT = 50
+# The most callback objects we keep around for reuse by run_callback.
+DEF CALLBACK_FREELIST_SIZE = 256
 
 @cython.final
 @cython.internal
@@ -384,6 +388,9 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
     cdef public object error_handler
     cdef libev.ev_loop* _ptr
     cdef public CallbackFIFO _callbacks
+    # Callback objects that have run and can be reused, linked
+    # through their ``next`` member.
+    cdef callback _free_callbacks
 
     ## data members
     cdef bint starting_timer_may_update_loop_time
@@ -392,10 +399,28 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
     # the libev internal pointer to 0, and ev_is_default_loop will
     # no longer work.
     cdef bint _default
+    cdef int _free_callback_count
+
+    # Counters for stats(). The watcher counters are maintained
+    # by gevent_callback in callbacks.c
+    cdef unsigned long long _callbacks_run
+    cdef unsigned long long _callbacks_deferred
+    cdef unsigned long long _io_events
+    cdef unsigned long long _timers_fired
+    cdef unsigned long long _other_events
+    # Timings for stats(), if stats_timing is enabled.
+    cdef bint _stats_timing
+    cdef double _blocked_time
+    cdef double _running_time
+    cdef double _longest_callback
+    cdef double _timing_mark
+    cdef object _timing_check
 
     def __cinit__(self, object flags=None, object default=None, libev.intptr_t ptr=0):
         self.starting_timer_may_update_loop_time = 0
         self._default = 0
+        self._free_callback_count = 0
+        self._stats_timing = 0
         libev.ev_prepare_init(&self._prepare,
                               <void*>gevent_run_callbacks)
         libev.ev_timer_init(&self._periodic_signal_checker,
@@ -445,6 +470,10 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
         cdef callback cb
         cdef object callbacks
         cdef int count = CALLBACK_CHECK_COUNT
+        cdef unsigned long long ran = 0
+        cdef bint timing = self._stats_timing
+        cdef double began
+        cdef double took
         self.starting_timer_may_update_loop_time = True
         cdef libev.ev_tstamp now = libev.ev_now(self._ptr)
         cdef libev.ev_tstamp expiration = now + <libev.ev_tstamp>getswitchinterval()
@@ -455,9 +484,27 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
                 cb = self._callbacks.popleft()
 
                 libev.ev_unref(self._ptr)
+                if cb.callback is not None and cb.args is not None:
+                    ran += 1
+                if timing:
+                    began = perf_counter()
                 gevent_call(self, cb) # XXX: Why is this a C callback, not cython?
+                if timing:
+                    took = perf_counter() - began
+                    if took > self._longest_callback:
+                        self._longest_callback = took
                 count -= 1
 
+                # run_callback returns the callback object, so we can only
+                # recycle it if nobody but us still has a reference.
+                if (self._free_callback_count < CALLBACK_FREELIST_SIZE
+                        and Py_REFCNT(cb) == 1):
+                    cb.callback = None
+                    cb.args = None
+                    cb.next = self._free_callbacks
+                    self._free_callbacks = cb
+                    self._free_callback_count += 1
+
                 if count == 0 and self._callbacks.head is not None:
                     # We still have more to run but we've reached
                     # the end of one check group
@@ -466,6 +513,7 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
                     libev.ev_now_update(self._ptr)
                     if libev.ev_now(self._ptr) >= expiration:
                         now = 0
+                        self._callbacks_deferred += len(self._callbacks)
                         break
 
             if now != 0:
@@ -474,6 +522,61 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
                 libev.ev_timer_start(self._ptr, &self._timer0)
         finally:
             self.starting_timer_may_update_loop_time = False
+            self._callbacks_run += ran
+            if timing:
+                # We're about to block polling for events.
+                self._stats_mark_running()
+
+    def _stats_mark_running(self):
+        # Charge the time since the last mark to running Python code.
+        cdef double now = perf_counter()
+        self._running_time += now - self._timing_mark
+        self._timing_mark = now
+
+    def _stats_mark_blocked(self):
+        # We've just finished polling for events; charge the time
+        # since the last mark to being blocked.
+        cdef double now = perf_counter()
+        self._blocked_time += now - self._timing_mark
+        self._timing_mark = now
+
+    @property
+    def stats_timing(self):
+        return self._stats_timing
+
+    @stats_timing.setter
+    def stats_timing(self, value):
+        value = bool(value)
+        if value == self._stats_timing:
+            return
+        self._stats_timing = value
+        self._timing_mark = perf_counter()
+        if value:
+            self._timing_check = self.check(ref=False)
+            self._timing_check.start(self._stats_mark_blocked)
+        else:
+            self._timing_check.close()
+            self._timing_check = None
+
+    def stats(self):
+        """
+        Return a new dictionary of counters describing the work
+        this loop has done since it was created.
+
+        See :meth:`gevent._interfaces.ILoop.stats`.
+        """
+        _check_loop(self)
+        return {
+            'iterations': libev.ev_iteration(self._ptr),
+            'callbacks_run': self._callbacks_run,
+            'callbacks_deferred': self._callbacks_deferred,
+            'io_events': self._io_events,
+            'timers_fired': self._timers_fired,
+            'other_events': self._other_events,
+            'blocked_time': self._blocked_time,
+            'running_time': self._running_time,
+            'longest_callback': self._longest_callback,
+        }
 
     cdef _stop_watchers(self, libev.ev_loop* ptr):
         if not ptr:
@@ -499,10 +602,15 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
                 return
             # Mark as destroyed
             libev.ev_set_userdata(ptr, NULL)
+            if self._timing_check is not None:
+                self._timing_check.close()
+                self._timing_check = None
             self._stop_watchers(ptr)
             if __SYSERR_CALLBACK == self._handle_syserr:
                 set_syserr_cb(None)
             libev.ev_loop_destroy(ptr)
+        self._free_callbacks = None
+        self._free_callback_count = 0
 
     def __dealloc__(self):
         cdef libev.ev_loop* ptr = self._ptr
@@ -676,7 +784,15 @@ cdef public class loop [object PyGeventLoopObject, type PyGeventLoop_Type]:
 
     def run_callback(self, func, *args):
         _check_loop(self)
-        cdef callback cb = callback(func, args)
+        cdef callback cb = self._free_callbacks
+        if cb is not None:
+            self._free_callbacks = cb.next
+            self._free_callback_count -= 1
+            cb.next = None
+            cb.callback = func
+            cb.args = args
+        else:
+            cb = callback(func, args)
         self._callbacks.append(cb)
         libev.ev_ref(self._ptr)
         return cb
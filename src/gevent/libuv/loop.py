@@ -101,6 +101,8 @@ class loop(AbstractLoop):
         self._pid = os.getpid()
         self._default = self._ptr == libuv.uv_default_loop()
         self._queued_callbacks = []
+        # libuv doesn't count its iterations for us.
+        self._iterations = 0
 
     def _queue_callback(self, watcher_ptr, revents):
         self._queued_callbacks.append((watcher_ptr, revents))
@@ -469,6 +471,7 @@ class loop(AbstractLoop):
                 # could take twice as long as the switch interval.
                 self._run_callbacks()
                 self._prepare_ran_callbacks = False
+                self._iterations += 1
                 ran_status = libuv.uv_run(self._ptr, libuv.UV_RUN_ONCE)
                 # Note that we run queued callbacks when the prepare watcher runs,
                 # thus accounting for timers that expired before polling for IO,
@@ -485,10 +488,14 @@ class loop(AbstractLoop):
                     return ran_status
             return 0 # Somebody closed the loop
 
+        self._iterations += 1
         result = libuv.uv_run(self._ptr, mode)
         self.__run_queued_callbacks()
         return result
 
+    def _stats_iterations(self):
+        return self._iterations
+
     def now(self):
         # libuv's now is expressed as an integer number of
         # milliseconds, so to get it compatible with time.time units
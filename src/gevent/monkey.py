@@ -786,20 +786,28 @@ def patch_ssl(_warnings=None, _first_time=True):
 @_ignores_DoNotPatch
 def patch_select(aggressive=True):
     """
-    Replace :func:`select.select` with :func:`gevent.select.select`
-    and :func:`select.poll` with :class:`gevent.select.poll` (where available).
+    Replace :func:`select.select` with :func:`gevent.select.select`,
+    :func:`select.poll` with :class:`gevent.select.poll` and
+    :func:`select.epoll` with :class:`gevent.select.epoll` (where available).
 
     If ``aggressive`` is true (the default), also remove other
     blocking functions from :mod:`select` and (on Python 3.4 and
-    above) :mod:`selectors`:
+    above) :mod:`selectors`, and make
+    :class:`gevent.selectors.GeventSelector` the
+    :class:`selectors.DefaultSelector`:
 
-    - :func:`select.epoll`
     - :func:`select.kqueue`
     - :func:`select.kevent`
     - :func:`select.devpoll` (Python 3.5+)
     - :class:`selectors.EpollSelector`
     - :class:`selectors.KqueueSelector`
     - :class:`selectors.DevpollSelector` (Python 3.5+)
+
+    .. versionchanged:: 1.4
+       :func:`select.epoll` is patched instead of removed, and the
+       default selector is
+       :class:`gevent.selectors.GeventSelector` instead of
+       :class:`selectors.SelectSelector`.
     """
 
     source_mod, target_mod = _patch_module('select', _notify_did_subscribers=False)
@@ -808,7 +816,8 @@ def patch_select(aggressive=True):
         # since these are blocking we're removing them here. This makes some other
         # modules (e.g. asyncore)  non-blocking, as they use select that we provide
         # when none of these are available.
-        remove_item(select, 'epoll')
+        if 'epoll' not in source_mod.__implements__:
+            remove_item(select, 'epoll')
         remove_item(select, 'kqueue')
         remove_item(select, 'kevent')
         remove_item(select, 'devpoll')
@@ -843,11 +852,14 @@ def patch_select(aggressive=True):
         if aggressive:
             # If `selectors` had already been imported before we removed
             # select.epoll|kqueue|devpoll, these may have been defined in terms
-            # of those functions. They'll fail at runtime.
+            # of those functions. They'll fail at runtime. EpollSelector
+            # needs a real epoll file descriptor for fileno(), which
+            # gevent.select.epoll doesn't have.
             remove_item(selectors, 'EpollSelector')
             remove_item(selectors, 'KqueueSelector')
             remove_item(selectors, 'DevpollSelector')
-            selectors.DefaultSelector = selectors.SelectSelector
+            from gevent.selectors import GeventSelector
+            selectors.DefaultSelector = GeventSelector
 
     from gevent import events
     _notify_patch(events.GeventDidPatchModuleEvent('select', source_mod, target_mod))
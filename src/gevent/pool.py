@@ -15,12 +15,17 @@ reached the limit, until there is a free slot.
 """
 from __future__ import print_function, absolute_import, division
 
+import sys
 
 from gevent.hub import GreenletExit, getcurrent, kill as _kill
+from gevent.hub import get_hub
 from gevent.greenlet import joinall, Greenlet
 from gevent.queue import Full as QueueFull
+from gevent.queue import Empty as QueueEmpty
+from gevent.queue import UnboundQueue
 from gevent.timeout import Timeout
 from gevent.event import Event
+from gevent.event import AsyncResult
 from gevent.lock import Semaphore, DummySemaphore
 
 from gevent._compat import izip
@@ -31,6 +36,7 @@ __all__ = [
     'Group',
     'Pool',
     'PoolFull',
+    'WorkerPool',
 ]
 
 
@@ -649,6 +655,192 @@ class Pool(Group):
         self._semaphore.release()
 
 
+class WorkerPool(GroupMappingMixin):
+    """
+    Runs tasks in a bounded number of long-lived greenlets.
+
+    :class:`Pool` creates (and tracks, and discards) a new
+    :class:`~.Greenlet` for every task. When there are very many small
+    tasks, that overhead can dominate. Instead, this class starts up
+    to *size* worker greenlets, as they are needed, each of which
+    repeatedly takes a task from an internal queue and runs it.
+
+    The mapping methods (:meth:`map`, :meth:`imap`,
+    :meth:`imap_unordered`, :meth:`apply`, :meth:`apply_async` and
+    so on) are the same as those of :class:`Pool`. The difference is
+    that :meth:`spawn` returns a :class:`~gevent.event.AsyncResult`
+    instead of a greenlet, so individual tasks cannot be killed or
+    linked to, only waited on (or :meth:`rawlinked
+    <gevent.event.AsyncResult.rawlink>`). Because the worker greenlets
+    are reused, greenlet-local state (such as :class:`gevent.local.local`
+    objects) is shared between the tasks run by a worker.
+
+    .. versionadded:: 1.4
+    """
+
+    greenlet_class = Greenlet
+
+    def __init__(self, size, greenlet_class=None):
+        """
+        :param int size: The maximum number of tasks that can be
+            running at once, and hence of worker greenlets. Must be
+            positive.
+        :keyword greenlet_class: The class of the worker greenlets.
+        """
+        if size is None or size < 1:
+            raise ValueError('size must be positive: %r' % (size, ))
+        self.size = size
+        if greenlet_class is not None:
+            self.greenlet_class = greenlet_class
+        self._semaphore = Semaphore(size)
+        self._queue = UnboundQueue()
+        self._workers = Group()
+        # The number of workers waiting for a task that we haven't
+        # already queued one for.
+        self._idle = 0
+        # The number of tasks spawned but not finished.
+        self._outstanding = 0
+        self._empty = Event()
+        self._empty.set()
+
+    def __repr__(self):
+        return '<%s at 0x%x %s/%s workers=%s>' % (
+            type(self).__name__, id(self), len(self), self.size,
+            len(self._workers))
+
+    def __len__(self):
+        """
+        Answer how many tasks are queued or running.
+        """
+        return self._outstanding
+
+    def spawn(self, func, *args, **kwargs):
+        """
+        Queue ``func(*args, **kwargs)`` to run in a worker greenlet,
+        first waiting until fewer than *size* tasks are outstanding.
+
+        :return: A :class:`gevent.event.AsyncResult` for the result
+            of *func*.
+        """
+        self._semaphore.acquire()
+        result = AsyncResult()
+        self._outstanding += 1
+        self._empty.clear()
+        if self._idle:
+            self._idle -= 1
+        else:
+            self._workers.start(self.greenlet_class(self._worker))
+        self._queue.put((result, func, args, kwargs))
+        return result
+
+    def _worker(self):
+        get = self._queue.get
+        while 1:
+            result, func, args, kwargs = get()
+            try:
+                try:
+                    value = func(*args, **kwargs)
+                except GreenletExit as ex:
+                    # We're being killed.
+                    result.set_exception(ex)
+                    raise
+                except: # pylint:disable=bare-except
+                    exc_info = sys.exc_info()
+                    result.set_exception(exc_info[1], exc_info)
+                    get_hub().handle_error(func, *exc_info)
+                    exc_info = None
+                else:
+                    result.set(value)
+                    value = None
+                self._idle += 1
+            finally:
+                result = func = args = kwargs = None
+                self._task_done()
+
+    def _task_done(self):
+        self._outstanding -= 1
+        if not self._outstanding:
+            self._empty.set()
+        self._semaphore.release()
+
+    def join(self, timeout=None):
+        """
+        Wait for all the queued and running tasks to finish.
+
+        :return: True if they did, False if *timeout* expired first.
+        """
+        return self._empty.wait(timeout=timeout)
+
+    def kill(self, block=True, timeout=None):
+        """
+        Kill the worker greenlets, and discard any tasks that haven't
+        started yet. The results of the tasks that were running or
+        discarded are set to a :exc:`~gevent.GreenletExit`.
+
+        The pool remains usable; new workers are started as needed.
+        """
+        self._workers.kill(block=block, timeout=timeout)
+        self._idle = 0
+        while 1:
+            try:
+                result = self._queue.get_nowait()[0]
+            except QueueEmpty:
+                break
+            result.set_exception(GreenletExit())
+            self._task_done()
+
+    def full(self):
+        """
+        Return whether :meth:`spawn` would block.
+        """
+        return self.free_count() <= 0
+
+    def free_count(self):
+        """
+        Return how many more tasks can be spawned without blocking.
+        """
+        return self._semaphore.counter
+
+    def wait_available(self, timeout=None):
+        """
+        Wait until it's possible to spawn a task without blocking.
+
+        :return: The result of :meth:`free_count`, or 0 if *timeout*
+            expired first.
+        """
+        return self._semaphore.wait(timeout=timeout)
+
+    def apply_async(self, func, args=None, kwds=None, callback=None):
+        """
+        As for :meth:`Pool.apply_async`, except that the return value
+        is a :class:`~gevent.event.AsyncResult` unless this pool is
+        full, and the *callback* runs in the worker greenlet before the
+        result is set.
+        """
+        if callback is None or self._apply_async_use_greenlet():
+            return GroupMappingMixin.apply_async(self, func, args, kwds, callback)
+        return self.spawn(_apply_with_callback, func, args or (), kwds or {}, callback)
+
+    def _apply_immediately(self):
+        return getcurrent() in self._workers
+
+    def _apply_async_use_greenlet(self):
+        return self.full()
+
+    def _apply_async_cb_spawn(self, callback, result):
+        Greenlet.spawn(callback, result)
+
+
+def _apply_with_callback(func, args, kwds, callback):
+    # For WorkerPool.apply_async
+    value = func(*args, **kwds)
+    try:
+        callback(value)
+    except: # pylint:disable=bare-except
+        get_hub().handle_error(callback, *sys.exc_info())
+    return value
+
+
 class pass_value(object):
     __slots__ = ['callback']
 
@@ -82,6 +82,22 @@ _REQUEST_TOO_LONG_RESPONSE = b"HTTP/1.1 414 Request URI Too Long\r\nConnection:
 _BAD_REQUEST_RESPONSE = b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-length: 0\r\n\r\n"
 _CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
 
+# The most distinct statuses, and header (name, value) pairs, a
+# server remembers the checked and encoded form of.
+_MAX_RESPONSE_HEADER_CACHE = 256
+# Headers whose values usually differ from one response to the next;
+# there's no point remembering them.
+_UNCACHED_RESPONSE_HEADERS = frozenset((
+    'content-length',
+    'content-range',
+    'date',
+    'etag',
+    'expires',
+    'last-modified',
+    'location',
+    'set-cookie',
+))
+
 
 def format_date_time(timestamp):
     # Return a byte-string of the date and time in HTTP format
@@ -370,6 +386,154 @@ except ImportError:
         return ret
 
 
+class _ParsedHeaders(object):
+    """
+    The request headers as read by :func:`_read_headers`.
+
+    This provides the parts of the :attr:`WSGIHandler.MessageClass`
+    API that are commonly used: case-insensitive ``get`` (the first
+    value of a header), ``getheader``, ``get_all``, item access and
+    deletion, ``items``, and the ``headers``, ``typeheader`` and
+    ``status`` attributes.
+    """
+
+    status = ''
+
+    def __init__(self, lines):
+        # [(name, value)] in the order received.
+        self._items = items = []
+        for line in lines:
+            if line[:1] in (' ', '\t'):
+                # An obsolete line folding; RFC 7230 3.2.4 lets us
+                # replace it with a space.
+                if not items:
+                    raise _InvalidClientRequest('Invalid header continuation: %r' % (line,))
+                name, value = items[-1]
+                items[-1] = (name, value + ' ' + line.strip())
+                continue
+            name, sep, value = line.partition(':')
+            if not sep or not name or name.rstrip() != name:
+                raise _InvalidClientRequest('Invalid header line: %r' % (line,))
+            items.append((name, value.strip()))
+        # {lowercase name: first value}
+        self._first = first = {}
+        for name, value in reversed(items):
+            first[name.lower()] = value
+
+    def get(self, name, default=None):
+        return self._first.get(name.lower(), default)
+
+    getheader = get
+
+    def get_all(self, name, failobj=None):
+        name = name.lower()
+        values = [v for k, v in self._items if k.lower() == name]
+        return values or failobj
+
+    def __getitem__(self, name):
+        return self._first.get(name.lower())
+
+    def __contains__(self, name):
+        return name.lower() in self._first
+
+    def __delitem__(self, name):
+        # Like email.message.Message, remove all of them, and don't
+        # complain if there are none.
+        name = name.lower()
+        self._items = [(k, v) for k, v in self._items if k.lower() != name]
+        self._first.pop(name, None)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return [k for k, _ in self._items]
+
+    def values(self):
+        return [v for _, v in self._items]
+
+    def items(self):
+        return list(self._items)
+
+    @property
+    def headers(self):
+        return ['%s: %s\r\n' % item for item in self._items]
+
+    @property
+    def typeheader(self):
+        return self._first.get('content-type')
+
+    def environ_items(self):
+        """
+        Yield the ``HTTP_`` WSGI environment keys and values of the
+        headers, as :meth:`WSGIHandler._headers` does for a
+        :attr:`WSGIHandler.MessageClass`.
+        """
+        for name, value in self._items:
+            if '_' in name:
+                # strip incoming bad headers
+                continue
+            key = name.replace('-', '_').upper()
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                yield 'HTTP_' + key, value
+
+
+def _read_headers(rfile, max_count, max_size):
+    """
+    Read the headers that follow the request line from *rfile*,
+    consuming the blank line after them, and return them as a
+    :class:`_ParsedHeaders`.
+
+    If *rfile* is buffered, and the entire header block is already
+    in the buffer (as it usually is for small requests), it's taken
+    out and decoded all at once. Otherwise, it's read line by line.
+
+    :raises _InvalidClientRequest: If there are more than *max_count*
+       header lines, they total more than *max_size* bytes, or they
+       can't be parsed.
+    """
+    peek = getattr(rfile, 'peek', None)
+    if peek is not None:
+        buf = peek(max_size)
+        if buf[:2] == b'\r\n':
+            rfile.read(2)
+            return _ParsedHeaders(())
+        end = buf.find(b'\r\n\r\n', 0, max_size)
+        if end != -1:
+            head = buf[:end]
+            # Leave lines ending in a bare LF to the slow path, which
+            # handles them the way the standard library does.
+            if head.count(b'\n') == head.count(b'\r\n'):
+                rfile.read(end + 4)
+                if PY3:
+                    head = head.decode('latin-1')
+                lines = head.split('\r\n')
+                if len(lines) > max_count:
+                    raise _InvalidClientRequest('Too many headers')
+                return _ParsedHeaders(lines)
+        elif len(buf) >= max_size:
+            raise _InvalidClientRequest('Request headers too large')
+
+    lines = []
+    size = 0
+    while True:
+        line = rfile.readline(max_size - size + 1)
+        size += len(line)
+        if size > max_size:
+            raise _InvalidClientRequest('Request headers too large')
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(lines) == max_count:
+            raise _InvalidClientRequest('Too many headers')
+        if PY3:
+            line = line.decode('latin-1')
+        lines.append(line.rstrip('\r\n'))
+    return _ParsedHeaders(lines)
+
+
 class WSGIHandler(object):
     """
     Handles HTTP requests from a socket, creates the WSGI environment, and
@@ -497,7 +661,9 @@ class WSGIHandler(object):
         Parse the incoming request.
 
         Parses various headers into ``self.headers`` using
-        :attr:`MessageClass`. Other attributes that are set upon a successful
+        :attr:`MessageClass` (or, if the server's
+        :attr:`~WSGIServer.fast_header_parser` is set, a simpler and
+        faster built-in parser). Other attributes that are set upon a successful
         return of this method include ``self.content_length`` and ``self.close_connection``.
 
         :param str raw_requestline: A native :class:`str` representing
@@ -513,6 +679,8 @@ class WSGIHandler(object):
         .. versionchanged:: 1.1b6
            Raise the previously documented :exc:`ValueError` in more cases instead of returning a
            false value; this allows subclasses more opportunity to customize behaviour.
+        .. versionchanged:: 1.4
+           Support :attr:`WSGIServer.fast_header_parser`.
         """
         # pylint:disable=too-many-branches
         self.requestline = raw_requestline.rstrip()
@@ -530,7 +698,13 @@ class WSGIHandler(object):
         else:
             raise _InvalidClientRequest('Invalid HTTP method: %r' % (raw_requestline,))
 
-        self.headers = self.MessageClass(self.rfile, 0)
+        server = self.server
+        if getattr(server, 'fast_header_parser', False):
+            self.headers = _read_headers(self.rfile,
+                                         server.max_header_count,
+                                         server.max_header_size)
+        else:
+            self.headers = self.MessageClass(self.rfile, 0)
 
         if self.headers.status:
             raise _InvalidClientRequest('Invalid headers status: %r' % (self.headers.status,))
@@ -683,7 +857,11 @@ class WSGIHandler(object):
 
     def finalize_headers(self):
         if self.provided_date is None:
-            self.response_headers.append((b'Date', format_date_time(time.time())))
+            # The server keeps this up to date while it's running.
+            date = getattr(self.server, '_date', None)
+            if date is None:
+                date = format_date_time(time.time())
+            self.response_headers.append((b'Date', date))
 
         if self.code not in (304, 204):
             # the reply will include message-body; make sure we have either Content-Length or chunked
@@ -709,35 +887,51 @@ class WSGIHandler(object):
             raise
         self.response_length += len(data)
 
-    def _write(self, data,
-               _PY34_EXACTLY=(sys.version_info[:2] == (3, 4)),
-               _bytearray=bytearray):
+    def _sendall_vectored(self, buffers):
+        try:
+            sendall_vectored = getattr(self.socket, 'sendall_vectored', None)
+            if sendall_vectored is not None:
+                sendall_vectored(buffers)
+            else:
+                # A socket-like object that isn't one of ours.
+                self.socket.sendall(b''.join(buffers))
+        except socket.error as ex:
+            self.status = 'socket error: %s' % ex
+            if self.code > 0:
+                self.code = -self.code
+            raise
+        self.response_length += sum(len(data) for data in buffers)
+
+    def _body_buffers(self, data,
+                      _PY34_EXACTLY=(sys.version_info[:2] == (3, 4))):
+        # Return the list of buffers that frame *data* for the
+        # response body. With chunked encoding, the chunk size and
+        # trailer are separate buffers so that the data never has to
+        # be copied; the socket writes them all with a single
+        # vectored call.
+        if not self.response_use_chunked:
+            return [data]
+
+        ## Write the chunked encoding
+        # header
+        if _PY34_EXACTLY:
+            # This is the only version we support that doesn't
+            # allow % to be used with bytes. Interestingly, byte
+            # formatting on Python 3 is faster than str formatting.
+            header_str = ('%x\r\n' % len(data)).encode('ascii')
+        else:
+            header_str = b'%x\r\n' % len(data)
+        # data, trailer
+        return [header_str, data, b'\r\n']
+
+    def _write(self, data):
         if not data:
             # The application/middleware are allowed to yield
             # empty bytestrings.
             return
 
         if self.response_use_chunked:
-            ## Write the chunked encoding
-            # header
-            if _PY34_EXACTLY:
-                # This is the only version we support that doesn't
-                # allow % to be used with bytes. Passing a bytestring
-                # directly in to bytearray() is faster than passing a
-                # (unicode) str with encoding, which naturally is faster still
-                # than encoding first. Interestingly, byte formatting on Python 3
-                # is faster than str formatting.
-                header_str = '%x\r\n' % len(data)
-                towrite = _bytearray(header_str, 'ascii')
-            else:
-                header_str = b'%x\r\n' % len(data)
-                towrite = _bytearray(header_str)
-
-            # data
-            towrite += data
-            # trailer
-            towrite += b'\r\n'
-            self._sendall(towrite)
+            self._sendall_vectored(self._body_buffers(data))
         else:
             self._sendall(data)
 
@@ -771,11 +965,13 @@ class WSGIHandler(object):
             towrite += b"\r\n"
 
         towrite += b'\r\n'
-        self._sendall(towrite)
-        # No need to copy the data into towrite; we may make an extra syscall
-        # but the copy time could be substantial too, and it reduces the chances
-        # of sendall being able to send everything in one go
-        self._write(data)
+        # No need to copy the data into towrite; the socket sends the
+        # headers and the (framed) data together with one vectored
+        # write, which avoids both the copy and the extra syscall.
+        buffers = [towrite]
+        if data:
+            buffers.extend(self._body_buffers(data))
+        self._sendall_vectored(buffers)
 
     def start_response(self, status, headers, exc_info=None):
         """
@@ -787,6 +983,12 @@ class WSGIHandler(object):
             Pro-actively handle checking the encoding of the status line
             and headers during this method. On Python 2, avoid some
             extra encodings.
+         .. versionchanged:: 1.4
+            The checked and encoded status, and each checked and
+            encoded header that isn't expected to vary (such as
+            ``Content-Length`` or ``Set-Cookie``), are remembered by the
+            server, so responses that use them again don't pay for the
+            checks again.
         """
         # pylint:disable=too-many-branches,too-many-statements
         if exc_info:
@@ -809,63 +1011,60 @@ class WSGIHandler(object):
         # Note that this results in copying the header list at this point, not modifying it,
         # although we are allowed to do so if needed. This slightly increases memory usage.
         # We also check for HTTP Response Splitting vulnerabilities
+        # (in _encode_response_header).
+        header_cache = getattr(self.server, '_response_header_cache', None)
+        if header_cache is None:
+            header_cache = {}
         response_headers = []
-        header = None
-        value = None
-        try:
-            for header, value in headers:
-                if not isinstance(header, str):
-                    raise UnicodeError("The header must be a native string", header, value)
-                if not isinstance(value, str):
-                    raise UnicodeError("The value must be a native string", header, value)
-                if '\r' in header or '\n' in header:
-                    raise ValueError('carriage return or newline in header name', header)
-                if '\r' in value or '\n' in value:
-                    raise ValueError('carriage return or newline in header value', value)
-                # Either we're on Python 2, in which case bytes is correct, or
-                # we're on Python 3 and the user screwed up (because it should be a native
-                # string). In either case, make sure that this is latin-1 compatible. Under
-                # Python 2, bytes.encode() will take a round-trip through the system encoding,
-                # which may be ascii, which is not really what we want. However, the latin-1 encoding
-                # can encode everything except control characters and the block from 0x7F to 0x9F, so
-                # explicitly round-tripping bytes through the encoding is unlikely to be of much
-                # benefit, so we go for speed (the WSGI spec specifically calls out allowing the range
-                # from 0x00 to 0xFF, although the HTTP spec forbids the control characters).
-                # Note: Some Python 2 implementations, like Jython, may allow non-octet (above 255) values
-                # in their str implementation; this is mentioned in the WSGI spec, but we don't
-                # run on any platform like that so we can assume that a str value is pure bytes.
-                response_headers.append((header if not PY3 else header.encode("latin-1"),
-                                         value if not PY3 else value.encode("latin-1")))
-        except UnicodeEncodeError:
-            # If we get here, we're guaranteed to have a header and value
-            raise UnicodeError("Non-latin1 header", repr(header), repr(value))
+        provided_connection = None
+        provided_date = None
+        provided_content_length = None
+        for header, value in headers:
+            # Check the types before looking in the cache: on Python 2,
+            # a unicode object can be equal to a str we've cached.
+            if not isinstance(header, str):
+                raise UnicodeError("The header must be a native string", header, value)
+            if not isinstance(value, str):
+                raise UnicodeError("The value must be a native string", header, value)
+            key = (header, value)
+            entry = header_cache.get(key)
+            if entry is None:
+                entry = self._encode_response_header(header, value)
+                if entry[2] not in _UNCACHED_RESPONSE_HEADERS:
+                    if len(header_cache) >= _MAX_RESPONSE_HEADER_CACHE:
+                        header_cache.clear()
+                    header_cache[key] = entry
+            response_headers.append((entry[0], entry[1]))
+            name = entry[2]
+            if name == 'connection':
+                provided_connection = value
+            elif name == 'date':
+                provided_date = value
+            elif name == 'content-length':
+                provided_content_length = value
 
         # Same as above
         if not isinstance(status, str):
             raise UnicodeError("The status string must be a native string")
-        if '\r' in status or '\n' in status:
-            raise ValueError("carriage return or newline in status", status)
-        # don't assign to anything until the validation is complete, including parsing the
-        # code
-        code = int(status.split(' ', 1)[0])
-
-        self.status = status if not PY3 else status.encode("latin-1")
+        status_cache = getattr(self.server, '_response_status_cache', None)
+        encoded = status_cache.get(status) if status_cache is not None else None
+        if encoded is None:
+            if '\r' in status or '\n' in status:
+                raise ValueError("carriage return or newline in status", status)
+            # don't assign to anything until the validation is complete, including parsing the
+            # code
+            code = int(status.split(' ', 1)[0])
+            encoded = (status if not PY3 else status.encode("latin-1"), code)
+            if status_cache is not None:
+                if len(status_cache) >= _MAX_RESPONSE_HEADER_CACHE:
+                    status_cache.clear()
+                status_cache[status] = encoded
+
+        self.status, self.code = encoded
         self._orig_status = status # Preserve the native string for logging
         self.response_headers = response_headers
-        self.code = code
-
-        provided_connection = None
-        self.provided_date = None
-        self.provided_content_length = None
-
-        for header, value in headers:
-            header = header.lower()
-            if header == 'connection':
-                provided_connection = value
-            elif header == 'date':
-                self.provided_date = value
-            elif header == 'content-length':
-                self.provided_content_length = value
+        self.provided_date = provided_date
+        self.provided_content_length = provided_content_length
 
         if self.request_version == 'HTTP/1.0' and provided_connection is None:
             response_headers.append((b'Connection', b'close'))
@@ -882,6 +1081,34 @@ class WSGIHandler(object):
 
         return self.write
 
+    def _encode_response_header(self, header, value): # pylint:disable=no-self-use
+        # Check one (native string) header from start_response, and
+        # return (header, value, lowercase header): the first two
+        # encoded for the response. The result depends only on the
+        # arguments, so the server can remember it.
+        if '\r' in header or '\n' in header:
+            raise ValueError('carriage return or newline in header name', header)
+        if '\r' in value or '\n' in value:
+            raise ValueError('carriage return or newline in header value', value)
+        # Either we're on Python 2, in which case bytes is correct, or
+        # we're on Python 3 and the user screwed up (because it should be a native
+        # string). In either case, make sure that this is latin-1 compatible. Under
+        # Python 2, bytes.encode() will take a round-trip through the system encoding,
+        # which may be ascii, which is not really what we want. However, the latin-1 encoding
+        # can encode everything except control characters and the block from 0x7F to 0x9F, so
+        # explicitly round-tripping bytes through the encoding is unlikely to be of much
+        # benefit, so we go for speed (the WSGI spec specifically calls out allowing the range
+        # from 0x00 to 0xFF, although the HTTP spec forbids the control characters).
+        # Note: Some Python 2 implementations, like Jython, may allow non-octet (above 255) values
+        # in their str implementation; this is mentioned in the WSGI spec, but we don't
+        # run on any platform like that so we can assume that a str value is pure bytes.
+        if not PY3:
+            return header, value, header.lower()
+        try:
+            return header.encode("latin-1"), value.encode("latin-1"), header.lower()
+        except UnicodeEncodeError:
+            raise UnicodeError("Non-latin1 header", repr(header), repr(value))
+
     def log_request(self):
         self.server.log.write(self.format_request() + '\n')
 
@@ -1102,7 +1329,11 @@ class WSGIHandler(object):
             env['REMOTE_ADDR'] = str(client_address[0])
             env['REMOTE_PORT'] = str(client_address[1])
 
-        for key, value in self._headers():
+        if isinstance(self.headers, _ParsedHeaders):
+            header_items = self.headers.environ_items()
+        else:
+            header_items = self._headers()
+        for key, value in header_items:
             if key in env:
                 if 'COOKIE' in key:
                     env[key] += '; ' + value
@@ -1423,6 +1654,37 @@ class WSGIServer(StreamServer):
     #: .. versionadded:: 1.2a1
     environ_class = dict
 
+    #: If true, the handlers read request headers with a simple parser
+    #: built in to this module, which takes the header block straight
+    #: out of the connection's read buffer when it can, instead of with
+    #: :attr:`WSGIHandler.MessageClass`. This is faster, especially for
+    #: small requests, but the handler's ``headers`` are then an object
+    #: that only provides the commonly used parts of the
+    #: :class:`email.message.Message` API. This can be customized in a
+    #: subclass or per-instance.
+    #:
+    #: .. versionadded:: 1.4
+    fast_header_parser = False
+
+    #: With :attr:`fast_header_parser`, the most header lines a request
+    #: may have. Requests with more get a 400 response.
+    #:
+    #: .. versionadded:: 1.4
+    max_header_count = 100
+
+    #: With :attr:`fast_header_parser`, the most bytes of headers
+    #: (not counting the request line) a request may have. Requests
+    #: with more get a 400 response.
+    #:
+    #: .. versionadded:: 1.4
+    max_header_size = 65536
+
+    # The value of the Date response header, kept up to date by
+    # _date_timer while the server is started. Handlers format their
+    # own when this is None.
+    _date = None
+    _date_timer = None
+
     # Undocumented internal detail: the class that WSGIHandler._log_error
     # will cast to before passing to the loop.
     secure_environ_class = WSGISecureEnviron
@@ -1460,6 +1722,11 @@ class WSGIServer(StreamServer):
 
         self.set_environ(environ)
         self.set_max_accept()
+        # Filled in by WSGIHandler.start_response:
+        # {status: (encoded status, code)}
+        self._response_status_cache = {}
+        # {(header, value): (encoded header, encoded value, lowercase header)}
+        self._response_header_cache = {}
 
     def set_environ(self, environ=None):
         if environ is not None:
@@ -1487,6 +1754,35 @@ class WSGIServer(StreamServer):
         StreamServer.init_socket(self)
         self.update_environ()
 
+    def start(self):
+        StreamServer.start(self)
+        self._start_date_timer()
+
+    def close(self):
+        self._stop_date_timer()
+        StreamServer.close(self)
+
+    def _start_date_timer(self):
+        if self._date_timer is not None:
+            return
+        now = time.time()
+        self._date = format_date_time(now)
+        # Fire just after each second begins. It shouldn't keep the
+        # loop running by itself.
+        self._date_timer = self.loop.timer(1.001 - now % 1.0, 1.0, ref=False)
+        self._date_timer.start(self._update_date, update=True)
+
+    def _stop_date_timer(self):
+        timer = self._date_timer
+        if timer is not None:
+            self._date_timer = None
+            timer.stop()
+            timer.close()
+        self._date = None
+
+    def _update_date(self):
+        self._date = format_date_time(time.time())
+
     def update_environ(self):
         """
         Called before the first request is handled to fill in WSGI environment values.
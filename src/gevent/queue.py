@@ -290,6 +290,41 @@ class Queue(object):
         """
         self.put(item, False)
 
+    def put_many(self, items, block=True, timeout=None):
+        """Put all the *items* into the queue, in order.
+
+        As many items as there are free slots for are added at once,
+        and greenlets waiting in :meth:`get` are woken by a single
+        callback. If the queue fills up, this waits for more free
+        slots as :meth:`put` does; *block* and *timeout* are as for
+        :meth:`put`, but *timeout* applies to the whole call. If
+        :class:`Full` is raised, the items before the one that
+        didn't fit have been put.
+
+        .. versionadded:: 1.4
+        """
+        items = list(items)
+        count = len(items)
+        index = 0
+        timer = None
+        try:
+            while 1:
+                while index < count and (self._maxsize == -1 or self.qsize() < self._maxsize):
+                    self._put(items[index])
+                    index += 1
+                if self.getters:
+                    self._schedule_unlock()
+                if index == count:
+                    return
+                if block and timer is None:
+                    timer = Timeout._start_new_or_dummy(timeout, Full)
+                # Wait until there's room, and then fill it.
+                self.put(items[index], block)
+                index += 1
+        finally:
+            if timer is not None:
+                timer.cancel()
+
     def __get_or_peek(self, method, block, timeout):
         # Internal helper method. The `method` should be either
         # self._get when called from self.get() or self._peek when
@@ -351,6 +386,28 @@ class Queue(object):
         """
         return self.get(False)
 
+    def get_many(self, max_items, block=True, timeout=None):
+        """Remove and return a list of up to *max_items* items from the queue.
+
+        If the queue is empty, this first waits for an item as
+        :meth:`get` does (with the same *block* and *timeout*), and
+        then takes whatever else is immediately available. Greenlets
+        waiting in :meth:`put` are woken by a single callback.
+
+        .. versionadded:: 1.4
+        """
+        if max_items < 1:
+            raise ValueError('max_items must be positive: %r' % (max_items, ))
+        if self.qsize():
+            result = []
+        else:
+            result = [self.get(block, timeout)]
+        while len(result) < max_items and self.qsize():
+            result.append(self._get())
+        if self.putters:
+            self._schedule_unlock()
+        return result
+
     def peek(self, block=True, timeout=None):
         """Return an item from the queue without removing it.
 
@@ -557,6 +614,23 @@ class JoinableQueue(Queue):
         return self._cond.wait(timeout=timeout)
 
 
+class _ChannelBatch(object):
+    # Stands in for the waiter of each item given to
+    # Channel.put_many, switching to the real one when the last has
+    # been taken.
+
+    __slots__ = ('waiter', 'remaining')
+
+    def __init__(self, waiter, count):
+        self.waiter = waiter
+        self.remaining = count
+
+    def switch(self, _):
+        self.remaining -= 1
+        if not self.remaining:
+            self.waiter.switch(self.waiter)
+
+
 class Channel(object):
 
     __slots__ = (
@@ -633,6 +707,44 @@ class Channel(object):
     def put_nowait(self, item):
         self.put(item, False)
 
+    def put_many(self, items, block=True, timeout=None):
+        """
+        Put all the *items*, in order, waiting until they have all been
+        taken by getters. This greenlet is woken once, when the last
+        one is taken. If :class:`Full` is raised, the items that
+        weren't taken are withdrawn.
+
+        .. versionadded:: 1.4
+        """
+        items = list(items)
+        if not items:
+            return
+        if self.hub is getcurrent():
+            for item in items:
+                self.put(item)
+            return
+
+        if not block:
+            timeout = 0
+
+        waiter = Waiter() # pylint:disable=undefined-variable
+        batch = _ChannelBatch(waiter, len(items))
+        entries = [(item, batch) for item in items]
+        self.putters.extend(entries)
+        timeout = Timeout._start_new_or_dummy(timeout, Full)
+        try:
+            if self.getters:
+                self._schedule_unlock()
+            result = waiter.get()
+            if result is not waiter:
+                raise InvalidSwitchError("Invalid switch into Channel.put_many: %r" % (result, ))
+        except:
+            for entry in entries:
+                _safe_remove(self.putters, entry)
+            raise
+        finally:
+            timeout.cancel()
+
     def get(self, block=True, timeout=None):
         if self.hub is getcurrent():
             if self.putters:
@@ -659,6 +771,23 @@ class Channel(object):
     def get_nowait(self):
         return self.get(False)
 
+    def get_many(self, max_items, block=True, timeout=None):
+        """
+        Return a list of up to *max_items* items: the first waited
+        for as :meth:`get` does, and then those of any other waiting
+        putters.
+
+        .. versionadded:: 1.4
+        """
+        if max_items < 1:
+            raise ValueError('max_items must be positive: %r' % (max_items, ))
+        result = [self.get(block, timeout)]
+        while len(result) < max_items and self.putters:
+            item, putter = self.putters.popleft()
+            result.append(item)
+            self.hub.loop.run_callback(putter.switch, putter)
+        return result
+
     def _unlock(self):
         while self.putters and self.getters:
             getter = self.getters.popleft()
@@ -7,6 +7,7 @@ from _socket import getaddrinfo
 
 from gevent._compat import string_types
 from gevent._compat import integer_types
+from gevent.event import AsyncResult
 
 from gevent.socket import SOCK_STREAM
 from gevent.socket import SOCK_DGRAM
@@ -77,6 +78,82 @@ def _resolve_special(hostname, family):
     return hostname
 
 
+def _copy_exception(ex):
+    # A new instance of *ex*, for raising somewhere else without
+    # sharing (and growing) its traceback. Exceptions whose
+    # constructor doesn't accept their args are raised as-is.
+    try:
+        return type(ex)(*ex.args)
+    except Exception: # pylint:disable=broad-except
+        return ex
+
+
+class _Abandoned(Exception):
+    """
+    Raised to the waiters of a single-flight call whose caller was
+    killed or timed out.
+    """
+
+
+class _SingleFlight(object):
+    """
+    Coalesces concurrent identical calls.
+
+    While one greenlet is making a call for a key, other greenlets
+    that make a call for the same key wait for it and get the same
+    result (or a copy of the same exception), instead of making the
+    call again. This keeps a burst of lookups of the same name from
+    tying up the threadpool or flooding the nameservers.
+
+    If the greenlet making the call is interrupted by something that
+    isn't an :exc:`Exception`, such as a :class:`gevent.Timeout`
+    meant for it alone, one of the waiters makes the call instead.
+
+    .. versionadded:: 1.4
+    """
+
+    def __init__(self):
+        # {key: AsyncResult}
+        self._calls = {}
+        self.coalesced = 0
+
+    def __call__(self, key, func, *args, **kwargs):
+        try:
+            result = self._calls.get(key)
+        except TypeError:
+            # Unhashable arguments; the function will probably reject
+            # them anyway.
+            return func(*args, **kwargs)
+
+        if result is not None:
+            self.coalesced += 1
+        while result is not None:
+            result.wait()
+            if result.successful():
+                return result.value
+            if not isinstance(result.exception, _Abandoned):
+                # Each waiter raises its own exception; raising the
+                # shared one everywhere would chain all of their
+                # tracebacks onto it.
+                raise _copy_exception(result.exception)
+            result = self._calls.get(key)
+
+        result = self._calls[key] = AsyncResult()
+        try:
+            value = func(*args, **kwargs)
+        except Exception as ex:
+            result.set_exception(ex)
+            raise
+        except: # pylint:disable=bare-except
+            result.set_exception(_Abandoned())
+            raise
+        else:
+            result.set(value)
+            return value
+        finally:
+            del self._calls[key]
+
+
 class AbstractResolver(object):
 
     def gethostbyname(self, hostname, family=AF_INET):
@@ -0,0 +1,223 @@
+# Copyright (c) 2018  gevent contributors. See LICENSE for details.
+"""
+A resolver that caches the results of another resolver.
+
+.. versionadded:: 1.4
+"""
+from __future__ import absolute_import, print_function, division
+
+from collections import OrderedDict
+
+from _socket import gaierror
+from _socket import herror
+
+from gevent._compat import perf_counter
+from gevent._config import config
+from gevent.hub import get_hub
+from gevent.hub import spawn_raw
+from gevent.resolver import _SingleFlight
+from gevent.resolver import _copy_exception
+
+__all__ = [
+    'Resolver',
+]
+
+_NONE = object()
+
+
+class Resolver(object):
+    """
+    A resolver that wraps another resolver, remembering the results
+    of ``getaddrinfo``, ``gethostbyname`` and ``gethostbyname_ex``.
+    ``gethostbyaddr`` and ``getnameinfo`` are passed through.
+
+    Set the :attr:`~gevent._config.Config.resolver_cache` setting to
+    wrap whichever :attr:`~gevent._config.Config.resolver` is in use
+    in one of these; the other arguments default to the
+    ``resolver_cache_`` settings.
+
+    If the wrapped resolver has a ``getaddrinfo_ttl`` method, which
+    takes the same arguments as ``getaddrinfo`` and returns a tuple
+    of its result and the TTL of the records in seconds (or None if
+    that's not known), results are kept for that TTL, bounded by
+    *min_ttl* and *max_ttl*. Otherwise they are kept for *max_ttl*.
+    Only :class:`gevent.resolver.dnspython.Resolver` provides this.
+
+    Failed lookups that raise :exc:`socket.gaierror` or
+    :exc:`socket.herror` are raised again for *negative_ttl*
+    seconds, unless that is None.
+
+    If *stale_ttl* is not None, for that many seconds after a result
+    expires it is still returned while it is looked up again in a
+    background greenlet.
+
+    The :meth:`stats` method reports how well the cache is working.
+    """
+
+    def __init__(self, resolver=None, hub=None,
+                 maxsize=None, min_ttl=None, max_ttl=None,
+                 negative_ttl=_NONE, stale_ttl=_NONE):
+        if hub is None:
+            hub = get_hub()
+        if resolver is None:
+            resolver = config.resolver(hub=hub) # pylint:disable=not-callable
+        self.resolver = resolver
+        self.maxsize = maxsize if maxsize is not None else config.resolver_cache_size
+        self.min_ttl = min_ttl if min_ttl is not None else config.resolver_cache_min_ttl
+        self.max_ttl = max_ttl if max_ttl is not None else config.resolver_cache_max_ttl
+        self.negative_ttl = (negative_ttl if negative_ttl is not _NONE
+                             else config.resolver_cache_negative_ttl)
+        self.stale_ttl = stale_ttl if stale_ttl is not _NONE else config.resolver_cache_stale_ttl
+
+        # {key: (expiration, value, is_error)}, least recently used first.
+        self._cache = OrderedDict()
+        # The keys being looked up again in the background.
+        self._refreshing = set()
+        # Concurrent misses for the same key share one lookup.
+        self._single_flight = _SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return '<gevent.resolver.cache.Resolver at 0x%x entries=%d resolver=%r>' % (
+            id(self), len(self._cache), self.resolver)
+
+    def close(self):
+        self._cache.clear()
+        self.resolver.close()
+
+    def clear(self):
+        """
+        Forget all cached results.
+        """
+        self._cache.clear()
+
+    def stats(self):
+        """
+        Return a new dictionary of counters: ``hits`` (including the
+        ``stale_hits`` and ``negative_hits``), ``misses`` (including
+        the ``coalesced`` misses that waited for a lookup already in
+        progress), ``evictions`` of entries to stay within *maxsize*,
+        and the current number of ``entries``.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self._single_flight.coalesced,
+            'stale_hits': self.stale_hits,
+            'negative_hits': self.negative_hits,
+            'evictions': self.evictions,
+            'entries': len(self._cache),
+        }
+
+    def _ttl_getaddrinfo(self, *args):
+        getaddrinfo_ttl = getattr(self.resolver, 'getaddrinfo_ttl', None)
+        if getaddrinfo_ttl is not None:
+            return getaddrinfo_ttl(*args)
+        return self.resolver.getaddrinfo(*args), None
+
+    def _ttl_gethostbyname(self, *args):
+        return self.resolver.gethostbyname(*args), None
+
+    def _ttl_gethostbyname_ex(self, *args):
+        return self.resolver.gethostbyname_ex(*args), None
+
+    def _store(self, key, value, ttl, is_error):
+        if ttl is None:
+            ttl = self.max_ttl
+        elif not is_error:
+            ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        cache = self._cache
+        cache.pop(key, None)
+        cache[key] = (perf_counter() + ttl, value, is_error)
+        while len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, func, args):
+        # Returns (value, ttl, is_error); raises anything that
+        # shouldn't be cached.
+        try:
+            value, ttl = func(*args)
+        except (gaierror, herror) as ex:
+            if self.negative_ttl is None:
+                raise
+            return ex, self.negative_ttl, True
+        return value, ttl, False
+
+    def _fetch(self, key, func, args):
+        value, ttl, is_error = self._lookup(func, args)
+        self._store(key, value, ttl, is_error)
+        return value, is_error
+
+    def _refresh(self, key, func, args):
+        try:
+            self._single_flight(key, self._fetch, key, func, args)
+        except Exception: # pylint:disable=broad-except
+            # Keep the stale result until it runs out.
+            pass
+        finally:
+            self._refreshing.discard(key)
+
+    def _cached(self, func, *args):
+        key = (func.__name__,) + args
+        try:
+            hash(key)
+        except TypeError:
+            # e.g., a bytearray hostname. Let the resolver deal with it.
+            return func(*args)[0]
+        cache = self._cache
+        entry = cache.pop(key, None)
+        if entry is not None:
+            expiration, value, is_error = entry
+            now = perf_counter()
+            if now < expiration:
+                cache[key] = entry
+                self.hits += 1
+            elif (not is_error
+                  and self.stale_ttl is not None
+                  and now < expiration + self.stale_ttl):
+                cache[key] = entry
+                self.hits += 1
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    spawn_raw(self._refresh, key, func, args)
+            else:
+                entry = None
+
+        if entry is None:
+            self.misses += 1
+            value, is_error = self._single_flight(key, self._fetch, key, func, args)
+        elif is_error:
+            self.negative_hits += 1
+
+        if is_error:
+            # A new exception each time, so tracebacks don't pile up
+            # on the cached one.
+            raise _copy_exception(value)
+        return value
+
+    def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):
+        # The result is a list, so callers could mutate it.
+        return list(self._cached(self._ttl_getaddrinfo,
+                                 host, port, family, socktype, proto, flags))
+
+    # Not all resolvers accept the family argument of these two, so
+    # only pass what we're given.
+
+    def gethostbyname(self, *args):
+        return self._cached(self._ttl_gethostbyname, *args)
+
+    def gethostbyname_ex(self, *args):
+        return self._cached(self._ttl_gethostbyname_ex, *args)
+
+    def gethostbyaddr(self, *args, **kwargs):
+        return self.resolver.gethostbyaddr(*args, **kwargs)
+
+    def getnameinfo(self, *args, **kwargs):
+        return self.resolver.getnameinfo(*args, **kwargs)
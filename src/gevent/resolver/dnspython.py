@@ -125,8 +125,11 @@ _exc_clear = getattr(sys, 'exc_clear', lambda: None)
 # A secondary change is that calls to sys.exc_clear() have been inserted to avoid
 # failing tests in test__refcount.py (timeouts).
 # See https://github.com/rthalley/dnspython/pull/300
+#
+# gevent: if *_expirations* is a list, the expiration time of each answer
+# that had records is appended to it.
 def _getaddrinfo(host=None, service=None, family=AF_UNSPEC, socktype=0,
-                 proto=0, flags=0):
+                 proto=0, flags=0, _expirations=None):
     # pylint:disable=too-many-locals,broad-except,too-many-statements
     # pylint:disable=too-many-branches
     # pylint:disable=redefined-argument-from-local
@@ -178,6 +181,8 @@ def _getaddrinfo(host=None, service=None, family=AF_UNSPEC, socktype=0,
                         if v6.rrset is not None:
                             for rdata in v6.rrset:
                                 v6addrs.append(rdata.address)
+                            if _expirations is not None:
+                                _expirations.append(v6.expiration)
                     if family == socket.AF_INET or family == socket.AF_UNSPEC:
                         v4 = resolver._resolver.query(host, dns.rdatatype.A,
                                                       raise_on_no_answer=False)
@@ -186,6 +191,8 @@ def _getaddrinfo(host=None, service=None, family=AF_UNSPEC, socktype=0,
                         if v4.rrset is not None:
                             for rdata in v4.rrset:
                                 v4addrs.append(rdata.address)
+                            if _expirations is not None:
+                                _expirations.append(v4.expiration)
                 except dns.resolver.NXDOMAIN:
                     _exc_clear()
                     raise socket.gaierror(socket.EAI_NONAME)
@@ -602,6 +609,26 @@ class Resolver(AbstractResolver):
         return aliases
 
     def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):
+        return self._do_getaddrinfo(host, port, family, socktype, proto, flags, None)
+
+    def getaddrinfo_ttl(self, host, port, family=0, socktype=0, proto=0, flags=0):
+        """
+        Like :meth:`getaddrinfo`, but return a tuple of the result and
+        the smallest remaining TTL, in seconds, of the DNS records it
+        came from, or None if it didn't come from DNS records.
+
+        This is used by :class:`gevent.resolver.cache.Resolver`.
+
+        .. versionadded:: 1.4
+        """
+        expirations = []
+        result = self._do_getaddrinfo(host, port, family, socktype, proto, flags, expirations)
+        ttl = None
+        if expirations:
+            ttl = max(0, min(expirations) - time.time())
+        return result, ttl
+
+    def _do_getaddrinfo(self, host, port, family, socktype, proto, flags, expirations):
         if ((host in (u'localhost', b'localhost')
              or (_is_ipv6_addr(host) and host.startswith('fe80')))
                 or not isinstance(host, str) or (flags & AI_NUMERICHOST)):
@@ -625,14 +652,14 @@ class Resolver(AbstractResolver):
 
             # See also https://github.com/gevent/gevent/issues/1012
             try:
-                return _getaddrinfo(host, port, family, socktype, proto, flags)
+                return _getaddrinfo(host, port, family, socktype, proto, flags, expirations)
             except socket.gaierror:
                 try:
-                    return _getaddrinfo(host, port, AF_INET6, socktype, proto, flags)
+                    return _getaddrinfo(host, port, AF_INET6, socktype, proto, flags, expirations)
                 except socket.gaierror:
-                    return _getaddrinfo(host, port, AF_INET, socktype, proto, flags)
+                    return _getaddrinfo(host, port, AF_INET, socktype, proto, flags, expirations)
         else:
-            return _getaddrinfo(host, port, family, socktype, proto, flags)
+            return _getaddrinfo(host, port, family, socktype, proto, flags, expirations)
 
     def getnameinfo(self, sockaddr, flags):
         if (sockaddr
@@ -5,6 +5,7 @@ Native thread-based hostname resolver.
 import _socket
 
 from gevent.hub import get_hub
+from gevent.resolver import _SingleFlight
 
 
 __all__ = ['Resolver']
@@ -36,11 +37,16 @@ class Resolver(object):
         particularly in long-lived programs that make many, many DNS
         requests. If you suspect that may be happening to you, try the
         dnspython or ares resolver (and submit a bug report).
+
+    .. versionchanged:: 1.4
+       Identical lookups made while one is already in progress wait
+       for its result instead of using another thread.
     """
     def __init__(self, hub=None):
         if hub is None:
             hub = get_hub()
         self.pool = hub.threadpool
+        self._single_flight = _SingleFlight()
         if _socket.gaierror not in hub.NOT_ERROR:
             # Do not cause lookup failures to get printed by the default
             # error handler. This can be very noisy.
@@ -55,17 +61,25 @@ class Resolver(object):
     # from briefly reading socketmodule.c, it seems that all of the functions
     # below are thread-safe in Python, even if they are not thread-safe in C.
 
+    def _apply(self, func, args, kwargs=None):
+        if kwargs:
+            key = (func, args, tuple(sorted(kwargs.items())))
+        else:
+            key = (func, args)
+        return self._single_flight(key, self.pool.apply, func, args, kwargs)
+
     def gethostbyname(self, *args):
-        return self.pool.apply(_socket.gethostbyname, args)
+        return self._apply(_socket.gethostbyname, args)
 
     def gethostbyname_ex(self, *args):
-        return self.pool.apply(_socket.gethostbyname_ex, args)
+        return self._apply(_socket.gethostbyname_ex, args)
 
     def getaddrinfo(self, *args, **kwargs):
-        return self.pool.apply(_socket.getaddrinfo, args, kwargs)
+        # The result is a list, which callers sharing it could modify.
+        return list(self._apply(_socket.getaddrinfo, args, kwargs))
 
     def gethostbyaddr(self, *args, **kwargs):
-        return self.pool.apply(_socket.gethostbyaddr, args, kwargs)
+        return self._apply(_socket.gethostbyaddr, args, kwargs)
 
     def getnameinfo(self, *args, **kwargs):
-        return self.pool.apply(_socket.getnameinfo, args, kwargs)
+        return self._apply(_socket.getnameinfo, args, kwargs)
@@ -4,7 +4,10 @@ Waiting for I/O completion.
 """
 from __future__ import absolute_import, division, print_function
 
+import os
 import sys
+from functools import partial
+from weakref import ref as wref
 
 from gevent.event import Event
 from gevent.hub import _get_hub_noargs as get_hub
@@ -15,6 +18,8 @@ from gevent._util import copy_globals
 from gevent._util import _NONE
 
 from errno import EINTR
+from errno import EEXIST
+from errno import ENOENT
 from select import select as _real_original_select
 if sys.platform.startswith('win32'):
     def _original_select(r, w, x, t):
@@ -35,6 +40,13 @@ except ImportError:
     original_poll = None
     __implements__ = ['select']
 
+try:
+    from select import epoll as original_epoll
+    from select import EPOLLIN, EPOLLOUT, EPOLLPRI, EPOLLERR, EPOLLHUP, EPOLLONESHOT
+    __implements__.append('epoll')
+except ImportError:
+    original_epoll = None
+
 __all__ = ['error'] + __implements__
 
 import select as __select__
@@ -283,4 +295,275 @@ if original_poll is not None:
             fileno = get_fileno(fd)
             del self.fds[fileno]
 
+
+def _close_watchers(watchers, keepalive, _dead_ref=None):
+    for watcher in watchers.values():
+        watcher.stop()
+        watcher.close()
+    watchers.clear()
+    keepalive.stop()
+    keepalive.close()
+
+
+def _noop():
+    pass
+
+
+def _io_callback(events, watchers_ref, fd):
+    watchers = watchers_ref()
+    if watchers is not None:
+        watchers._fired(events, fd)
+
+
+class _PersistentWatchers(object):
+    """
+    One io watcher for each registered file descriptor, kept from
+    one call to :meth:`wait` to the next.
+
+    Creating a watcher for each descriptor on every call, like
+    :func:`select` and :class:`poll` do, costs O(fds) each time.
+    Here, a watcher that fires is stopped, so that a descriptor that
+    stays ready doesn't keep waking the loop, and only those are
+    restarted by the next :meth:`wait`; the cost of a call is
+    proportional to the number of descriptors that were ready.
+
+    Like the watchers themselves, this is level-triggered: the result
+    of :meth:`wait` only includes descriptors that the loop found to
+    be ready during that call.
+
+    The watchers don't keep the loop running by themselves, so an
+    idle object doesn't stop :func:`gevent.wait` from returning.
+    Instead, while a greenlet is in :meth:`wait`, a single watcher
+    that never fires is referenced; changing the reference of every
+    io watcher on each call would cost O(fds) again.
+    """
+
+    def __init__(self):
+        loop = get_hub().loop
+        self._io = loop.io
+        self._priority = loop.MAXPRI
+        # {fd: watcher}
+        self._watchers = {}
+        # The fds whose watchers fired, and were stopped, since the
+        # last call to wait().
+        self._stopped = []
+        # The fds that won't be restarted until they're set() again.
+        self._disarmed = set()
+        # {fd: events} for the current call to wait().
+        self._ready = {}
+        self._event = Event()
+        # The number of greenlets in wait().
+        self._waiting = 0
+        self._keepalive = loop.async_(ref=False)
+        self._keepalive.start(_noop)
+        # Active watchers are referenced by the loop. They only hold
+        # this weak reference to us, so that if we're dropped without
+        # being closed, which is common for poll objects, we can stop
+        # them all.
+        self._ref = wref(self, partial(_close_watchers, self._watchers,
+                                       self._keepalive))
+
+    def __len__(self):
+        return len(self._watchers)
+
+    def set(self, fd, flags):
+        """
+        Watch *fd* for the libev-style *flags*, replacing any
+        existing watcher. If *flags* is 0, just stop watching it.
+        """
+        self.discard(fd)
+        if not flags:
+            return
+        watcher = self._io(fd, flags, ref=False)
+        watcher.priority = self._priority
+        self._watchers[fd] = watcher
+        watcher.start(_io_callback, self._ref, fd, pass_events=True)
+
+    def discard(self, fd):
+        watcher = self._watchers.pop(fd, None)
+        if watcher is not None:
+            watcher.stop()
+            watcher.close()
+        self._disarmed.discard(fd)
+        self._ready.pop(fd, None)
+
+    def disarm(self, fd):
+        """
+        Don't restart the watcher for *fd*, which must have just been
+        reported ready, until it is :meth:`set` again.
+        """
+        self._disarmed.add(fd)
+
+    def close(self):
+        _close_watchers(self._watchers, self._keepalive)
+        self._disarmed.clear()
+        del self._stopped[:]
+
+    def _fired(self, events, fd):
+        watcher = self._watchers.get(fd)
+        if watcher is None:
+            return
+        watcher.stop()
+        self._stopped.append(fd)
+        if events < 0:
+            self._ready[fd] = events
+        else:
+            self._ready[fd] = self._ready.get(fd, 0) | events
+        self._event.set()
+
+    def wait(self, timeout=None):
+        """
+        Wait up to *timeout* seconds (forever, if None) for any
+        watched fd to be ready, and return a dict mapping the ready
+        fds to their libev-style events, which are negative if the fd
+        is invalid.
+
+        This always runs an iteration of the event loop, even if
+        *timeout* is 0.
+        """
+        stopped = self._stopped
+        if stopped:
+            watchers = self._watchers
+            disarmed = self._disarmed
+            for fd in stopped:
+                watcher = watchers.get(fd)
+                if watcher is not None and fd not in disarmed and not watcher.active:
+                    watcher.start(_io_callback, self._ref, fd, pass_events=True)
+            del stopped[:]
+        # Anything reported since the last call may not be true anymore;
+        # the watchers we just restarted will report it again if so.
+        self._ready = {}
+        self._event.clear()
+        self._waiting += 1
+        self._keepalive.ref = True
+        try:
+            self._event.wait(timeout)
+        finally:
+            self._waiting -= 1
+            if not self._waiting:
+                self._keepalive.ref = False
+        ready = self._ready
+        self._ready = {}
+        return ready
+
+
+if original_epoll is not None:
+
+    class epoll(object):
+        """
+        epoll(sizehint=-1, flags=0)
+
+        An implementation of :class:`select.epoll` that blocks only the current greenlet.
+
+        Unlike :class:`poll`, registered file descriptors keep their
+        loop watchers between calls to :meth:`poll`, so the cost of a
+        call depends on how many are ready, not how many are
+        registered.
+
+        .. caution:: ``EPOLLPRI`` data is not supported. ``EPOLLET`` is
+           accepted, but descriptors are still reported as long as they
+           are ready, which correct edge-triggered code tolerates.
+           There is no underlying epoll file descriptor, so there is
+           no ``fileno()``.
+
+        .. versionadded:: 1.4
+        """
+
+        def __init__(self, sizehint=-1, flags=0): # pylint:disable=unused-argument
+            # {fd -> eventmask}
+            self._fds = {}
+            self._watchers = _PersistentWatchers()
+
+        @property
+        def closed(self):
+            return self._watchers is None
+
+        def _check(self):
+            if self._watchers is None:
+                raise ValueError("I/O operation on closed epoll object")
+            return self._watchers
+
+        def close(self):
+            if self._watchers is not None:
+                self._watchers.close()
+                self._watchers = None
+                self._fds.clear()
+
+        def __enter__(self):
+            self._check()
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+        def _set(self, fileno, eventmask):
+            flags = 0
+            if eventmask & EPOLLIN:
+                flags = _EV_READ
+            if eventmask & EPOLLOUT:
+                flags |= _EV_WRITE
+            self._fds[fileno] = eventmask
+            self._watchers.set(fileno, flags)
+
+        def register(self, fd, eventmask=EPOLLIN | EPOLLPRI | EPOLLOUT):
+            self._check()
+            fileno = get_fileno(fd)
+            if fileno in self._fds:
+                raise IOError(EEXIST, os.strerror(EEXIST))
+            self._set(fileno, eventmask)
+
+        def modify(self, fd, eventmask):
+            self._check()
+            fileno = get_fileno(fd)
+            if fileno not in self._fds:
+                raise IOError(ENOENT, os.strerror(ENOENT))
+            self._set(fileno, eventmask)
+
+        def unregister(self, fd):
+            watchers = self._check()
+            fileno = get_fileno(fd)
+            if fileno not in self._fds:
+                raise IOError(ENOENT, os.strerror(ENOENT))
+            del self._fds[fileno]
+            watchers.discard(fileno)
+
+        def poll(self, timeout=None, maxevents=-1):
+            """
+            Wait for events, up to *timeout* seconds. If *timeout* is
+            None or negative, wait forever. Return a list of ``(fd,
+            eventmask)`` pairs for up to *maxevents* ready file
+            descriptors.
+            """
+            watchers = self._check()
+            if timeout is not None and timeout < 0:
+                timeout = None
+            ready = watchers.wait(timeout)
+
+            result = []
+            fds = self._fds
+            for fileno, events in iteritems(ready):
+                eventmask = fds.get(fileno)
+                if eventmask is None:
+                    continue
+                if events < 0:
+                    result_flags = EPOLLERR | EPOLLHUP
+                else:
+                    result_flags = 0
+                    if events & _EV_READ:
+                        result_flags = EPOLLIN
+                    if events & _EV_WRITE:
+                        result_flags |= EPOLLOUT
+                    result_flags &= eventmask
+                result.append((fileno, result_flags))
+            if maxevents > 0:
+                # The rest will be reported again by the next call
+                # if they're still ready.
+                del result[maxevents:]
+            for fileno, _ in result:
+                if fds[fileno] & EPOLLONESHOT:
+                    watchers.disarm(fileno)
+            return result
+
+
 del original_poll
+del original_epoll
@@ -0,0 +1,75 @@
+# Copyright (c) 2018 gevent. See LICENSE for details.
+"""
+A cooperative implementation of the :mod:`selectors` API.
+
+This is available on Python 3, and on Python 2 if the ``selectors2``
+or ``selectors34`` backport is installed.
+
+.. versionadded:: 1.4
+"""
+from __future__ import absolute_import, division, print_function
+
+try:
+    import selectors as __selectors__
+except ImportError: # Python 2
+    try:
+        import selectors2 as __selectors__
+    except ImportError:
+        import selectors34 as __selectors__
+
+from gevent._compat import iteritems
+from gevent.select import _PersistentWatchers
+
+__all__ = [
+    'GeventSelector',
+]
+
+
+class GeventSelector(__selectors__._BaseSelectorImpl):
+    """
+    A selector that blocks only the current greenlet.
+
+    Registered file objects keep their loop watchers until they are
+    unregistered, so the cost of :meth:`select` depends on how many
+    are ready, not how many are registered. When :mod:`select` is
+    monkey-patched, this is :class:`selectors.DefaultSelector`.
+    """
+
+    # The selectors event masks happen to be the same as the loop's
+    # flags, so no translation is needed. modify() is implemented in
+    # terms of unregister() and register() when the events change.
+
+    def __init__(self):
+        super(GeventSelector, self).__init__()
+        self._watchers = _PersistentWatchers()
+
+    def register(self, fileobj, events, data=None):
+        key = super(GeventSelector, self).register(fileobj, events, data)
+        self._watchers.set(key.fd, events)
+        return key
+
+    def unregister(self, fileobj):
+        key = super(GeventSelector, self).unregister(fileobj)
+        self._watchers.discard(key.fd)
+        return key
+
+    def select(self, timeout=None):
+        if timeout is not None and timeout < 0:
+            timeout = 0
+        ready = self._watchers.wait(timeout)
+
+        result = []
+        fd_to_key = self._fd_to_key
+        for fd, events in iteritems(ready):
+            key = fd_to_key.get(fd)
+            if key is None:
+                continue
+            if events < 0:
+                # An invalid fd; let whoever is waiting find out why.
+                events = key.events
+            result.append((key, events & key.events))
+        return result
+
+    def close(self):
+        self._watchers.close()
+        super(GeventSelector, self).close()
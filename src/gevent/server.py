@@ -3,6 +3,8 @@
 
 from contextlib import closing
 
+import errno
+import os
 import sys
 
 from _socket import error as SocketError
@@ -10,11 +12,22 @@ from _socket import SOL_SOCKET
 from _socket import SO_REUSEADDR
 from _socket import AF_INET
 from _socket import SOCK_DGRAM
-
+try:
+    from _socket import AF_INET6
+except ImportError:
+    AF_INET6 = None
+try:
+    from _socket import SO_REUSEPORT
+except ImportError:
+    SO_REUSEPORT = None
+
+from gevent import _mmsg
 from gevent.baseserver import BaseServer
+from gevent.baseserver import _handle_and_close_when_done
 from gevent.socket import EWOULDBLOCK
 from gevent.socket import socket as GeventSocket
 from gevent._compat import PYPY, PY3
+from gevent._compat import xrange
 
 __all__ = ['StreamServer', 'DatagramServer']
 
@@ -156,6 +169,26 @@ class StreamServer(BaseServer):
             backlog = cls.backlog
         return _tcp_listener(address, backlog=backlog, reuse_addr=cls.reuse_addr, family=family)
 
+    def _reserve_reuse_port(self):
+        if SO_REUSEPORT is None:
+            return False
+        try:
+            sock = _tcp_listener(self.address, backlog=None, reuse_addr=self.reuse_addr,
+                                 family=self.family, reuse_port=True)
+        except SocketError as ex:
+            # Defined, but not supported by the running kernel.
+            if ex.args[0] in (errno.ENOPROTOOPT, errno.EINVAL):
+                return False
+            raise
+        # pylint:disable=attribute-defined-outside-init
+        self.socket = sock
+        self.address = sock.getsockname()
+        return True
+
+    def _get_reuse_port_listener(self):
+        return _tcp_listener(self.address, backlog=self.backlog, reuse_addr=self.reuse_addr,
+                             family=self.family, reuse_port=True)
+
     if PY3:
 
         def do_read(self):
@@ -171,6 +204,32 @@ class StreamServer(BaseServer):
             # XXX Python issue #7995?
             return sock, address
 
+        def _do_read_raw(self):
+            # Just the file descriptor; the socket object is created
+            # in _do_handle_raw. (CPython already uses accept4() with
+            # SOCK_CLOEXEC where it's available.)
+            sock = self.socket
+            try:
+                return sock._accept()
+            except BlockingIOError: # python 2: pylint: disable=undefined-variable
+                if not sock.timeout:
+                    return
+                raise
+
+        def _do_handle_raw(self, fd, address):
+            # pylint:disable=arguments-differ
+            spawn = self._spawn
+            args = (self._handle, self.do_close, self.socket, fd, address)
+            if spawn is None:
+                # This owns the fd as soon as it's called.
+                _wrap_handle_and_close_when_done(*args)
+                return
+            try:
+                spawn(_wrap_handle_and_close_when_done, *args)
+            except:
+                _close_fd(fd)
+                raise
+
     else:
 
         def do_read(self):
@@ -207,6 +266,37 @@ class DatagramServer(BaseServer):
 
     reuse_addr = DEFAULT_REUSE_ADDR
 
+    #: If set to a positive number, each read receives up to this many
+    #: datagrams that are already waiting, and the handler is called
+    #: with a single argument, a list of ``(data, address)`` pairs,
+    #: instead of with ``data, address`` for each datagram. This
+    #: spawns one greenlet per batch rather than per datagram, which
+    #: helps servers that receive many small datagrams. The handler
+    #: can reply with :meth:`sendmany`.
+    #:
+    #: On Linux, with IPv4 or IPv6, a batch is received with a single
+    #: ``recvmmsg`` system call. Elsewhere, each datagram in it takes
+    #: its own ``recvfrom_into`` call into a buffer allocated once.
+    #:
+    #: As usual, up to :attr:`max_accept` reads (here, batches) are
+    #: done each time the socket becomes readable.
+    #:
+    #: .. versionadded:: 1.4
+    batch_size = None
+
+    #: The size of the buffer datagrams are received into. Longer
+    #: datagrams are truncated.
+    #:
+    #: .. versionadded:: 1.4
+    max_datagram_size = 8192
+
+    # The buffer that batches are received into, as a memoryview.
+    _recv_view = None
+    # The gevent._mmsg.Receiver that batches are received with.
+    _receiver = None
+    # Whether to use recvmmsg and sendmmsg when possible.
+    _use_mmsg = _mmsg.available
+
     def __init__(self, *args, **kwargs):
         # The raw (non-gevent) socket, if possible
         self._socket = None
@@ -231,14 +321,52 @@ class DatagramServer(BaseServer):
         return _udp_socket(address, reuse_addr=cls.reuse_addr, family=family)
 
     def do_read(self):
+        if self.batch_size:
+            return self._read_batch()
         try:
-            data, address = self._socket.recvfrom(8192)
+            data, address = self._socket.recvfrom(self.max_datagram_size)
         except SocketError as err:
             if err.args[0] == EWOULDBLOCK:
                 return
             raise
         return data, address
 
+    def _can_use_mmsg(self):
+        return self._use_mmsg and self._socket.family in (AF_INET, AF_INET6)
+
+    def _read_batch(self):
+        if self._can_use_mmsg():
+            receiver = self._receiver
+            if (receiver is None
+                    or receiver.count != self.batch_size
+                    or receiver.size != self.max_datagram_size):
+                receiver = self._receiver = _mmsg.Receiver(self.batch_size,
+                                                           self.max_datagram_size)
+            datagrams = receiver.recv(self._socket.fileno())
+            if datagrams:
+                return (datagrams,)
+            return None
+
+        # Without recvmmsg, this is a loop of non-blocking reads into
+        # one buffer that's allocated once, copying out just the
+        # bytes received.
+        view = self._recv_view
+        if view is None or len(view) != self.max_datagram_size:
+            view = self._recv_view = memoryview(bytearray(self.max_datagram_size))
+        recvfrom_into = self._socket.recvfrom_into
+        datagrams = []
+        for _ in xrange(self.batch_size):
+            try:
+                n, address = recvfrom_into(view)
+            except SocketError as err:
+                if err.args[0] == EWOULDBLOCK or datagrams:
+                    # Anything else will be raised by the next read.
+                    break
+                raise
+            datagrams.append((view[:n].tobytes(), address))
+        if datagrams:
+            return (datagrams,)
+
     def sendto(self, *args):
         self._writelock.acquire()
         try:
@@ -246,12 +374,75 @@ class DatagramServer(BaseServer):
         finally:
             self._writelock.release()
 
+    def sendmany(self, datagrams):
+        """
+        Send each ``(data, address)`` pair in the iterable *datagrams*,
+        in order, holding the lock that :meth:`sendto` uses only once.
 
-def _tcp_listener(address, backlog=50, reuse_addr=None, family=AF_INET):
-    """A shortcut to create a TCP socket, bind it and put it into listening state."""
+        On Linux, datagrams to numeric IPv4 or IPv6 addresses are sent
+        in batches with the ``sendmmsg`` system call. Others, and any
+        that find the socket's send buffer full, are sent with
+        ``sendto``, waiting if necessary.
+
+        .. versionadded:: 1.4
+        """
+        self._writelock.acquire()
+        try:
+            sendto = self.socket.sendto
+            if not self._can_use_mmsg():
+                for data, address in datagrams:
+                    sendto(data, address)
+                return
+
+            datagrams = list(datagrams)
+            fileno = self._socket.fileno()
+            family = self._socket.family
+            sendmmsg = _mmsg.sendmmsg
+            i = 0
+            count = len(datagrams)
+            while i < count:
+                sent = sendmmsg(fileno, family, datagrams, i)
+                if not sent:
+                    sendto(*datagrams[i])
+                    sent = 1
+                i += sent
+        finally:
+            self._writelock.release()
+
+
+def _wrap_handle_and_close_when_done(handle, close, listener, fd, address):
+    # Used in adaptive_accept mode to create the client socket
+    # in the greenlet that handles it instead of in the accept loop.
+    try:
+        sock = GeventSocket(listener.family, listener.type, listener.proto, fileno=fd)
+    except:
+        _close_fd(fd)
+        raise
+    return _handle_and_close_when_done(handle, close, (sock, address))
+
+
+def _close_fd(fd):
+    try:
+        os.close(fd)
+    except OSError:
+        pass
+
+
+def _tcp_listener(address, backlog=50, reuse_addr=None, family=AF_INET, reuse_port=False):
+    """
+    A shortcut to create a TCP socket, bind it and put it into listening state.
+
+    If *backlog* is None, the socket is bound but not put into listening state.
+    """
     sock = GeventSocket(family=family)
     if reuse_addr is not None:
         sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, reuse_addr)
+    if reuse_port:
+        try:
+            sock.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
+        except SocketError:
+            sock.close()
+            raise
     try:
         sock.bind(address)
     except SocketError as ex:
@@ -259,7 +450,8 @@ def _tcp_listener(address, backlog=50, reuse_addr=None, family=AF_INET):
         if strerror is not None:
             ex.strerror = strerror + ': ' + repr(address)
         raise
-    sock.listen(backlog)
+    if backlog is not None:
+        sock.listen(backlog)
     sock.setblocking(0)
     return sock
 
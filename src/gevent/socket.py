@@ -59,9 +59,10 @@ except AttributeError:
     _GLOBAL_DEFAULT_TIMEOUT = object()
 
 
-def create_connection(address, timeout=_GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+def create_connection(address, timeout=_GLOBAL_DEFAULT_TIMEOUT, source_address=None,
+                      happy_eyeballs_delay=None):
     """
-    create_connection(address, timeout=None, source_address=None) -> socket
+    create_connection(address, timeout=None, source_address=None, happy_eyeballs_delay=None) -> socket
 
     Connect to *address* and return the :class:`gevent.socket.socket`
     object.
@@ -75,6 +76,20 @@ def create_connection(address, timeout=_GLOBAL_DEFAULT_TIMEOUT, source_address=N
     must be a tuple of (host, port) for the socket to bind as a source
     address before making the connection. A host of '' or port 0 tells
     the OS to use the default.
+
+    By default, the addresses that *address* resolves to are tried one
+    after the other. If *happy_eyeballs_delay* is given, they are
+    instead tried as described by :rfc:`8305` ("Happy Eyeballs"): the
+    addresses are reordered to alternate between address families,
+    and if an attempt hasn't succeeded or failed after
+    *happy_eyeballs_delay* seconds (0.25 is recommended), the next
+    one is started in parallel. The first socket to connect is
+    returned and the other attempts are abandoned. This keeps an
+    unreachable IPv6 (or IPv4) address from delaying every connection
+    by the whole *timeout*.
+
+    .. versionchanged:: 1.4
+       Add the *happy_eyeballs_delay* argument.
     """
 
     host, port = address
@@ -84,6 +99,10 @@ def create_connection(address, timeout=_GLOBAL_DEFAULT_TIMEOUT, source_address=N
     if not addrs:
         raise error("getaddrinfo returns an empty list")
 
+    if happy_eyeballs_delay is not None and len(addrs) > 1:
+        return _connect_staggered(_interleave_addrinfos(addrs),
+                                  timeout, source_address, happy_eyeballs_delay)
+
     for res in addrs:
         af, socktype, proto, _, sa = res
         sock = None
@@ -123,6 +142,100 @@ def create_connection(address, timeout=_GLOBAL_DEFAULT_TIMEOUT, source_address=N
                 sock = None
 
 
+def _interleave_addrinfos(addrs):
+    # RFC 8305 section 4: alternate between address families,
+    # starting with the family of the first (preferred) address.
+    by_family = {}
+    families = []
+    for res in addrs:
+        af = res[0]
+        if af not in by_family:
+            by_family[af] = []
+            families.append(af)
+        by_family[af].append(res)
+    result = []
+    queues = [by_family[af] for af in families]
+    while queues:
+        for queue in queues:
+            result.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return result
+
+
+def _connect_staggered(addrs, timeout, source_address, delay):
+    # Circular imports
+    from gevent.event import Event
+    from gevent.greenlet import Greenlet
+    from gevent.greenlet import killall
+
+    connected = []
+    errors = []
+    # Set whenever an attempt succeeds or fails.
+    finished = Event()
+
+    def attempt(res):
+        af, socktype, proto, _, sa = res
+        sock = None
+        try:
+            sock = socket(af, socktype, proto)
+            if timeout is not _GLOBAL_DEFAULT_TIMEOUT:
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sa)
+        except Exception as ex: # pylint:disable=broad-except
+            # Usually a socket.error; anything else would be raised
+            # by the sequential loop, so we raise it if every
+            # attempt fails.
+            if sock is not None:
+                sock.close()
+            errors.append(ex)
+        except BaseException:
+            # Most likely killed because another attempt won.
+            if sock is not None:
+                sock.close()
+            raise
+        else:
+            if connected:
+                # We lost a race with another attempt.
+                sock.close()
+            else:
+                connected.append(sock)
+        finished.set()
+
+    attempts = []
+    done = False
+    try:
+        for res in addrs:
+            finished.clear()
+            attempts.append(Greenlet.spawn(attempt, res))
+            if len(attempts) < len(addrs):
+                # Give it a head start, unless it (or an earlier
+                # attempt) fails first.
+                finished.wait(delay)
+            if connected:
+                break
+
+        while not connected and len(errors) < len(attempts):
+            finished.clear()
+            finished.wait()
+        done = True
+    finally:
+        try:
+            killall(attempts)
+        finally:
+            if not done:
+                # We were interrupted (e.g., by a Timeout), perhaps
+                # after an attempt had already connected; nobody
+                # will get that socket, so don't leak it.
+                for sock in connected:
+                    sock.close()
+
+    if connected:
+        return connected[0]
+    raise errors[-1]
+
+
 # This is promised to be in the __all__ of the _source, but, for circularity reasons,
 # we implement it in this module. Mostly for documentation purposes, put it
 # in the _source too.
@@ -3,11 +3,13 @@ from __future__ import absolute_import
 import sys
 import os
 
+from collections import deque
 from weakref import ref as wref
 
 from greenlet import greenlet as RawGreenlet
 
 from gevent._compat import integer_types
+from gevent._config import config as GEVENT_CONFIG
 from gevent.hub import _get_hub_noargs as get_hub
 from gevent.hub import getcurrent
 from gevent.hub import sleep
@@ -18,7 +20,6 @@ from gevent.pool import GroupMappingMixin
 from gevent.lock import Semaphore
 
 from gevent._threading import Lock
-from gevent._threading import Queue
 from gevent._threading import start_new_thread
 from gevent._threading import get_thread_ident
 
@@ -56,13 +57,40 @@ class ThreadPool(GroupMappingMixin):
        greenlet, bypassing the threadpool entirely.
     .. caution:: Instances of this class are only true if they have
        unfinished tasks.
+
+    *queue_class* is the kind of queue the tasks are given to the
+    worker threads with; by default, it's
+    :attr:`gevent.config.threadpool_queue <gevent._config.Config.threadpool_queue>`.
+
+    Threads are started as they are needed, up to *maxsize*. If
+    *idle_timeout* is given, threads that haven't had anything to do
+    for that many seconds (and up to twice that) exit, until only
+    *minsize* are left. *minsize* threads are started right away.
+
+    .. versionchanged:: 1.4
+       Add the *queue_class*, *minsize* and *idle_timeout* arguments.
     """
 
-    def __init__(self, maxsize, hub=None):
+    def __init__(self, maxsize, hub=None, queue_class=None, minsize=0, idle_timeout=None):
         if hub is None:
             hub = get_hub()
+        if queue_class is None:
+            queue_class = GEVENT_CONFIG.threadpool_queue
+        if minsize < 0:
+            raise ValueError('minsize must not be negative: %r' % (minsize, ))
+        # Check this before creating any watchers. A bad maxsize is
+        # reported by _set_maxsize().
+        if isinstance(maxsize, integer_types) and minsize > maxsize:
+            raise ValueError('minsize must not be bigger than maxsize: %r > %r'
+                             % (minsize, maxsize))
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError('idle_timeout must be positive: %r' % (idle_timeout, ))
         self.hub = hub
+        self._queue_class = queue_class
+        self.minsize = minsize
+        self.idle_timeout = idle_timeout
         self._maxsize = 0
+        self._reaper = None
         self.manager = None
         self.pid = os.getpid()
         self.fork_watcher = hub.loop.fork(ref=False)
@@ -133,8 +161,18 @@ class ThreadPool(GroupMappingMixin):
         self._size = 0
         self._semaphore = Semaphore(1)
         self._lock = Lock()
-        self.task_queue = Queue()
+        self.task_queue = self._queue_class()
+        completions = getattr(self, '_completions', None)
+        if completions is not None:
+            # We've forked; no thread is left to report to it.
+            completions.close()
+        self._completions = _Completions(self.hub)
+        # The fewest threads that were idle at any time since the
+        # reaper last ran.
+        self._idle_low = 0
         self._set_maxsize(maxsize)
+        if self.minsize:
+            self.size = self.minsize
 
     def _on_fork(self):
         # fork() only leaves one thread; also screws up locks;
@@ -156,6 +194,7 @@ class ThreadPool(GroupMappingMixin):
             delay = min(delay * 2, .05)
 
     def kill(self):
+        self._stop_reaper()
         self.size = 0
         self.fork_watcher.close()
 
@@ -171,6 +210,36 @@ class ThreadPool(GroupMappingMixin):
             self.fork_watcher.start(self._on_fork)
         else:
             self.fork_watcher.stop()
+        # We get here after each task is queued, which is the only
+        # time the number of idle threads goes down.
+        idle = self._size - self.task_queue.unfinished_tasks
+        if idle < self._idle_low:
+            self._idle_low = max(idle, 0)
+        if self._size > self.minsize and self.idle_timeout is not None:
+            self._start_reaper()
+
+    def _start_reaper(self):
+        if self._reaper is None:
+            self._reaper = self.hub.loop.timer(self.idle_timeout, self.idle_timeout)
+            # Idle threads shouldn't keep the loop running.
+            self._reaper.ref = False
+            self._reaper.start(self._reap)
+
+    def _stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.stop()
+            self._reaper.close()
+            self._reaper = None
+
+    def _reap(self):
+        # Threads that were idle the whole time since we last ran
+        # can go, as long as we keep minsize of them.
+        count = min(self._idle_low, self._size - self.minsize)
+        for _ in range(count):
+            self.task_queue.put(None)
+        self._idle_low = max(self._size - self.task_queue.unfinished_tasks, 0)
+        if self._size - count <= self.minsize:
+            self._stop_reaper()
 
     def _adjust_wait(self):
         delay = 0.0001
@@ -205,11 +274,7 @@ class ThreadPool(GroupMappingMixin):
 
         :return: A :class:`gevent.event.AsyncResult`.
         """
-        while 1:
-            semaphore = self._semaphore
-            semaphore.acquire()
-            if semaphore is self._semaphore:
-                break
+        semaphore = self._acquire_slot()
 
         thread_result = None
         try:
@@ -219,7 +284,8 @@ class ThreadPool(GroupMappingMixin):
             # we get LoopExit (why?). Previously it was done with a rawlink on the
             # AsyncResult and the comment that it is "competing for order with get(); this is not
             # good, just make ThreadResult release the semaphore before doing anything else"
-            thread_result = ThreadResult(result, self.hub, semaphore.release)
+            thread_result = ThreadResult(result, self.hub, semaphore.release,
+                                         self._completions)
             task_queue.put((func, args, kwargs, thread_result))
             self.adjust()
         except:
@@ -229,6 +295,82 @@ class ThreadPool(GroupMappingMixin):
             raise
         return result
 
+    def _acquire_slot(self):
+        while 1:
+            semaphore = self._semaphore
+            semaphore.acquire()
+            if semaphore is self._semaphore:
+                return semaphore
+
+    def spawn_many(self, func, iterable, chunksize=None):
+        """
+        Add tasks to the threadpool that will run ``func(item)`` for
+        each item of *iterable*.
+
+        The items are divided into chunks of *chunksize* items (by
+        default, enough for each thread of a full pool to get about
+        four chunks). A worker thread runs each item of a chunk in
+        turn, and sends the results of the whole chunk back to the hub
+        at once. As many chunks as there are slots available are put
+        in the queue at once; this waits until a slot is available for
+        the others, as :meth:`spawn` does.
+
+        :return: A :class:`gevent.event.AsyncResult` whose value is a list
+           of the results, in the order of *iterable*. If a call raises an
+           exception, it is set to that exception instead, and the
+           remaining items of that chunk are not run.
+
+        .. versionadded:: 1.4
+        """
+        items = list(iterable)
+        if chunksize is None:
+            chunksize, extra = divmod(len(items), max(self._maxsize, 1) * 4)
+            if extra or not chunksize:
+                chunksize += 1
+        if chunksize < 1:
+            raise ValueError('chunksize must be positive: %r' % (chunksize, ))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        batch = _Batch(len(chunks))
+        if not chunks:
+            batch.result.set([])
+
+        index = 0
+        while index < len(chunks) and not batch.result.ready():
+            semaphore = self._acquire_slot()
+            count = 1
+            while index + count < len(chunks) and semaphore.acquire(blocking=False):
+                count += 1
+
+            tasks = []
+            try:
+                for i in range(index, index + count):
+                    thread_result = ThreadResult(batch, self.hub, semaphore.release,
+                                                 self._completions)
+                    tasks.append((_run_chunk, (func, i, chunks[i]), {}, thread_result))
+                self.task_queue.put_many(tasks)
+                self.adjust()
+            except:
+                for task in tasks:
+                    task[3].destroy()
+                for _ in range(count):
+                    semaphore.release()
+                raise
+            index += count
+        return batch.result
+
+    def map_batch(self, func, iterable, chunksize=None):
+        """
+        Return a list of the results of ``func(item)`` for each item
+        of *iterable*, in order, running them in the threadpool as
+        :meth:`spawn_many` does. If a call raises an exception, it is
+        raised.
+
+        .. versionadded:: 1.4
+        """
+        if self._apply_immediately():
+            return [func(item) for item in iterable]
+        return self.spawn_many(func, iterable, chunksize).get()
+
     def _decrease_size(self):
         if sys is None:
             return
@@ -349,21 +491,119 @@ class _FakeAsync(object):
 
 _FakeAsync = _FakeAsync()
 
+class _Completions(object):
+    # The results of tasks that finished in worker threads, waiting to
+    # be delivered in the hub. Instead of each task having its own
+    # async watcher, all the tasks of a pool share one; workers append
+    # to a deque (which is thread-safe) and wake the hub, which
+    # delivers everything that has finished so far each time it runs.
+
+    __slots__ = ('hub', 'results', 'async_watcher', 'pending')
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.results = deque()
+        self.async_watcher = hub.loop.async_()
+        # The number of ThreadResult objects that haven't been delivered.
+        # Only changed in the hub's thread. While there are any, the
+        # watcher is started, keeping the loop alive, just as each
+        # task's own watcher used to.
+        self.pending = 0
+
+    def add(self):
+        self.pending += 1
+        if self.pending == 1:
+            # (libuv considers async watchers always active, so we
+            # can't ask the watcher.)
+            self.async_watcher.start(self._on_async)
+
+    def discard(self):
+        self.pending -= 1
+        if not self.pending:
+            self.async_watcher.stop()
+
+    def put(self, thread_result):
+        # Called in a worker thread.
+        self.results.append(thread_result)
+        self.async_watcher.send()
+
+    def _on_async(self):
+        results = self.results
+        while results:
+            thread_result = results.popleft()
+            self.discard()
+            try:
+                thread_result._on_async()
+            except: # pylint:disable=bare-except
+                self.hub.handle_error(thread_result, *sys.exc_info())
+
+    def close(self):
+        self.async_watcher.stop()
+        self.async_watcher.close()
+        self.results.clear()
+        self.pending = 0
+
+
+def _run_chunk(func, index, items):
+    return index, [func(item) for item in items]
+
+
+class _Batch(object):
+    # Receives the ThreadResult of each chunk of spawn_many(), in the
+    # hub, and puts the results together.
+
+    __slots__ = ('result', 'values', 'remaining')
+
+    def __init__(self, count):
+        self.result = AsyncResult()
+        self.values = [None] * count
+        self.remaining = count
+
+    def __call__(self, thread_result):
+        if self.result.ready():
+            # An earlier chunk failed.
+            return
+        if not thread_result.successful():
+            self.values = None
+            self.result.set_exception(thread_result.exception, thread_result.exc_info)
+            return
+        index, values = thread_result.value
+        self.values[index] = values
+        self.remaining -= 1
+        if not self.remaining:
+            values = [value for chunk in self.values for value in chunk]
+            self.values = None
+            self.result.set(values)
+
+
 class ThreadResult(object):
+    """
+    The result of a task run in another thread, delivered to
+    *receiver* in *hub*.
+
+    .. versionchanged:: 1.4
+       Accept the *completions* argument; when it is given, this
+       object doesn't create an async watcher of its own.
+    """
 
     # Using slots here helps to debug reference cycles/leaks
     __slots__ = ('exc_info', 'async_watcher', '_call_when_ready', 'value',
-                 'context', 'hub', 'receiver')
+                 'context', 'hub', 'receiver', '_completions')
 
-    def __init__(self, receiver, hub, call_when_ready):
+    def __init__(self, receiver, hub, call_when_ready, completions=None):
         self.receiver = receiver
         self.hub = hub
         self.context = None
         self.value = None
         self.exc_info = ()
-        self.async_watcher = hub.loop.async_()
         self._call_when_ready = call_when_ready
-        self.async_watcher.start(self._on_async)
+        self._completions = completions
+        if completions is not None:
+            self.async_watcher = _FakeAsync
+            completions.add()
+        else:
+            self.async_watcher = hub.loop.async_()
+            self.async_watcher.start(self._on_async)
 
     @property
     def exception(self):
@@ -382,6 +622,7 @@ class ThreadResult(object):
             if self.exc_info:
                 self.hub.handle_error(self.context, *self.exc_info)
             self.context = None
+            self._completions = None
             self.async_watcher = _FakeAsync
             self.hub = None
             self._call_when_ready = _FakeAsync
@@ -397,20 +638,29 @@ class ThreadResult(object):
         self.async_watcher.stop()
         self.async_watcher.close()
         self.async_watcher = _FakeAsync
+        if self._completions is not None:
+            self._completions.discard()
+            self._completions = None
 
         self.context = None
         self.hub = None
         self._call_when_ready = _FakeAsync
         self.receiver = _FakeAsync
 
+    def _send(self):
+        if self._completions is not None:
+            self._completions.put(self)
+        else:
+            self.async_watcher.send()
+
     def set(self, value):
         self.value = value
-        self.async_watcher.send()
+        self._send()
 
     def handle_error(self, context, exc_info):
         self.context = context
         self.exc_info = exc_info
-        self.async_watcher.send()
+        self._send()
 
     # link protocol:
     def successful(self):
@@ -191,6 +191,14 @@ class Timeout(BaseException):
         used to properly clean up native resources.
         The ``with`` statement does this automatically.
 
+    .. versionchanged:: 1.4
+
+        If the :attr:`gevent.config.timer_wheel
+        <gevent._config.Config.timer_wheel>` setting is enabled, the
+        timeout is scheduled on the hub's coarse-grained
+        :attr:`~gevent.hub.Hub.timer_wheel` (unless *seconds* is less
+        than one tick), and *priority* is ignored.
+
     """
 
     # We inherit a __dict__ from BaseException, so __slots__ actually
@@ -212,9 +220,14 @@ class Timeout(BaseException):
 
             self.timer = _FakeTimer
         else:
-            # XXX: A timer <= 0 could cause libuv to block the loop; we catch
-            # that case in libuv/loop.py
-            self.timer = get_hub().loop.timer(seconds or 0.0, ref=ref, priority=priority)
+            hub = get_hub()
+            wheel = hub.timer_wheel
+            if wheel is not None and seconds >= wheel.resolution:
+                self.timer = wheel.timer(seconds, ref=ref)
+            else:
+                # XXX: A timer <= 0 could cause libuv to block the loop; we catch
+                # that case in libuv/loop.py
+                self.timer = hub.loop.timer(seconds or 0.0, ref=ref, priority=priority)
 
     def start(self):
         """Schedule the timeout."""
@@ -1,6 +1,7 @@
 # Copyright 2018 gevent contributors. See LICENSE for details.
 
 import gc
+import os
 import unittest
 
 
@@ -42,6 +43,33 @@ class MockHub(object):
     def reinit(self):
         "mock loop.reinit"
 
+    def async_(self, ref=True):
+        "mock loop.async_"
+        assert not ref
+        return MockAsync()
+
+class MockAsync(object):
+
+    callback = None
+    sent = 0
+    closed = False
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def close(self):
+        self.closed = True
+
+    def send(self):
+        assert not self.closed
+        self.sent += 1
+
+class MockTracer(object):
+    active_greenlet = None
+
 class _AbstractTestPeriodicMonitoringThread(object):
     # Makes sure we don't actually spin up a new monitoring thread.
 
@@ -280,6 +308,208 @@ class TestPeriodicMonitorBlocking(_AbstractTestPeriodicMonitoringThread,
         self.assertTrue(self.pmt.monitor_blocking(self.hub))
 
 
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_empty(self):
+        h = monitor.LatencyHistogram()
+        self.assertEqual(0, h.count)
+        self.assertEqual(0, h.percentile(50))
+        self.assertEqual(0, h.max)
+        self.assertEqual(0, h.mean)
+
+    def test_small_values_are_exact(self):
+        h = monitor.LatencyHistogram()
+        for i in range(1, 11):
+            h.record(i * 1e-6)
+        self.assertEqual(10, h.count)
+        self.assertAlmostEqual(5e-6, h.percentile(50))
+        self.assertAlmostEqual(10e-6, h.percentile(100))
+        self.assertAlmostEqual(1e-6, h.percentile(0))
+
+    def test_relative_precision(self):
+        h = monitor.LatencyHistogram()
+        values = [0.0001 * 1.1 ** i for i in range(100)]
+        for value in values:
+            h.record(value)
+        self.assertEqual(max(values), h.max)
+        for percent in (10, 50, 90, 99):
+            exact = values[int(len(values) * percent / 100.0) - 1]
+            self.assertLessEqual(exact, h.percentile(percent) + 1e-9)
+            self.assertLess(h.percentile(percent), exact * 1.07)
+
+    def test_negative(self):
+        h = monitor.LatencyHistogram()
+        h.record(-1)
+        self.assertEqual(0, h.percentile(50))
+
+
+class TestPeriodicMonitorLoopLag(_AbstractTestPeriodicMonitoringThread,
+                                 unittest.TestCase):
+
+    def setUp(self):
+        super(TestPeriodicMonitorLoopLag, self).setUp()
+        self._old_period = GEVENT_CONFIG.loop_lag_period
+        GEVENT_CONFIG.loop_lag_period = 0.1
+
+    def tearDown(self):
+        GEVENT_CONFIG.loop_lag_period = self._old_period
+        super(TestPeriodicMonitorLoopLag, self).tearDown()
+
+    def test_disabled(self):
+        GEVENT_CONFIG.loop_lag_period = 0
+        self.pmt.install_monitor_loop_lag()
+        self.assertIsNone(self.pmt.loop_lag)
+        self.assertEqual(self.len_pmt_default_funcs, len(self.pmt.monitoring_functions()))
+
+    def test_disabled_from_environment(self):
+        from gevent._config import MonitorLoopLagPeriod
+        settings = GEVENT_CONFIG.settings
+        old_setting = settings['loop_lag_period']
+        settings['loop_lag_period'] = MonitorLoopLagPeriod()
+        os.environ['GEVENT_MONITOR_LOOP_LAG_PERIOD'] = '0'
+        try:
+            self.assertEqual(GEVENT_CONFIG.loop_lag_period, 0)
+            self.pmt.install_monitor_loop_lag()
+        finally:
+            del os.environ['GEVENT_MONITOR_LOOP_LAG_PERIOD']
+            settings['loop_lag_period'] = old_setting
+        self.assertIsNone(self.pmt.loop_lag)
+        self.assertIsNone(self.pmt._loop_lag_watcher)
+        self.assertEqual(self.len_pmt_default_funcs, len(self.pmt.monitoring_functions()))
+
+    def test_probe_and_report(self):
+        from gevent import events
+        from zope.interface.verify import verifyObject
+        self.pmt.install_monitor_loop_lag()
+        self.assertEqual(self.len_pmt_default_funcs + 2, len(self.pmt.monitoring_functions()))
+        watcher = self.pmt._loop_lag_watcher
+
+        # Nothing measured, nothing to report
+        self.assertIsNone(self.pmt.report_loop_lag(self.hub))
+
+        self.pmt.monitor_loop_lag(self.hub)
+        self.assertEqual(1, watcher.sent)
+        # The hub hasn't run the callback yet, so we don't probe again.
+        self.pmt.monitor_loop_lag(self.hub)
+        self.assertEqual(1, watcher.sent)
+
+        watcher.callback()
+        self.assertEqual(1, self.pmt.loop_lag.count)
+        # Running again without a probe does nothing.
+        watcher.callback()
+        self.assertEqual(1, self.pmt.loop_lag.count)
+
+        self.pmt.monitor_loop_lag(self.hub)
+        self.assertEqual(2, watcher.sent)
+        watcher.callback()
+
+        event = self.pmt.report_loop_lag(self.hub)
+        self.assertIsInstance(event, events.EventLoopLagReport)
+        verifyObject(events.IEventLoopLagReport, event)
+        self.assertEqual(2, event.count)
+        self.assertLessEqual(event.p50, event.max)
+        repr(event)
+
+        # The report starts a new interval, but the overall
+        # histogram keeps going.
+        self.assertIsNone(self.pmt.report_loop_lag(self.hub))
+        self.assertEqual(2, self.pmt.loop_lag.count)
+
+    def test_kill_closes_watcher(self):
+        self.pmt.install_monitor_loop_lag()
+        watcher = self.pmt._loop_lag_watcher
+        self.pmt.kill()
+        self.assertTrue(watcher.closed)
+        self.assertIsNone(watcher.callback)
+        self.assertIsNone(self.pmt._loop_lag_watcher)
+        # A probe that was already on its way doesn't touch it.
+        self.pmt.monitor_loop_lag(self.hub)
+        self.assertEqual(0, watcher.sent)
+
+
+class TestPeriodicMonitorProfiling(_AbstractTestPeriodicMonitoringThread,
+                                   unittest.TestCase):
+
+    def test_start_stop(self):
+        self.assertIsNone(self.pmt.stop_profiling())
+        with self.assertRaises(ValueError):
+            self.pmt.start_profiling(0)
+
+        profiler = self.pmt.start_profiling(50)
+        self.assertIs(profiler, self.pmt.profiler)
+        self.assertEqual(self.len_pmt_default_funcs + 1, len(self.pmt.monitoring_functions()))
+        self.assertEqual(0.02, self.pmt.monitoring_functions()[-1].period)
+
+        # Starting again changes the rate.
+        self.assertIs(profiler, self.pmt.start_profiling(100))
+        self.assertEqual(self.len_pmt_default_funcs + 1, len(self.pmt.monitoring_functions()))
+        self.assertEqual(0.01, self.pmt.monitoring_functions()[-1].period)
+
+        self.assertIs(profiler, self.pmt.stop_profiling())
+        self.assertIsNone(self.pmt.profiler)
+        self.assertEqual(self.len_pmt_default_funcs, len(self.pmt.monitoring_functions()))
+
+    def test_sample(self):
+        import gevent
+        profiler = self.pmt.start_profiling()
+        # The real tracer's active_greenlet can't be assigned when
+        # it's compiled, so stand in for it.
+        tracer = profiler._tracer = MockTracer()
+
+        # Because the mock hub is in this thread, we sample ourself.
+        glet = gevent.Greenlet(lambda: None)
+        glet.name = 'my;greenlet'
+        tracer.active_greenlet = glet
+        profiler.sample(self.hub)
+        profiler.sample(self.hub)
+        self.assertEqual(2, profiler.samples)
+        self.assertEqual(1, len(profiler.stacks))
+        stack = list(profiler.stacks)[0]
+        self.assertEqual('my:greenlet', stack[0])
+        self.assertTrue(stack[-1].startswith('sample ('), stack)
+        self.assertTrue(stack[-2].startswith('test_sample ('), stack)
+
+        lines = profiler.collapsed()
+        self.assertEqual(1, len(lines))
+        self.assertTrue(lines[0].endswith(' 2'))
+        self.assertEqual(';'.join(stack) + ' 2', lines[0])
+        stream = NativeStrIO()
+        profiler.write_collapsed(stream)
+        self.assertEqual(lines[0] + '\n', stream.getvalue())
+
+        # Default greenlet names aren't interesting; where it
+        # was spawned is.
+        tracer.active_greenlet = gevent.Greenlet(lambda: None)
+        profiler.sample(self.hub)
+        self.assertEqual(2, len(profiler.stacks))
+        labels = [s[0] for s in profiler.stacks]
+        self.assertIn('my:greenlet', labels)
+        labels.remove('my:greenlet')
+        self.assertTrue(labels[0].startswith('spawned at test_sample ('), labels)
+
+        tracer.active_greenlet = self.hub
+        profiler.sample(self.hub)
+        self.assertIn('Hub', [s[0] for s in profiler.stacks])
+
+        # Samples in the event loop aren't stacks.
+        profiler._idle_codes = frozenset([monitor.SamplingProfiler.sample.__code__])
+        profiler.sample(self.hub)
+        self.assertEqual(1, profiler.loop_samples)
+        self.assertEqual(5, profiler.samples)
+
+        profiler.reset()
+        self.assertEqual(0, profiler.samples)
+        self.assertEqual([], profiler.collapsed())
+
+    def test_sample_depth(self):
+        profiler = self.pmt.start_profiling()
+        profiler.max_depth = 1
+        profiler.sample(self.hub)
+        stack = list(profiler.stacks)[0]
+        self.assertEqual(2, len(stack))
+        self.assertTrue(stack[1].startswith('sample ('), stack)
+
+
 class MockProcess(object):
 
     def __init__(self, rss):
@@ -0,0 +1,176 @@
+# Copyright 2018 gevent contributors. See LICENSE for details.
+
+import time
+
+import greentest
+import gevent
+from gevent.hub import get_hub
+from gevent._timerwheel import TimerWheel
+
+RESOLUTION = 0.01
+
+
+class TestTimerWheel(greentest.TestCase):
+
+    def setUp(self):
+        super(TestTimerWheel, self).setUp()
+        self.wheel = TimerWheel(get_hub().loop, RESOLUTION, slots=4, levels=3)
+
+    def tearDown(self):
+        self.wheel.close()
+        super(TestTimerWheel, self).tearDown()
+
+    def _start(self, seconds, fired, *args):
+        timer = self.wheel.timer(seconds)
+        timer.start(fired.append, args or seconds, update=True)
+        return timer
+
+    def test_fires_in_order_never_early(self):
+        fired = []
+        begin = time.time()
+        # With 4 slots and 3 levels, these need the upper levels,
+        # and the last overflows the wheel.
+        delays = [0.09, 0.01, 0.05, 0.03, 0.2, 0.75]
+        for delay in delays:
+            self._start(delay, fired)
+        self.assertEqual(len(self.wheel), len(delays))
+
+        gevent.sleep(0.8)
+        self.assertEqual(fired, sorted(delays))
+        self.assertEqual(len(self.wheel), 0)
+        self.assertGreaterEqual(time.time() - begin, 0.75)
+
+    def test_fires_late_by_at_most_a_tick(self):
+        fired = []
+        begin = time.time()
+        timer = self.wheel.timer(0.05)
+        timer.start(lambda: fired.append(time.time() - begin), update=True)
+        self.assertTrue(timer.active)
+        while not fired:
+            gevent.sleep(0.001)
+        self.assertFalse(timer.active)
+        self.assertTimeWithinRange(fired[0], 0.05, 0.05 + RESOLUTION * 3)
+
+    def test_stop(self):
+        fired = []
+        keep = self._start(0.02, fired)
+        stopped = self._start(0.02, fired, 'stopped')
+        stopped.stop()
+        self.assertFalse(stopped.active)
+        self.assertTrue(keep.active)
+        self.assertEqual(len(self.wheel), 1)
+
+        gevent.sleep(0.1)
+        self.assertEqual(fired, [0.02])
+
+    def test_stop_all_idles(self):
+        fired = []
+        timer = self._start(0.02, fired)
+        timer.stop()
+        self.assertEqual(len(self.wheel), 0)
+        # The native timer keeps running until the next tick, in case
+        # another timer is started right away.
+        self.assertTrue(self.wheel._timer.active)
+        self.assertFalse(self.wheel._timer.ref)
+        gevent.sleep(RESOLUTION * 3)
+        self.assertFalse(self.wheel._timer.active)
+        # It can be restarted.
+        timer.start(fired.append, 'again')
+        gevent.sleep(0.1)
+        self.assertEqual(fired, ['again'])
+
+    def test_again(self):
+        fired = []
+        timer = self._start(0.05, fired, 'first')
+        gevent.sleep(0.03)
+        # Re-armed from now, replacing the callback.
+        timer.again(fired.append, 'again', update=True)
+        self.assertEqual(len(self.wheel), 1)
+        gevent.sleep(0.03)
+        self.assertEqual(fired, [])
+        gevent.sleep(0.1)
+        self.assertEqual(fired, ['again'])
+
+    def test_callback_restarts_wheel(self):
+        fired = []
+
+        def first():
+            fired.append(1)
+            self._start(0.05, fired, 2)
+
+        timer = self.wheel.timer(0.02)
+        timer.start(first)
+        gevent.sleep(0.03)
+        self.assertEqual(fired, [1])
+        gevent.sleep(0.1)
+        self.assertEqual(fired, [1, (2,)])
+
+    def test_callback_closes_wheel(self):
+        fired = []
+
+        def close():
+            fired.append(1)
+            self.wheel.close()
+
+        self.wheel.timer(0.02).start(close)
+        gevent.sleep(0.1)
+        self.assertEqual(fired, [1])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_ref(self):
+        # A referenced timer keeps the loop alive, so the hub can't exit
+        # before it fires.
+        fired = []
+        timer = self.wheel.timer(0.02)
+        timer.start(fired.append, 1)
+        self.assertTrue(self.wheel._timer.ref)
+        timer.stop()
+        self.assertFalse(self.wheel._timer.ref)
+        timer = self.wheel.timer(0.02, ref=False)
+        timer.start(fired.append, 1)
+        self.assertFalse(self.wheel._timer.ref)
+        timer.stop()
+
+
+class TestTimeoutWithWheel(greentest.TestCase):
+
+    def setUp(self):
+        super(TestTimeoutWithWheel, self).setUp()
+        hub = get_hub()
+        hub.timer_wheel = TimerWheel(hub.loop, RESOLUTION)
+
+    def tearDown(self):
+        hub = get_hub()
+        hub.timer_wheel.close()
+        del hub.timer_wheel
+        super(TestTimeoutWithWheel, self).tearDown()
+
+    def test_timeout_uses_wheel(self):
+        wheel = get_hub().timer_wheel
+        # The test case itself may be running under a Timeout.
+        before = len(wheel)
+        timeout = gevent.Timeout(1)
+        timeout.start()
+        try:
+            self.assertEqual(len(wheel), before + 1)
+            self.assertTrue(timeout.pending)
+        finally:
+            timeout.close()
+        self.assertEqual(len(wheel), before)
+        self.assertFalse(timeout.pending)
+
+    def test_timeout_expires(self):
+        with self.assertRaises(gevent.Timeout):
+            with gevent.Timeout(0.02):
+                get_hub().switch()
+
+    def test_short_timeout_uses_loop(self):
+        wheel = get_hub().timer_wheel
+        before = len(wheel)
+        with gevent.Timeout(RESOLUTION / 2, False):
+            self.assertEqual(len(wheel), before)
+            gevent.sleep(1)
+
+
+if __name__ == '__main__':
+    greentest.main()
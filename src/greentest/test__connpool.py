@@ -0,0 +1,119 @@
+import gevent
+from gevent import socket
+from gevent import server
+from gevent.connpool import ConnectionPool
+import greentest
+
+
+def echo(sock, _):
+    while True:
+        try:
+            data = sock.recv(1024)
+        except socket.error:
+            # The pool resets connections it closes with unread data.
+            break
+        if not data:
+            break
+        if data == b'close':
+            break
+        sock.sendall(data)
+    sock.close()
+
+
+class TestConnectionPool(greentest.TestCase):
+
+    def setUp(self):
+        super(TestConnectionPool, self).setUp()
+        self.server = server.StreamServer(('127.0.0.1', 0), echo)
+        self.server.start()
+        self.pool = ConnectionPool(max_per_host=2, idle_timeout=60)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+        super(TestConnectionPool, self).tearDown()
+
+    def _get(self, **kwargs):
+        return self.pool.get('127.0.0.1', self.server.server_port, **kwargs)
+
+    def test_reuse(self):
+        sock = self._get()
+        sock.sendall(b'hi')
+        self.assertEqual(sock.recv(2), b'hi')
+        self.pool.put(sock)
+        self.assertIs(self._get(), sock)
+        stats = self.pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['reused'], 1)
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['idle'], 0)
+
+    def test_discard(self):
+        sock = self._get()
+        self.pool.discard(sock)
+        self.assertTrue(sock.closed)
+        self.assertIsNot(self._get(), sock)
+
+    def test_dead_connection_not_reused(self):
+        sock = self._get()
+        sock.sendall(b'close')
+        self.pool.put(sock)
+        # Let the server close its end.
+        gevent.sleep(0.1)
+        self.assertIsNot(self._get(), sock)
+        self.assertTrue(sock.closed)
+        self.assertEqual(self.pool.stats()['discarded'], 1)
+
+    def test_unread_data_not_reused(self):
+        sock = self._get()
+        sock.sendall(b'unread')
+        gevent.sleep(0.1)
+        self.pool.put(sock)
+        self.assertIsNot(self._get(), sock)
+
+    def test_max_per_host(self):
+        first = self._get()
+        self._get()
+        with self.assertRaises(socket.timeout):
+            self._get(timeout=0.01)
+
+        waiter = gevent.spawn(self._get)
+        gevent.sleep(0.01)
+        self.assertFalse(waiter.ready())
+        self.pool.put(first)
+        self.assertIs(waiter.get(timeout=1), first)
+
+    def test_context_manager(self):
+        with self.pool.connection('127.0.0.1', self.server.server_port) as sock:
+            pass
+        self.assertEqual(self.pool.stats()['idle'], 1)
+
+        with self.assertRaises(ZeroDivisionError):
+            with self.pool.connection('127.0.0.1', self.server.server_port) as sock2:
+                raise ZeroDivisionError()
+        self.assertIs(sock2, sock)
+        self.assertTrue(sock.closed)
+        self.assertEqual(self.pool.stats()['idle'], 0)
+
+    def test_idle_timeout(self):
+        self.pool.close()
+        self.pool = ConnectionPool(idle_timeout=0.05)
+        sock = self._get()
+        self.pool.put(sock)
+        gevent.sleep(0.2)
+        self.assertTrue(sock.closed)
+        self.assertEqual(self.pool.stats()['idle'], 0)
+
+    def test_close(self):
+        idle = self._get()
+        in_use = self._get()
+        self.pool.put(idle)
+        self.pool.close()
+        self.assertTrue(idle.closed)
+        self.pool.put(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertRaises(ValueError, self._get)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -154,6 +154,67 @@ class TestLibev(unittest.TestCase):
         self.assertRaises(TypeError, core.loop, object())
 
 
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = core.loop(default=False) # pylint:disable=no-member
+
+    def tearDown(self):
+        self.loop.destroy()
+        del self.loop
+
+    def test_initial(self):
+        stats = self.loop.stats()
+        self.assertEqual(stats, dict.fromkeys(stats, 0))
+        self.assertFalse(self.loop.stats_timing)
+
+    def test_counters(self):
+        import os
+        loop = self.loop
+        for _ in range(3):
+            loop.run_callback(lambda: None)
+        loop.run_callback(lambda: None).stop()
+
+        timer = loop.timer(0.001)
+        timer.start(lambda: None)
+
+        r, w = os.pipe()
+        self.addCleanup(os.close, r)
+        self.addCleanup(os.close, w)
+        io = loop.io(r, core.READ) # pylint:disable=no-member
+        io.start(io.stop)
+        os.write(w, b'x')
+
+        loop.run()
+        io.close()
+        timer.close()
+
+        stats = loop.stats()
+        self.assertEqual(stats['callbacks_run'], 3)
+        self.assertEqual(stats['callbacks_deferred'], 0)
+        self.assertEqual(stats['timers_fired'], 1)
+        self.assertEqual(stats['io_events'], 1)
+        self.assertGreaterEqual(stats['iterations'], 1)
+        self.assertEqual(stats['blocked_time'], 0)
+
+    def test_timing(self):
+        import time
+        loop = self.loop
+        loop.stats_timing = True
+        self.assertTrue(loop.stats_timing)
+        loop.run_callback(time.sleep, 0.02)
+        timer = loop.timer(0.05)
+        timer.start(lambda: None)
+        loop.run()
+        timer.close()
+        loop.stats_timing = False
+
+        stats = loop.stats()
+        self.assertGreaterEqual(stats['longest_callback'], 0.015)
+        self.assertGreaterEqual(stats['running_time'], stats['longest_callback'])
+        self.assertGreater(stats['blocked_time'], 0.01)
+
+
 class TestEvents(unittest.TestCase):
 
     def test_events_conversion(self):
@@ -25,6 +25,18 @@ def main():
     assert called == [1], called
     assert not x, x
 
+    # Callback objects that have run may be reused, but never one
+    # that somebody still has a reference to.
+    del called[:]
+    held = loop.run_callback(f)
+    gevent.sleep(0)
+    others = [loop.run_callback(f) for _ in range(10)]
+    assert held not in others, held
+    assert not held, held
+    held.stop()
+    gevent.sleep(0)
+    assert called == [1] * 11, called
+
 
 if __name__ == '__main__':
     called[:] = []
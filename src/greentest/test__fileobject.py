@@ -177,6 +177,50 @@ class Test(greentest.TestCase):
         b = x.read(1)
         self.assertEqual(b, b'2')
 
+    @skipOnWindows("Uses FileObjectPosix")
+    def test_raw_readinto_readall_pipe(self):
+        from gevent._fileobjectposix import GreenFileDescriptorIO
+        import array
+        r, w = os.pipe()
+        raw = GreenFileDescriptorIO(r, 'rb')
+        self._close_on_teardown(raw)
+        data = b'0123456789' * 10000
+
+        buf = bytearray(4)
+        os.write(w, b'abcdef')
+        self.assertEqual(raw.readinto(buf), 4)
+        self.assertEqual(buf, b'abcd')
+        arr = array.array('b', b'  ')
+        self.assertEqual(raw.readinto(arr), 2)
+        self.assertEqual(arr.tobytes() if PY3 else arr.tostring(), b'ef')
+
+        writer_glet = gevent.spawn(self._write_all_and_close, w, data)
+        self.assertEqual(raw.readall(), data)
+        writer_glet.get()
+
+    def _write_all_and_close(self, fd, data):
+        from gevent.os import nb_write
+        from gevent.os import make_nonblocking
+        make_nonblocking(fd)
+        try:
+            while data:
+                data = data[nb_write(fd, data):]
+        finally:
+            os.close(fd)
+
+    @skipOnWindows("Uses FileObjectPosix")
+    def test_raw_readall_file(self):
+        from gevent._fileobjectposix import GreenFileDescriptorIO
+        fileno, path = tempfile.mkstemp('.gevent.test__fileobject.test_raw_readall_file')
+        self.addCleanup(os.remove, path)
+        data = b'x' * 100000
+        os.write(fileno, data)
+        os.lseek(fileno, 10, os.SEEK_SET)
+        raw = GreenFileDescriptorIO(fileno, 'rb')
+        self._close_on_teardown(raw)
+        self.assertEqual(raw.readall(), data[10:])
+        self.assertEqual(raw.readall(), b'')
+
 def writer(fobj, line):
     for character in line:
         fobj.write(character)
@@ -17,6 +17,14 @@ if sys.platform != 'win32' and sys.version_info[:2] >= (3, 4):
             _select = selectors.SelectSelector._select
             self.assertTrue(hasattr(_select, '_gevent_monkey'), dir(_select))
 
+        def test_default_selector_is_patched(self):
+            from gevent.selectors import GeventSelector
+            self.assertIs(selectors.DefaultSelector, GeventSelector)
+
+        def test_epoll_selector_removed(self):
+            # It needs the fileno() of a real epoll object.
+            self.assertFalse(hasattr(selectors, 'EpollSelector'))
+
 
 if __name__ == '__main__':
     greentest.main()
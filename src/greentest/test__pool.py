@@ -304,10 +304,11 @@ elif greentest.RUNNING_ON_CI or greentest.EXPECT_POOR_TIMER_RESOLUTION:
 class TestPool(greentest.TestCase): # pylint:disable=too-many-public-methods
     __timeout__ = greentest.LARGE_TIMEOUT
     size = 1
+    klass = gevent.pool.Pool
 
     def setUp(self):
         greentest.TestCase.setUp(self)
-        self.pool = gevent.pool.Pool(self.size)
+        self.pool = self.klass(self.size)
 
     def cleanup(self):
         self.pool.join()
@@ -482,6 +483,59 @@ class TestPoolUnlimit(TestPool):
     size = None
 
 
+class TestWorkerPool(TestPool):
+    klass = gevent.pool.WorkerPool
+
+    def test_reuses_workers(self):
+        seen = set()
+
+        def task(i):
+            seen.add(gevent.getcurrent())
+            return i
+
+        self.assertEqual(self.pool.map(task, range(SMALL_RANGE)), list(range(SMALL_RANGE)))
+        self.assertLessEqual(len(seen), self.size)
+        self.assertEqual(len(self.pool._workers), len(seen))
+
+    def test_spawn_result(self):
+        result = self.pool.spawn(sqr, 3)
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual(result.get(), 9)
+        self.assertTrue(self.pool.join(timeout=1))
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.free_count(), self.size)
+
+    def test_spawn_raises(self):
+        result = self.pool.spawn(divmod, 1, 0)
+        self.expect_one_error()
+        result.wait()
+        self.assertIsInstance(result.exception, ZeroDivisionError)
+        self.assert_error(ZeroDivisionError)
+        # The worker survived
+        self.assertEqual(self.pool.apply(sqr, (4,)), 16)
+
+    def test_kill(self):
+        results = [self.pool.spawn(gevent.sleep, 10) for _ in range(self.size)]
+        gevent.sleep(0.01)
+        self.assertTrue(self.pool.full())
+        self.pool.kill()
+        for result in results:
+            self.assertIsInstance(result.exception, gevent.GreenletExit)
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(len(self.pool._workers), 0)
+        # New workers are started
+        self.assertEqual(self.pool.apply(sqr, (5,)), 25)
+
+    def test_init_error(self):
+        self.assertRaises(ValueError, self.klass, 0)
+        self.assertRaises(ValueError, self.klass, None)
+
+
+@greentest.ignores_leakcheck
+class TestWorkerPool3(TestWorkerPool):
+    size = 3
+
+
 class TestPool0(greentest.TestCase):
     size = 0
 
@@ -1505,6 +1505,48 @@ class TestHandlerSubclass(TestCase):
         self.assertEqual(fd.read(), b'')
 
 
+class _SocketWithoutVectoredSend(object):
+    # A socket-like object that only has the standard socket API.
+
+    def __init__(self, sock):
+        self._wrapped = sock
+
+    def __getattr__(self, name):
+        if name == 'sendall_vectored':
+            raise AttributeError(name)
+        return getattr(self._wrapped, name)
+
+
+class TestSocketWithoutVectoredSend(TestCase):
+
+    validator = None
+
+    def application(self, environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        yield b'hello'
+        yield b'world'
+
+    def init_server(self, application):
+        class SocketWrappingHandler(pywsgi.WSGIHandler):
+            def __init__(self, sock, *args):
+                pywsgi.WSGIHandler.__init__(self, sock, *args)
+                self.socket = _SocketWithoutVectoredSend(sock)
+
+        self.server = pywsgi.WSGIServer((self.listen_addr, 0),
+                                        application,
+                                        handler_class=SocketWrappingHandler)
+
+    def test_chunked(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        read_http(fd, body='helloworld', chunks=[b'hello', b'world'])
+
+    def test_http_10(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.0\r\nHost: localhost\r\n\r\n')
+        read_http(fd, body='helloworld', chunks=False)
+
+
 class TestErrorAfterChunk(TestCase):
     validator = None
 
@@ -1800,6 +1842,215 @@ class TestEnviron(TestCase):
 
             self.assertEqual(json.dumps(bltin), json.dumps(env))
 
+class FastHeaderParserMixin(object):
+
+    def init_server(self, application):
+        TestCase.init_server(self, application)
+        self.server.fast_header_parser = True
+
+
+class TestFastHeaderParserYield(FastHeaderParserMixin, TestYield): # pylint:disable=too-many-ancestors
+    pass
+
+
+class TestFastHeaderParserChunkedPost(FastHeaderParserMixin, TestChunkedPost):
+    pass
+
+
+class TestFastHeaderParserMultiLine(FastHeaderParserMixin, MultiLineHeader):
+    pass
+
+
+class TestFastHeaderParser(FastHeaderParserMixin, TestCase):
+    validator = None
+    environ = None
+
+    def application(self, env, start_response):
+        self.environ = env
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'hello']
+
+    def test_environ(self):
+        fd = self.makefile()
+        fd.write('POST /a?b=c HTTP/1.1\r\n'
+                 'Host: localhost\r\n'
+                 'Content-Type: text/plain\r\n'
+                 'Content-Length: 0\r\n'
+                 'X-Forwarded-For: 10.0.0.1\r\n'
+                 'Cookie: a=1\r\n'
+                 'x-forwarded-for:10.0.0.2  \r\n'
+                 'Cookie: b=2\r\n'
+                 'X_Ignored: 1\r\n'
+                 'X-Folded: first\r\n'
+                 '\tsecond\r\n'
+                 '\r\n')
+        read_http(fd, body='hello')
+        env = self.environ
+        self.assertEqual(env['REQUEST_METHOD'], 'POST')
+        self.assertEqual(env['PATH_INFO'], '/a')
+        self.assertEqual(env['QUERY_STRING'], 'b=c')
+        self.assertEqual(env['HTTP_HOST'], 'localhost')
+        self.assertEqual(env['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(env['CONTENT_LENGTH'], '0')
+        self.assertNotIn('HTTP_CONTENT_TYPE', env)
+        self.assertNotIn('HTTP_CONTENT_LENGTH', env)
+        self.assertEqual(env['HTTP_X_FORWARDED_FOR'], '10.0.0.1,10.0.0.2')
+        self.assertEqual(env['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertNotIn('HTTP_X_IGNORED', env)
+        self.assertEqual(env['HTTP_X_FOLDED'], 'first second')
+
+    def test_no_headers(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.0\r\n\r\n')
+        read_http(fd, body='hello')
+        self.assertNotIn('HTTP_HOST', self.environ)
+
+    def test_bare_lf(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\nHost: localhost\nX-Test: 1\n\n')
+        read_http(fd, body='hello')
+        self.assertEqual(self.environ['HTTP_X_TEST'], '1')
+
+    def test_headers_split_across_reads(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\nX-Te')
+        fd.flush()
+        gevent.sleep(0.05)
+        fd.write('st: 1\r\n\r\n')
+        read_http(fd, body='hello')
+        self.assertEqual(self.environ['HTTP_X_TEST'], '1')
+
+    def test_keepalive(self):
+        fd = self.makefile()
+        fd.write('GET /1 HTTP/1.1\r\nHost: localhost\r\n\r\n'
+                 'GET /2 HTTP/1.1\r\nHost: localhost\r\nX-Test: 2\r\n\r\n')
+        read_http(fd, body='hello')
+        read_http(fd, body='hello')
+        self.assertEqual(self.environ['PATH_INFO'], '/2')
+        self.assertEqual(self.environ['HTTP_X_TEST'], '2')
+
+    def test_invalid_header_line(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\nNoColon\r\n\r\n')
+        read_http(fd, code=400, reason='Bad Request', body='')
+
+    def test_invalid_header_message(self):
+        with self.assertRaises(pywsgi._InvalidClientRequest) as exc:
+            pywsgi._ParsedHeaders(['NoColon'])
+        self.assertEqual(str(exc.exception), "Invalid header line: 'NoColon'")
+
+        with self.assertRaises(pywsgi._InvalidClientRequest) as exc:
+            pywsgi._ParsedHeaders([' folded'])
+        self.assertEqual(str(exc.exception), "Invalid header continuation: ' folded'")
+
+    def test_too_many_headers(self):
+        self.server.max_header_count = 3
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\n' + 'X-Test: 1\r\n' * 4 + '\r\n')
+        read_http(fd, code=400, reason='Bad Request', body='')
+
+    def test_headers_too_large(self):
+        self.server.max_header_size = 64
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nX-Test: ' + 'x' * 64 + '\r\n\r\n')
+        read_http(fd, code=400, reason='Bad Request', body='')
+
+
+class TestResponseHeaderCaching(TestCase):
+    validator = None
+
+    @staticmethod
+    def application(env, start_response):
+        body = env['PATH_INFO'].encode('ascii')
+        start_response('200 OK', [['Content-Type', 'text/plain'],
+                                  ('X-Static', 'yes'),
+                                  ('Content-Length', str(len(body)))])
+        return [body]
+
+    def test_date_from_server(self):
+        self.assertIsNotNone(self.server._date)
+        self.assertFalse(self.server._date_timer.ref)
+        self.server._date = b'Sun, 06 Nov 1994 08:49:37 GMT'
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = read_http(fd, body='/')
+        response.assertHeader('Date', 'Sun, 06 Nov 1994 08:49:37 GMT')
+
+        self.server._update_date()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = read_http(fd, body='/')
+        self.assertNotEqual(response.headers['Date'], 'Sun, 06 Nov 1994 08:49:37 GMT')
+
+    def test_date_timer_stopped(self):
+        self.server.stop()
+        self.assertIsNone(self.server._date_timer)
+        self.assertIsNone(self.server._date)
+
+    def test_headers_cached(self):
+        encoded = []
+        class Handler(pywsgi.WSGIHandler):
+            def _encode_response_header(self, header, value):
+                encoded.append(header)
+                return pywsgi.WSGIHandler._encode_response_header(self, header, value)
+        self.server.handler_class = Handler
+
+        fd = self.makefile()
+        fd.write('GET /a HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = read_http(fd, body='/a')
+        response.assertHeader('Content-Type', 'text/plain')
+        response.assertHeader('X-Static', 'yes')
+        self.assertEqual(sorted(encoded), ['Content-Length', 'Content-Type', 'X-Static'])
+        del encoded[:]
+
+        # The Content-Length changes, but only it has to be checked
+        # and encoded again.
+        fd.write('GET /abc HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = read_http(fd, body='/abc')
+        response.assertHeader('Content-Length', '4')
+        response.assertHeader('X-Static', 'yes')
+        self.assertEqual(encoded, ['Content-Length'])
+
+        self.assertEqual(sorted(self.server._response_header_cache),
+                         [('Content-Type', 'text/plain'), ('X-Static', 'yes')])
+        self.assertEqual(list(self.server._response_status_cache), ['200 OK'])
+
+    def test_invalid_header_not_cached(self):
+        def application(env, start_response):
+            try:
+                start_response('200 OK', [('X-Bad', 'a\r\nb')])
+            except ValueError:
+                start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
+            return [b'']
+        self.server.application = application
+        fd = self.makefile()
+        for _ in range(2):
+            fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            read_http(fd, code=500)
+        self.assertNotIn(('X-Bad', 'a\r\nb'), self.server._response_header_cache)
+
+    def test_http_10_connection_close(self):
+        # The Connection header depends on the request, not just the
+        # cached response headers.
+        fd = self.makefile()
+        fd.write('GET /a HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = read_http(fd, body='/a')
+        self.assertNotIn('Connection', response.headers)
+        fd = self.makefile()
+        fd.write('GET /a HTTP/1.0\r\nHost: localhost\r\n\r\n')
+        read_http(fd, body='/a').assertHeader('Connection', 'close')
+
+    def test_headers_changed_after_start_response(self):
+        class Handler(pywsgi.WSGIHandler):
+            def finalize_headers(self):
+                self.response_headers[0] = (b'Content-Type', b'text/html')
+                pywsgi.WSGIHandler.finalize_headers(self)
+        self.server.handler_class = Handler
+        fd = self.makefile()
+        for _ in range(2):
+            fd.write('GET /a HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            read_http(fd, body='/a').assertHeader('Content-Type', 'text/html')
+
+
 del CommonTests
 
 if __name__ == '__main__':
@@ -267,6 +267,108 @@ class TestJoinableQueue(TestCase):
         self.assertEqual(0, channel.unfinished_tasks)
 
 
+class TestMany(TestCase):
+
+    def test_unbounded(self):
+        self.switch_expected = False
+        q = queue.Queue()
+        q.put_many(range(5))
+        self.assertEqual(q.get_many(3), [0, 1, 2])
+        self.assertEqual(q.get_many(10), [3, 4])
+        self.assertRaises(Empty, q.get_many, 10, block=False)
+        self.assertRaises(ValueError, q.get_many, 0)
+
+    def test_lifo(self):
+        self.switch_expected = False
+        q = queue.LifoQueue()
+        q.put_many([1, 2, 3])
+        self.assertEqual(q.get_many(2), [3, 2])
+
+    def test_get_many_waits(self):
+        q = queue.Queue()
+        g = gevent.spawn(q.get_many, 10)
+        gevent.sleep(0)
+        q.put_many([1, 2, 3])
+        self.assertEqual(g.get(), [1, 2, 3])
+
+    def test_get_many_timeout(self):
+        q = queue.Queue()
+        self.assertRaises(Empty, q.get_many, 10, timeout=0.01)
+
+    def test_maxsize(self):
+        q = queue.Queue(2)
+        got = []
+        def consume():
+            while len(got) < 5:
+                got.extend(q.get_many(10))
+                self.assertLessEqual(len(got), 5)
+        g = gevent.spawn(consume)
+        q.put_many(range(5))
+        g.get()
+        self.assertEqual(got, list(range(5)))
+
+    def test_maxsize_full(self):
+        q = queue.Queue(2)
+        self.assertRaises(Full, q.put_many, range(5), block=False)
+        self.assertEqual(q.get_many(10), [0, 1])
+
+        with self.assertRaises(Full):
+            q.put_many(range(5), timeout=0.01)
+        self.assertEqual(q.get_many(10), [0, 1])
+        # The timed-out put_many didn't leave anything waiting to put
+        # the rest, so the queue stays empty and has room for two.
+        gevent.sleep(0.01)
+        self.assertEqual(q.qsize(), 0)
+        q.put_nowait('a')
+        q.put_nowait('b')
+        self.assertRaises(Full, q.put_nowait, 'c')
+        self.assertEqual(q.get_many(10), ['a', 'b'])
+
+    def test_wakes_putters(self):
+        q = queue.Queue(2)
+        g = gevent.spawn(q.put_many, range(4))
+        gevent.sleep(0)
+        self.assertEqual(q.get_many(10), [0, 1])
+        self.assertEqual(q.get_many(10), [2, 3])
+        g.get()
+
+    def test_joinable(self):
+        self.switch_expected = False
+        q = queue.JoinableQueue()
+        q.put_many('abc')
+        self.assertEqual(q.unfinished_tasks, 3)
+        self.assertEqual(q.get_many(3), ['a', 'b', 'c'])
+        for _ in range(3):
+            q.task_done()
+        self.assertTrue(q.join(0))
+
+    def test_channel(self):
+        channel = queue.Channel()
+        g = gevent.spawn(channel.put_many, range(4))
+        gevent.sleep(0)
+        self.assertEqual(channel.get_many(3), [0, 1, 2])
+        self.assertFalse(g.ready())
+        self.assertEqual(channel.get_many(3), [3])
+        g.get()
+        self.assertFalse(channel.putters)
+
+    def test_channel_getters_first(self):
+        channel = queue.Channel()
+        getters = [gevent.spawn(channel.get) for _ in range(3)]
+        gevent.sleep(0)
+        channel.put_many('abc')
+        self.assertEqual([g.get() for g in getters], ['a', 'b', 'c'])
+
+    def test_channel_timeout(self):
+        channel = queue.Channel()
+        getter = gevent.spawn(channel.get)
+        gevent.sleep(0)
+        with self.assertRaises(Full):
+            channel.put_many('abc', timeout=0.01)
+        self.assertEqual(getter.get(), 'a')
+        self.assertFalse(channel.putters)
+
+
 class TestNoWait(TestCase):
 
     def test_put_nowait_simple(self):
@@ -0,0 +1,301 @@
+import os
+import socket
+
+import gevent
+import greentest
+
+from gevent import _config
+from gevent._config import config
+from gevent.event import Event
+from gevent.resolver import _SingleFlight
+from gevent.resolver.cache import Resolver
+from gevent.resolver.thread import Resolver as ThreadResolver
+
+
+class MockResolver(object):
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self.calls = 0
+        self.closed = False
+        self.error = None
+
+    def close(self):
+        self.closed = True
+
+    def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.%d' % self.calls, port))]
+
+    def gethostbyname(self, hostname):
+        self.calls += 1
+        return '10.0.0.%d' % self.calls
+
+
+class MockSlowResolver(MockResolver):
+
+    def __init__(self, ttl=None):
+        MockResolver.__init__(self, ttl)
+        self.event = Event()
+
+    def getaddrinfo(self, *args):
+        self.event.wait()
+        return MockResolver.getaddrinfo(self, *args)
+
+
+class MockTTLResolver(MockResolver):
+
+    def getaddrinfo_ttl(self, *args):
+        return self.getaddrinfo(*args), self.ttl
+
+
+class TestCache(greentest.TestCase):
+
+    def _makeOne(self, backend=None, **kwargs):
+        kwargs.setdefault('min_ttl', 0.001)
+        kwargs.setdefault('max_ttl', 60)
+        kwargs.setdefault('negative_ttl', 60)
+        kwargs.setdefault('stale_ttl', None)
+        return Resolver(backend or MockResolver(), **kwargs)
+
+    def test_hit(self):
+        resolver = self._makeOne()
+        first = resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.getaddrinfo('example.com', 80), first)
+        self.assertEqual(resolver.resolver.calls, 1)
+        self.assertEqual(resolver.getaddrinfo('example.com', 443)[0][4][1], 443)
+        self.assertEqual(resolver.resolver.calls, 2)
+        stats = resolver.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['entries'], 2)
+
+    def test_gethostbyname_passes_args(self):
+        resolver = self._makeOne()
+        self.assertEqual(resolver.gethostbyname('example.com'), '10.0.0.1')
+        self.assertEqual(resolver.gethostbyname('example.com'), '10.0.0.1')
+
+    def test_max_ttl_without_backend_ttl(self):
+        resolver = self._makeOne(max_ttl=0.01)
+        resolver.getaddrinfo('example.com', 80)
+        gevent.sleep(0.02)
+        resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_backend_ttl(self):
+        resolver = self._makeOne(MockTTLResolver(ttl=0.01))
+        resolver.getaddrinfo('example.com', 80)
+        resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 1)
+        gevent.sleep(0.02)
+        resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_min_ttl(self):
+        resolver = self._makeOne(MockTTLResolver(ttl=0), min_ttl=60)
+        resolver.getaddrinfo('example.com', 80)
+        resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 1)
+
+    def test_maxsize(self):
+        resolver = self._makeOne(maxsize=2)
+        resolver.getaddrinfo('a', 80)
+        resolver.getaddrinfo('b', 80)
+        resolver.getaddrinfo('a', 80)
+        resolver.getaddrinfo('c', 80)
+        # 'b' was least recently used.
+        self.assertEqual(resolver.stats()['evictions'], 1)
+        resolver.getaddrinfo('a', 80)
+        self.assertEqual(resolver.resolver.calls, 3)
+        resolver.getaddrinfo('b', 80)
+        self.assertEqual(resolver.resolver.calls, 4)
+
+    def test_negative(self):
+        resolver = self._makeOne()
+        resolver.resolver.error = socket.gaierror(socket.EAI_NONAME, 'nope')
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror) as exc:
+                resolver.getaddrinfo('example.com', 80)
+            self.assertEqual(exc.exception.args, (socket.EAI_NONAME, 'nope'))
+        self.assertEqual(resolver.resolver.calls, 1)
+        self.assertEqual(resolver.stats()['negative_hits'], 1)
+
+    def test_negative_disabled(self):
+        resolver = self._makeOne(negative_ttl=None)
+        resolver.resolver.error = socket.gaierror(socket.EAI_NONAME, 'nope')
+        for _ in range(2):
+            self.assertRaises(socket.gaierror, resolver.getaddrinfo, 'example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_other_errors_not_cached(self):
+        resolver = self._makeOne()
+        resolver.resolver.error = ValueError()
+        for _ in range(2):
+            self.assertRaises(ValueError, resolver.getaddrinfo, 'example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_stale_while_revalidate(self):
+        resolver = self._makeOne(max_ttl=0.01, stale_ttl=60)
+        first = resolver.getaddrinfo('example.com', 80)
+        gevent.sleep(0.02)
+        self.assertEqual(resolver.getaddrinfo('example.com', 80), first)
+        self.assertEqual(resolver.getaddrinfo('example.com', 80), first)
+        self.assertEqual(resolver.stats()['stale_hits'], 2)
+        gevent.sleep(0)
+        # Refreshed once in the background.
+        self.assertEqual(resolver.resolver.calls, 2)
+        self.assertNotEqual(resolver.getaddrinfo('example.com', 80), first)
+
+    def test_unhashable(self):
+        resolver = self._makeOne()
+        resolver.getaddrinfo(bytearray(b'example.com'), 80)
+        resolver.getaddrinfo(bytearray(b'example.com'), 80)
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_close(self):
+        resolver = self._makeOne()
+        resolver.close()
+        self.assertTrue(resolver.resolver.closed)
+
+    def test_concurrent_misses_coalesced(self):
+        resolver = self._makeOne(MockSlowResolver())
+        greenlets = [gevent.spawn(resolver.getaddrinfo, 'example.com', 80)
+                     for _ in range(5)]
+        gevent.sleep(0)
+        resolver.resolver.event.set()
+        gevent.joinall(greenlets, raise_error=True)
+        self.assertEqual(resolver.resolver.calls, 1)
+        self.assertEqual(len(set(repr(g.value) for g in greenlets)), 1)
+        self.assertEqual(resolver.stats()['coalesced'], 4)
+
+
+class TestConfiguredTTL(greentest.TestCase):
+
+    def setUp(self):
+        super(TestConfiguredTTL, self).setUp()
+        self._old = (config.resolver_cache_min_ttl, config.resolver_cache_max_ttl)
+
+    def tearDown(self):
+        config.resolver_cache_min_ttl, config.resolver_cache_max_ttl = self._old
+        super(TestConfiguredTTL, self).tearDown()
+
+    def test_zero_min_ttl(self):
+        config.resolver_cache_min_ttl = 0
+        self.assertEqual(config.resolver_cache_min_ttl, 0)
+        resolver = Resolver(MockTTLResolver(ttl=60))
+        self.assertEqual(resolver.min_ttl, 0)
+        resolver.getaddrinfo('example.com', 80)
+        resolver.getaddrinfo('example.com', 80)
+        self.assertEqual(resolver.resolver.calls, 1)
+
+    def test_zero_max_ttl(self):
+        config.resolver_cache_max_ttl = 0
+        self.assertEqual(config.resolver_cache_max_ttl, 0)
+        resolver = Resolver(MockResolver())
+        resolver.getaddrinfo('example.com', 80)
+        resolver.getaddrinfo('example.com', 80)
+        # Nothing is kept.
+        self.assertEqual(resolver.resolver.calls, 2)
+
+    def test_env_zero(self):
+        setting = _config.ResolverCacheMinTTL()
+        os.environ[setting.environment_key] = '0'
+        try:
+            self.assertEqual(setting.get(), 0)
+        finally:
+            del os.environ[setting.environment_key]
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            config.resolver_cache_max_ttl = -1
+        with self.assertRaises(ValueError):
+            config.resolver_cache_max_ttl = None
+
+
+class TestSingleFlight(greentest.TestCase):
+
+    def _call_all(self, func, count=5):
+        single_flight = _SingleFlight()
+        greenlets = [gevent.spawn(single_flight, 'key', func)
+                     for _ in range(count)]
+        gevent.joinall(greenlets)
+        return single_flight, greenlets
+
+    def test_shared_result(self):
+        calls = []
+        def func():
+            calls.append(1)
+            gevent.sleep(0.01)
+            return object()
+
+        single_flight, greenlets = self._call_all(func)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(id(g.value) for g in greenlets)), 1)
+        self.assertEqual(single_flight.coalesced, 4)
+        self.assertEqual(single_flight._calls, {})
+
+    def test_shared_exception(self):
+        calls = []
+        def func():
+            calls.append(1)
+            gevent.sleep(0.01)
+            raise socket.gaierror(socket.EAI_NONAME, 'nope')
+
+        _, greenlets = self._call_all(func)
+        self.assertEqual(len(calls), 1)
+        for g in greenlets:
+            self.assertIsInstance(g.exception, socket.gaierror)
+            self.assertEqual(g.exception.args, (socket.EAI_NONAME, 'nope'))
+        # Each greenlet got its own exception object.
+        self.assertEqual(len(set(id(g.exception) for g in greenlets)), 5)
+    # The greenlets are expected to die with the error.
+    test_shared_exception.error_fatal = False
+
+    def test_leader_killed(self):
+        calls = []
+        def func():
+            calls.append(1)
+            gevent.sleep(0.01)
+            return len(calls)
+
+        single_flight = _SingleFlight()
+        leader = gevent.spawn(single_flight, 'key', func)
+        gevent.sleep(0)
+        follower = gevent.spawn(single_flight, 'key', func)
+        gevent.sleep(0)
+        leader.kill()
+        self.assertEqual(follower.get(), 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_sequential_not_coalesced(self):
+        single_flight = _SingleFlight()
+        self.assertEqual(single_flight('key', lambda: 1), 1)
+        self.assertEqual(single_flight('key', lambda: 2), 2)
+        self.assertEqual(single_flight.coalesced, 0)
+
+
+class TestThreadResolverSingleFlight(greentest.TestCase):
+
+    def test_concurrent_lookups_use_one_thread(self):
+        resolver = ThreadResolver()
+        real_apply = resolver.pool.apply
+        calls = []
+        def apply(func, args, kwargs=None):
+            calls.append(args)
+            return real_apply(func, args, kwargs)
+        resolver.pool = self
+        self.apply = apply
+
+        greenlets = [gevent.spawn(resolver.getaddrinfo, 'localhost', 80)
+                     for _ in range(10)]
+        greenlets.append(gevent.spawn(resolver.getaddrinfo, 'localhost', 81))
+        gevent.joinall(greenlets, raise_error=True)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(greenlets[0].value, greenlets[1].value)
+        self.assertIsNot(greenlets[0].value, greenlets[1].value)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -3,6 +3,7 @@ import sys
 import os
 import errno
 from gevent import select, socket
+import gevent
 import gevent.core
 import greentest
 import greentest.timing
@@ -87,6 +88,118 @@ class TestPollRead(greentest.timing.AbstractGenericWaitTestCase):
             result = poll.poll(0)
             self.assertEqual(result, [(fd, select.POLLNVAL)]) # pylint:disable=no-member
 
+@unittest.skipUnless(hasattr(select, 'epoll'), "Needs epoll")
+class TestEpollRead(greentest.timing.AbstractGenericWaitTestCase):
+    def wait(self, timeout):
+        r, w = os.pipe()
+        try:
+            ep = select.epoll()
+            ep.register(r, select.EPOLLIN)
+            ep.poll(timeout)
+        finally:
+            ep.close()
+            os.close(r)
+            os.close(w)
+
+
+@unittest.skipUnless(hasattr(select, 'epoll'), "Needs epoll")
+class TestEpoll(greentest.TestCase):
+
+    def setUp(self):
+        super(TestEpoll, self).setUp()
+        self.r, self.w = os.pipe()
+        self.ep = select.epoll()
+
+    def tearDown(self):
+        self.ep.close()
+        os.close(self.r)
+        os.close(self.w)
+        super(TestEpoll, self).tearDown()
+
+    def test_register_twice(self):
+        self.ep.register(self.r, select.EPOLLIN)
+        with self.assertRaises(IOError) as exc:
+            self.ep.register(self.r, select.EPOLLIN)
+        self.assertEqual(exc.exception.errno, errno.EEXIST)
+
+    def test_unregister_never_registered(self):
+        with self.assertRaises(IOError) as exc:
+            self.ep.unregister(self.r)
+        self.assertEqual(exc.exception.errno, errno.ENOENT)
+
+    def test_ready_repeatedly(self):
+        self.ep.register(self.r, select.EPOLLIN)
+        self.assertEqual(self.ep.poll(0), [])
+        os.write(self.w, b'x')
+        # Still ready on the next call until it is read.
+        self.assertEqual(self.ep.poll(1), [(self.r, select.EPOLLIN)])
+        self.assertEqual(self.ep.poll(1), [(self.r, select.EPOLLIN)])
+        os.read(self.r, 1)
+        self.assertEqual(self.ep.poll(0.01), [])
+
+    def test_modify(self):
+        self.ep.register(self.w, select.EPOLLIN)
+        self.assertEqual(self.ep.poll(0.01), [])
+        self.ep.modify(self.w, select.EPOLLOUT)
+        self.assertEqual(self.ep.poll(1), [(self.w, select.EPOLLOUT)])
+
+    def test_oneshot(self):
+        self.ep.register(self.w, select.EPOLLOUT | select.EPOLLONESHOT)
+        self.assertEqual(self.ep.poll(1), [(self.w, select.EPOLLOUT)])
+        self.assertEqual(self.ep.poll(0.01), [])
+        self.ep.modify(self.w, select.EPOLLOUT)
+        self.assertEqual(self.ep.poll(1), [(self.w, select.EPOLLOUT)])
+
+    def test_closed(self):
+        self.ep.close()
+        self.assertTrue(self.ep.closed)
+        self.assertRaises(ValueError, self.ep.poll, 0)
+
+    def test_idle_doesnt_keep_loop_alive(self):
+        self.ep.register(self.r, select.EPOLLIN)
+        watchers = self.ep._watchers
+        self.assertFalse(watchers._watchers[self.r].ref)
+        self.assertFalse(watchers._keepalive.ref)
+
+        poller = gevent.spawn(self.ep.poll)
+        gevent.sleep(0)
+        # While someone is waiting, the loop has to keep running.
+        self.assertTrue(watchers._keepalive.ref)
+        os.write(self.w, b'x')
+        self.assertEqual(poller.get(), [(self.r, select.EPOLLIN)])
+        self.assertFalse(watchers._keepalive.ref)
+
+
+try:
+    import selectors
+    from gevent.selectors import GeventSelector
+except ImportError:
+    GeventSelector = None
+
+@unittest.skipIf(GeventSelector is None, "Needs selectors")
+@greentest.skipOnWindows("Cant select on pipes")
+class TestGeventSelector(greentest.TestCase):
+
+    def test_select(self):
+        r, w = os.pipe()
+        sel = GeventSelector()
+        try:
+            key = sel.register(r, selectors.EVENT_READ, 'data')
+            self.assertEqual(sel.select(0.01), [])
+            os.write(w, b'x')
+            self.assertEqual(sel.select(1), [(key, selectors.EVENT_READ)])
+            self.assertEqual(sel.select(1), [(key, selectors.EVENT_READ)])
+            sel.unregister(r)
+            self.assertEqual(sel.select(0.01), [])
+            sel.register(r, selectors.EVENT_READ)
+            self.assertFalse(sel._watchers._watchers[r].ref)
+            self.assertFalse(sel._watchers._keepalive.ref)
+        finally:
+            sel.close()
+            os.close(r)
+            os.close(w)
+
+
 class TestSelectTypes(greentest.TestCase):
 
     def test_int(self):
@@ -2,12 +2,15 @@ from __future__ import print_function, division
 import unittest
 import errno
 import os
+import signal
+import sys
 
 
 import greentest
 from greentest import PY3
 from greentest import DEFAULT_SOCKET_TIMEOUT as _DEFAULT_SOCKET_TIMEOUT
 from gevent import socket
+from gevent import subprocess
 import gevent
 from gevent.server import StreamServer
 
@@ -437,6 +440,73 @@ class TestNoneSpawn(TestCase):
         self.assert_error(AssertionError, 'Impossible to call blocking function in the event loop callback')
 
 
+class AdaptiveStreamServer(StreamServer):
+    adaptive_accept = True
+
+
+class AdaptiveSimpleStreamServer(SimpleStreamServer):
+    adaptive_accept = True
+
+
+class AdaptiveSettings(Settings):
+    ServerClass = AdaptiveStreamServer
+    ServerSubClass = AdaptiveSimpleStreamServer
+
+
+class TestAdaptiveAccept(TestDefaultSpawn):
+    Settings = AdaptiveSettings
+
+    def _connect(self, count):
+        import socket as stdlib_socket
+        # Blocking connects complete (into the backlog) without
+        # letting the server run.
+        clients = []
+        for _ in range(count):
+            client = stdlib_socket.socket()
+            client.settimeout(_DEFAULT_SOCKET_TIMEOUT)
+            client.connect(self.server.address)
+            clients.append(client)
+            self._close_on_teardown(client)
+        return clients
+
+    def _wait_for_accepts(self, count):
+        with gevent.Timeout(_DEFAULT_SOCKET_TIMEOUT):
+            while self.server.accept_count < count:
+                gevent.sleep(0.01)
+
+    def test_batch_adapts(self):
+        handled = []
+        listener = self.get_listener()
+        listener.listen(50)
+        self.server = self.ServerClass(listener,
+                                       lambda sock, _addr: handled.append(sock))
+        self.server.start()
+
+        for i in range(3):
+            self._connect(1)
+            self._wait_for_accepts(i + 1)
+        self.assertEqual(self.server._accept_batch, 1)
+        self.assertEqual(self.server.accept_errors, 0)
+
+        self._connect(20)
+        self._wait_for_accepts(23)
+        self.assertGreater(self.server.accept_saturated, 0)
+        self.assertGreater(self.server.accept_wakeups, 4)
+        self.assertLessEqual(self.server.accept_wakeups, 23)
+        gevent.sleep(0.01)
+        self.assertEqual(len(handled), 23)
+        for sock in handled:
+            self.assertIsInstance(sock, socket.socket)
+
+
+class TestAdaptiveAcceptPoolSpawn(TestPoolSpawn):
+    Settings = AdaptiveSettings
+
+
+class TestAdaptiveAcceptNoneSpawn(TestNoneSpawn):
+    Settings = AdaptiveSettings
+
+
 class ExpectedError(Exception):
     pass
 
@@ -505,6 +575,92 @@ class TestSSLGetCertificate(TestCase):
         with self.assertRaises(BadWrapException):
             self.server._handle(None, None)
 
+_WORKERS_SCRIPT = """
+import os
+import signal
+import sys
+
+import gevent
+from gevent.server import StreamServer
+
+def handle(sock, _address):
+    sock.sendall(str(os.getpid()).encode('ascii'))
+
+server = StreamServer(('127.0.0.1', int(sys.argv[1])), handle)
+server.reuse_port = sys.argv[2] == 'reuse'
+gevent.signal_handler(signal.SIGTERM, server.stop)
+server.serve_forever(workers=2)
+"""
+
+
+@greentest.skipOnWindows("Uses fork")
+class TestWorkers(greentest.TestCase):
+    __timeout__ = greentest.LARGE_TIMEOUT
+    reuse_port = True
+
+    def _get_port(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        return port
+
+    def _ask_pid(self, port):
+        # Until a worker answers; a worker may be starting or dying.
+        for _ in range(100):
+            try:
+                sock = socket.create_connection(('127.0.0.1', port))
+                try:
+                    data = sock.recv(100)
+                finally:
+                    sock.close()
+            except socket.error:
+                data = None
+            if data:
+                return int(data)
+            gevent.sleep(0.05)
+        self.fail("No worker answered")
+
+    def _pid_exists(self, pid):
+        try:
+            os.kill(pid, 0)
+        except OSError as ex:
+            if ex.errno == errno.ESRCH:
+                return False
+            raise
+        return True
+
+    def test_workers(self):
+        port = self._get_port()
+        popen = subprocess.Popen([sys.executable, '-c', _WORKERS_SCRIPT, str(port),
+                                  'reuse' if self.reuse_port else 'shared'])
+        try:
+            pids = set(self._ask_pid(port) for _ in range(40))
+            self.assertNotIn(popen.pid, pids)
+            if self.reuse_port:
+                # The kernel balances between them.
+                self.assertEqual(len(pids), 2)
+
+            # Crashed workers are replaced.
+            for pid in pids:
+                os.kill(pid, signal.SIGKILL)
+            new_pid = self._ask_pid(port)
+            while new_pid in pids:
+                new_pid = self._ask_pid(port)
+        except:
+            popen.kill()
+            popen.wait()
+            raise
+
+        # Stopping the supervisor stops the workers.
+        popen.send_signal(signal.SIGTERM)
+        self.assertEqual(popen.wait(greentest.LARGE_TIMEOUT), 0)
+        self.assertFalse(self._pid_exists(new_pid))
+
+
+class TestWorkersSharedListener(TestWorkers):
+    reuse_port = False
+
 # test non-socket.error exception in accept call: fatal
 # test error in spawn(): non-fatal
 # test error in spawned handler: non-fatal
@@ -0,0 +1,158 @@
+import errno
+import unittest
+
+from gevent import socket
+from gevent import _mmsg
+from gevent.event import Event
+from gevent.server import DatagramServer
+import greentest
+
+
+class TestDatagramServer(greentest.TestCase):
+
+    use_mmsg = True
+    host = '127.0.0.1'
+    family = socket.AF_INET
+
+    def _start(self, handle, **attrs):
+        server = DatagramServer((self.host, 0), handle)
+        server._use_mmsg = self.use_mmsg and _mmsg.available
+        for name, value in attrs.items():
+            setattr(server, name, value)
+        server.start()
+        self.addCleanup(server.close)
+        client = socket.socket(self.family, socket.SOCK_DGRAM)
+        self.addCleanup(client.close)
+        # So getsockname() matches the address the server sees.
+        client.bind((self.host, 0))
+        return server, client
+
+    def test_handle_each(self):
+        received = []
+        done = Event()
+
+        def handle(data, address):
+            received.append(data)
+            server.sendto(data.upper(), address)
+            done.set()
+
+        server, client = self._start(handle)
+        client.sendto(b'ping', server.address)
+        self.assertEqual(client.recv(100), b'PING')
+        done.wait(1)
+        self.assertEqual(received, [b'ping'])
+
+    def test_batches(self):
+        batches = []
+        done = Event()
+
+        def handle(datagrams):
+            batches.append(datagrams)
+            server.sendmany((data.upper(), address) for data, address in datagrams)
+            if sum(len(b) for b in batches) == 10:
+                done.set()
+
+        server, client = self._start(handle, batch_size=4)
+        # Send them all before the server gets a chance to read.
+        for i in range(10):
+            client.sendto(('ping%d' % i).encode('ascii'), server.address)
+        done.wait(1)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+        self.assertEqual([data for b in batches for data, _ in b],
+                         [('ping%d' % i).encode('ascii') for i in range(10)])
+        self.assertEqual(set(address for b in batches for _, address in b),
+                         {client.getsockname()})
+        if self.use_mmsg and _mmsg.available:
+            self.assertIsNotNone(server._receiver)
+        else:
+            self.assertIsNone(server._receiver)
+        self.assertEqual([client.recv(100) for _ in range(10)],
+                         [('PING%d' % i).encode('ascii') for i in range(10)])
+
+    def test_batch_truncates(self):
+        received = []
+        done = Event()
+
+        def handle(datagrams):
+            received.extend(data for data, _ in datagrams)
+            done.set()
+
+        server, client = self._start(handle, batch_size=4, max_datagram_size=4)
+        client.sendto(b'abcdefgh', server.address)
+        done.wait(1)
+        self.assertEqual(received, [b'abcd'])
+
+    def test_sendmany(self):
+        server, client = self._start(lambda *args: None)
+        address = client.getsockname()
+        datagrams = [(('d%d' % i).encode('ascii'), address) for i in range(5)]
+        # A bytearray, and an address that has to be resolved by sendto.
+        datagrams.insert(2, (bytearray(b'array'), address))
+        datagrams.insert(4, (b'named', ('localhost',) + address[1:]))
+        server.sendmany(iter(datagrams))
+        self.assertEqual([client.recv(100) for _ in datagrams],
+                         [bytes(data) for data, _ in datagrams])
+
+
+class TestDatagramServerWithoutMMsg(TestDatagramServer):
+    use_mmsg = False
+
+
+@unittest.skipUnless(socket.has_ipv6, "Needs IPv6")
+class TestDatagramServerIPv6(TestDatagramServer):
+    host = '::1'
+    family = socket.AF_INET6
+
+    def test_sendmany(self):
+        server, client = self._start(lambda *args: None)
+        address = client.getsockname()
+        datagrams = [(b'one', address), (b'two', address[:2])]
+        server.sendmany(datagrams)
+        self.assertEqual([client.recv(100) for _ in datagrams], [b'one', b'two'])
+
+
+@unittest.skipUnless(_mmsg.available, "Needs recvmmsg")
+class TestMMsg(greentest.TestCase):
+
+    def setUp(self):
+        super(TestMMsg, self).setUp()
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(('127.0.0.1', 0))
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sender.bind(('127.0.0.1', 0))
+
+    def tearDown(self):
+        self.receiver.close()
+        self.sender.close()
+        super(TestMMsg, self).tearDown()
+
+    def test_recv_nothing_waiting(self):
+        self.assertEqual(_mmsg.Receiver(4, 100).recv(self.receiver.fileno()), [])
+
+    def test_send_and_recv(self):
+        address = self.receiver.getsockname()
+        datagrams = [(b'x' * i, address) for i in range(1, 7)]
+        self.assertEqual(_mmsg.sendmmsg(self.sender.fileno(), socket.AF_INET, datagrams, 1), 5)
+        received = _mmsg.Receiver(4, 3).recv(self.receiver.fileno())
+        # Truncated to the size of the slots.
+        self.assertEqual(received,
+                         [(b'xx', self.sender.getsockname()),
+                          (b'xxx', self.sender.getsockname()),
+                          (b'xxx', self.sender.getsockname()),
+                          (b'xxx', self.sender.getsockname())])
+        self.assertEqual(len(_mmsg.Receiver(4, 10).recv(self.receiver.fileno())), 1)
+
+    def test_send_unencodable(self):
+        datagrams = [(b'x', ('localhost', 1))]
+        self.assertEqual(_mmsg.sendmmsg(self.sender.fileno(), socket.AF_INET, datagrams), 0)
+
+    def test_recv_error(self):
+        fileno = self.receiver.fileno()
+        self.receiver.close()
+        with self.assertRaises(socket.error) as exc:
+            _mmsg.Receiver(4, 10).recv(fileno)
+        self.assertEqual(exc.exception.errno, errno.EBADF)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -6,8 +6,10 @@ import array
 import socket
 import traceback
 import time
+import tempfile
 import unittest
 import greentest
+import gevent
 from functools import wraps
 from greentest import six
 from greentest import LARGE_TIMEOUT
@@ -84,7 +86,7 @@ class TestTCP(greentest.TestCase):
         return self._close_on_teardown(sock)
 
     def _test_sendall(self, data, match_data=None, client_method='sendall',
-                      **client_args):
+                      offset=None, count=None, **client_args):
 
         read_data = []
         server_exc_info = []
@@ -107,8 +109,11 @@ class TestTCP(greentest.TestCase):
         server = Thread(target=accept_and_read)
         client = self.create_connection(**client_args)
 
+        method_args = ()
+        if offset is not None:
+            method_args = (offset, count)
         try:
-            getattr(client, client_method)(data)
+            getattr(client, client_method)(data, *method_args)
         finally:
             client.shutdown(socket.SHUT_RDWR)
             client.close()
@@ -132,6 +137,17 @@ class TestTCP(greentest.TestCase):
         data = array.array("B", self.long_data)
         self._test_sendall(data)
 
+    def test_sendall_vectored(self):
+        data = self.long_data
+        self._test_sendall([data[:10], bytearray(data[10:1000]), b'', memoryview(data)[1000:]],
+                           client_method='sendall_vectored')
+
+    def test_sendall_vectored_many_buffers(self):
+        # More buffers than fit in one call, with partial writes.
+        data = self.long_data * 20
+        self._test_sendall([data[i:i + 50] for i in range(0, len(data), 50)],
+                           data, client_method='sendall_vectored')
+
     def test_sendall_empty(self):
         data = b''
         self._test_sendall(data, data)
@@ -154,6 +170,33 @@ class TestTCP(greentest.TestCase):
         data = b''
         self._test_sendall(data, data, client_method='send')
 
+    def _make_file(self, data):
+        f = tempfile.TemporaryFile()
+        self._close_on_teardown(f)
+        f.write(data)
+        f.seek(0)
+        return f
+
+    @unittest.skipUnless(hasattr(socket.socket, 'sendfile'), "Needs socket.sendfile")
+    def test_sendfile(self):
+        f = self._make_file(self.long_data)
+        self._test_sendall(f, client_method='sendfile')
+        self.assertEqual(f.tell(), len(self.long_data))
+
+    @unittest.skipUnless(hasattr(socket.socket, 'sendfile'), "Needs socket.sendfile")
+    def test_sendfile_offset_count(self):
+        f = self._make_file(self.long_data)
+        self._test_sendall(f, self.long_data[10:5010],
+                           client_method='sendfile', offset=10, count=5000)
+        self.assertEqual(f.tell(), 5010)
+
+    @unittest.skipUnless(hasattr(os, 'sendfile') and hasattr(socket.socket, 'sendfile'),
+                         "Needs os.sendfile")
+    def test_sendfile_uses_os_sendfile(self):
+        # A regular file on a plain socket doesn't fall back to send().
+        f = self._make_file(self.long_data)
+        self._test_sendall(f, client_method='_sendfile_use_sendfile')
+
     def test_fullduplex(self):
         N = 100000
 
@@ -405,6 +448,97 @@ class TestCreateConnection(greentest.TestCase):
             gsocket.socket = orig_socket
             gsocket.getaddrinfo = orig_getaddrinfo
 
+    def _happy_eyeballs(self, delays, happy_eyeballs_delay=0.05, interrupt=None):
+        # *delays* maps each address to how long its connect() takes,
+        # and whether it then succeeds. Just as the connect() to
+        # *interrupt* succeeds, the caller is interrupted.
+        caller = gevent.getcurrent()
+
+        class MockSocket(object):
+
+            created = []
+
+            def __init__(self, *_):
+                self.closed = False
+                self.address = None
+                MockSocket.created.append(self)
+
+            def connect(self, address):
+                self.address = address
+                delay, ok = delays[address]
+                time.sleep(delay)
+                if not ok:
+                    raise socket.error(address)
+                if address == interrupt:
+                    gevent.kill(caller, gevent.Timeout)
+
+            def close(self):
+                self.closed = True
+
+        def mockgetaddrinfo(*_):
+            return [(socket.AF_INET6, 1, 6, '', 'v6-1'),
+                    (socket.AF_INET6, 1, 6, '', 'v6-2'),
+                    (socket.AF_INET, 1, 6, '', 'v4-1')]
+
+        import gevent.socket as gsocket
+        orig_socket = gsocket.socket
+        orig_getaddrinfo = gsocket.getaddrinfo
+        try:
+            gsocket.socket = MockSocket
+            gsocket.getaddrinfo = mockgetaddrinfo
+            try:
+                sock = gsocket.create_connection(
+                    ('host', 'port'),
+                    happy_eyeballs_delay=happy_eyeballs_delay)
+            except (socket.error, gevent.Timeout) as ex:
+                sock = ex
+            return sock, MockSocket.created
+        finally:
+            gsocket.socket = orig_socket
+            gsocket.getaddrinfo = orig_getaddrinfo
+
+    def test_happy_eyeballs_unreachable_v6(self):
+        sock, created = self._happy_eyeballs({
+            'v6-1': (5, True),
+            'v4-1': (0.01, True),
+            'v6-2': (5, True),
+        })
+        self.assertEqual(sock.address, 'v4-1')
+        self.assertFalse(sock.closed)
+        # The families were interleaved, and the first attempt was
+        # abandoned before the third started.
+        self.assertEqual([s.address for s in created], ['v6-1', 'v4-1'])
+        self.assertTrue(created[0].closed)
+
+    def test_happy_eyeballs_failure_starts_next(self):
+        sock, created = self._happy_eyeballs({
+            'v6-1': (0, False),
+            'v4-1': (0, False),
+            'v6-2': (0, True),
+        }, happy_eyeballs_delay=30)
+        self.assertEqual(sock.address, 'v6-2')
+        self.assertEqual(len(created), 3)
+
+    def test_happy_eyeballs_all_fail(self):
+        result, created = self._happy_eyeballs({
+            'v6-1': (0, False),
+            'v4-1': (0.01, False),
+            'v6-2': (0, False),
+        })
+        self.assertIsInstance(result, socket.error)
+        self.assertTrue(all(s.closed for s in created))
+
+    def test_happy_eyeballs_interrupted_after_connect(self):
+        result, created = self._happy_eyeballs({
+            'v6-1': (5, True),
+            'v4-1': (0.01, True),
+            'v6-2': (5, True),
+        }, interrupt='v4-1')
+        self.assertIsInstance(result, gevent.Timeout)
+        # Including the one that connected.
+        self.assertEqual(len(created), 2)
+        self.assertTrue(all(s.closed for s in created))
+
 class TestFunctions(greentest.TestCase):
 
     @greentest.ignores_leakcheck
@@ -435,8 +569,26 @@ class TestFunctions(greentest.TestCase):
             exclude.append('gethostbyname')
             exclude.append('gethostbyname_ex')
             exclude.append('gethostbyaddr')
+        # This takes an extra argument; checked below.
+        exclude.append('create_connection')
         self.assertMonkeyPatchedFuncSignatures('socket', exclude=exclude)
 
+    def test_create_connection_signature(self):
+        # The standard arguments come first, with the same defaults,
+        # followed by our optional extras.
+        # pylint:disable=deprecated-method
+        import inspect
+        import warnings
+        import gevent.socket as gsocket
+        from gevent.monkey import get_original
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            sig = inspect.getargspec(get_original('socket', 'create_connection'))
+            gevent_sig = inspect.getargspec(gsocket.create_connection)
+        self.assertEqual(gevent_sig.args[:len(sig.args)], sig.args)
+        self.assertEqual(gevent_sig.defaults[:len(sig.defaults)], sig.defaults)
+        self.assertEqual(gevent_sig.args[len(sig.args):], ['happy_eyeballs_delay'])
+
 
 class TestSocket(greentest.TestCase):
 
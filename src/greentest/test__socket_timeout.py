@@ -50,5 +50,75 @@ class Test(greentest.TestCase):
         self.assertEqual(str(ex), 'timed out')
 
 
+class TestReusedTimer(greentest.TestCase):
+
+    def setUp(self):
+        super(TestReusedTimer, self).setUp()
+        self.a, self.b = socket.socketpair()
+        self._close_on_teardown(self.a)
+        self._close_on_teardown(self.b)
+        self.a.settimeout(0.1)
+
+    def test_timer_reused(self):
+        self.b.sendall(b'x')
+        self.a.recv(1)
+        # Data was waiting, so we never blocked.
+        self.assertIsNone(self.a._wait_timer)
+
+        reader = gevent.spawn(self.a.recv, 1)
+        gevent.sleep(0)
+        timer = self.a._wait_timer
+        self.assertIsNotNone(timer)
+        self.b.sendall(b'y')
+        self.assertEqual(reader.get(), b'y')
+        self.assertFalse(timer.active)
+
+        reader = gevent.spawn(self.a.recv, 1)
+        gevent.sleep(0)
+        self.assertIs(self.a._wait_timer, timer)
+        self.b.sendall(b'z')
+        self.assertEqual(reader.get(), b'z')
+
+    def test_full_timeout_after_expiring(self):
+        with self.assertRaises(socket.timeout):
+            self.a.recv(1)
+        timer = self.a._wait_timer
+
+        # The expired timer must be re-armed from now, not fire at once.
+        reader = gevent.spawn(self.a.recv, 1)
+        gevent.sleep(0.01)
+        self.assertFalse(reader.ready())
+        self.b.sendall(b'x')
+        self.assertEqual(reader.get(), b'x')
+        self.assertIs(self.a._wait_timer, timer)
+
+    def test_changed_timeout(self):
+        with self.assertRaises(socket.timeout):
+            self.a.recv(1)
+        timer = self.a._wait_timer
+        self.a.settimeout(0.01)
+        with self.assertRaises(socket.timeout):
+            self.a.recv(1)
+        self.assertIsNot(self.a._wait_timer, timer)
+
+    def test_concurrent_directions(self):
+        # A reader holds the socket's timer; a writer blocked at the
+        # same time must still time out on its own.
+        reader = gevent.spawn(self.a.recv, 1)
+        gevent.sleep(0)
+        self.a.settimeout(0.02)
+        with self.assertRaises(socket.timeout):
+            while True:
+                self.a.send(b'x' * 65536)
+        self.b.sendall(b'y')
+        self.assertEqual(reader.get(), b'y')
+
+    def test_close_releases_timer(self):
+        with self.assertRaises(socket.timeout):
+            self.a.recv(1)
+        self.a.close()
+        self.assertIsNone(self.a._wait_timer)
+
+
 if __name__ == '__main__':
     greentest.main()
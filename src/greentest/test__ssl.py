@@ -88,6 +88,10 @@ class TestSSL(test__socket.TestTCP):
         # Override; doesn't work with SSL sockets.
         pass
 
+    def test_sendfile_uses_os_sendfile(self):
+        # Override; os.sendfile() would bypass the encryption.
+        pass
+
     @greentest.ignores_leakcheck
     def test_connect_with_type_flags_ignored(self):
         # Override; doesn't work with SSL sockets.
@@ -9,6 +9,10 @@ import gc
 import greentest
 import gevent.threadpool
 from gevent.threadpool import ThreadPool
+from gevent.event import AsyncResult
+from gevent._threading import get_thread_ident as get_ident
+from gevent._threading import HandoffQueue
+from gevent._threading import start_new_thread
 import gevent
 
 from greentest import ExpectedException
@@ -36,11 +40,16 @@ class TestCase(greentest.TestCase):
     pool = None
 
     ClassUnderTest = ThreadPool
+    queue_class = None
+
     def _FUT(self):
         return self.ClassUnderTest
 
     def _makeOne(self, size, increase=greentest.RUN_LEAKCHECKS):
-        self.pool = pool = self._FUT()(size)
+        if self.queue_class is not None:
+            self.pool = pool = self._FUT()(size, queue_class=self.queue_class)
+        else:
+            self.pool = pool = self._FUT()(size)
         if increase:
             # Max size to help eliminate false positives
             self.pool.size = size
@@ -319,6 +328,15 @@ class TestPool10(TestPool):
     size = 10
 
 
+class TestPool2Handoff(TestPool2):
+    queue_class = HandoffQueue
+
+
+@greentest.ignores_leakcheck
+class TestPool10Handoff(TestPool10):
+    queue_class = HandoffQueue
+
+
 
 # class TestJoinSleep(greentest.GenericGetTestCase):
 #
@@ -372,6 +390,101 @@ class TestSpawn(TestCase):
         self.assertEqual(len(pool), 0)
 
 
+class TestCompletions(TestCase):
+
+    def test_shared(self):
+        pool = self._makeOne(10)
+        completions = pool._completions
+        results = [pool.spawn(sqr, i) for i in range(10)]
+        self.assertEqual(completions.pending, 10)
+        self.assertEqual([r.get() for r in results], [i * i for i in range(10)])
+        self.assertEqual(completions.pending, 0)
+        self.assertIs(pool._completions, completions)
+
+        # It starts again for the next batch.
+        self.assertEqual(pool.apply(sqr, (5,)), 25)
+        self.assertEqual(completions.pending, 0)
+
+    def test_error(self):
+        pool = self._makeOne(1)
+        def raises():
+            raise ExpectedException()
+        with self.assertRaises(ExpectedException):
+            pool.apply(raises)
+        self.assertEqual(pool._completions.pending, 0)
+        self.assertEqual(pool.apply(sqr, (3,)), 9)
+    test_error.error_fatal = False
+
+    def test_thread_result_own_watcher(self):
+        result = AsyncResult()
+        called = []
+        thread_result = gevent.threadpool.ThreadResult(result, gevent.get_hub(),
+                                                       lambda: called.append(1))
+        self.assertIsNot(thread_result.async_watcher, gevent.threadpool._FakeAsync)
+        thread_result.set(42)
+        self.assertEqual(result.get(), 42)
+        self.assertEqual(called, [1])
+
+
+class TestSpawnMany(TestCase):
+
+    def test_results_in_order(self):
+        pool = self._makeOne(3)
+        result = pool.spawn_many(sqr_random_sleep, range(20), chunksize=3)
+        self.assertEqual(result.get(), [i * i for i in range(20)])
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool._completions.pending, 0)
+
+    def test_default_chunksize(self):
+        pool = self._makeOne(2)
+        threads = pool.spawn_many(lambda _: get_ident(), range(100)).get()
+        self.assertEqual(len(threads), 100)
+        # Eight chunks of thirteen, run together.
+        self.assertEqual(len(set(threads[:13])), 1)
+        self.assertEqual(len(set(threads[91:])), 1)
+
+    def test_empty(self):
+        pool = self._makeOne(1)
+        self.assertEqual(pool.spawn_many(sqr, []).get(), [])
+        self.assertEqual(pool.map_batch(sqr, iter(())), [])
+
+    def test_more_chunks_than_slots(self):
+        pool = self._makeOne(1)
+        self.assertEqual(pool.map_batch(sqr, range(10), chunksize=1),
+                         [i * i for i in range(10)])
+
+    def test_bad_chunksize(self):
+        self.switch_expected = False
+        pool = self._makeOne(1)
+        self.assertRaises(ValueError, pool.spawn_many, sqr, [1], chunksize=0)
+
+    def test_error(self):
+        pool = self._makeOne(2)
+        called = []
+        def func(i):
+            called.append(i)
+            if i == 1:
+                raise ExpectedException(i)
+            return i
+
+        with self.assertRaises(ExpectedException):
+            pool.map_batch(func, range(6), chunksize=3)
+        pool.join()
+        # The rest of the chunk is skipped.
+        self.assertIn(1, called)
+        self.assertNotIn(2, called)
+    test_error.error_fatal = False
+
+    def test_recursive(self):
+        pool = self._makeOne(1)
+        result = pool.apply(pool.map_batch, (sqr, range(3)))
+        self.assertEqual(result, [0, 1, 4])
+
+
+class TestSpawnManyHandoff(TestSpawnMany):
+    queue_class = HandoffQueue
+
+
 def error_iter():
     yield 1
     yield 2
@@ -450,6 +563,109 @@ class TestSize(TestCase):
         self.assertEqual(pool.size, 2)
 
 
+class TestSizeHandoff(TestSize):
+    queue_class = HandoffQueue
+
+
+class TestIdleTimeout(TestCase):
+
+    def _makeOne(self, size, increase=False, **kwargs):
+        self.pool = pool = self._FUT()(size, **kwargs)
+        return pool
+
+    def _wait_for_size(self, pool, size):
+        for _ in range(100):
+            if pool.size == size:
+                break
+            gevent.sleep(0.01)
+        self.assertEqual(pool.size, size)
+
+    def test_idle_threads_exit(self):
+        pool = self._makeOne(4, idle_timeout=0.05)
+        pool.map(lambda x: sqr(x, 0.05), range(4))
+        self.assertEqual(pool.size, 4)
+        self._wait_for_size(pool, 0)
+        self.assertIsNone(pool._reaper)
+        # They come back when needed.
+        self.assertEqual(pool.apply(sqr, (2,)), 4)
+        self.assertEqual(pool.size, 1)
+
+    def test_minsize(self):
+        pool = self._makeOne(4, minsize=2, idle_timeout=0.05)
+        self.assertEqual(pool.size, 2)
+        pool.map(lambda x: sqr(x, 0.05), range(4))
+        self.assertEqual(pool.size, 4)
+        self._wait_for_size(pool, 2)
+        gevent.sleep(0.15)
+        self.assertEqual(pool.size, 2)
+
+    def test_busy_thread_kept(self):
+        pool = self._makeOne(2, idle_timeout=0.05)
+        for _ in range(10):
+            pool.spawn(sqr, 1, 0.02)
+            gevent.sleep(0.02)
+        self.assertEqual(pool.size, 1)
+        pool.join()
+
+    def test_no_idle_timeout(self):
+        pool = self._makeOne(2)
+        pool.apply(sqr, (1,))
+        self.assertIsNone(pool._reaper)
+
+    def test_bad_arguments(self):
+        self.switch_expected = False
+        self.assertRaises(ValueError, ThreadPool, 2, minsize=-1)
+        self.assertRaises(ValueError, ThreadPool, 2, minsize=3)
+        self.assertRaises(ValueError, ThreadPool, 2, idle_timeout=0)
+
+    def test_bad_arguments_create_no_watchers(self):
+        self.switch_expected = False
+
+        class Loop(object):
+            def fork(self, *_args, **_kwargs):
+                raise AssertionError("Watcher created")
+            async_ = fork
+
+        class Hub(object):
+            loop = Loop()
+
+        self.assertRaises(ValueError, ThreadPool, 2, hub=Hub(), minsize=3)
+
+
+class TestHandoffQueue(greentest.TestCase):
+    switch_expected = False
+
+    def test_consumers(self):
+        queue = HandoffQueue()
+        consumed = []
+        consumers = 4
+
+        def consume():
+            while 1:
+                item = queue.get()
+                if item is None:
+                    break
+                consumed.append(item)
+                queue.task_done()
+            queue.task_done()
+
+        for _ in range(consumers):
+            start_new_thread(consume, ())
+        for i in range(500):
+            queue.put(i)
+            if i % 100 == 0:
+                # Let them go idle and park.
+                sleep(0.01)
+        queue.put_many(range(500, 1000))
+        queue.put_many([None] * consumers)
+        deadline = time() + 5
+        while queue.unfinished_tasks and time() < deadline:
+            sleep(0.01)
+        self.assertEqual(queue.unfinished_tasks, 0)
+        self.assertEqual(sorted(consumed), list(range(1000)))
+        self.assertEqual(queue.qsize(), 0)
+
+
 class TestRef(TestCase):
 
     def test(self):